@@ -0,0 +1,280 @@
+"""
+Benchmark suite for Form Bot
+Runs each engine end to end against the local test server and compares the
+results with a stored baseline
+"""
+
+import argparse
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from datetime import datetime
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+BENCHMARK_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT_DIR))
+
+# Scenarios: FormBot arguments and config overrides for each run
+SCENARIOS = {
+    'http': {'engine': 'http'},
+    'async': {'engine': 'async', 'concurrency': 50},
+    'async-stream': {'engine': 'async', 'concurrency': 50, 'stream': True},
+    'selenium': {'engine': 'selenium', 'workers': 1},
+    'selenium-reuse': {'engine': 'selenium', 'workers': 1, 'reuse_page': True},
+    'selenium-4': {'engine': 'selenium', 'workers': 4}
+}
+
+# Scenarios that don't need Chrome
+DEFAULT_SCENARIOS = ('http', 'async', 'async-stream')
+
+DEFAULT_RESULTS = BENCHMARK_DIR / 'results' / 'latest.json'
+DEFAULT_BASELINE = BENCHMARK_DIR / 'baseline.json'
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB (None where unsupported)"""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def run_scenario(name: str, data_file: str, form_url: str) -> dict:
+    """
+    Run one scenario in this process and return its measurements
+
+    Meant to run in a fresh child process so every scenario starts from a
+    clean interpreter and peak RSS belongs to that scenario alone.
+    """
+    import config
+
+    scenario = SCENARIOS[name]
+
+    # Measure the engine, not the console or the pacing
+    config.FORM_URL = form_url
+    config.LOGGING['level'] = 'WARNING'
+    config.LOGGING['file'] = str(BENCHMARK_DIR / 'results' / f'{name}.log')
+    config.RATE_LIMIT['submissions_per_second'] = 0
+    config.CHECKPOINT['enabled'] = False
+    config.BROWSER_CONFIG['headless'] = True
+    config.EXECUTION['reuse_page'] = scenario.get('reuse_page', False)
+
+    from form_bot import FormBot
+
+    bot = FormBot(
+        workers=scenario.get('workers'),
+        engine=scenario['engine'],
+        concurrency=scenario.get('concurrency'),
+        stream=scenario.get('stream')
+    )
+
+    started = time.perf_counter()
+    bot.run(data_file, form_url)
+    duration = time.perf_counter() - started
+
+    stats = bot.get_stats()
+    return {
+        'scenario': name,
+        'rows': stats['total_rows'],
+        'successful': stats['successful'],
+        'failed': stats['failed'],
+        'duration': round(duration, 3),
+        'rows_per_sec': round(stats['processed'] / duration, 2) if duration else 0.0,
+        'peak_rss_mb': peak_rss_mb(),
+        'latency': bot.metrics.snapshot()
+    }
+
+
+def wait_for_port(port: int, timeout: float = 10.0):
+    """Wait until something accepts connections on localhost:port"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise TimeoutError(f"Test server did not start on port {port}")
+
+
+def start_test_server(port: int) -> subprocess.Popen:
+    """Start test/test_server.py in the background"""
+    server = subprocess.Popen(
+        [sys.executable, str(ROOT_DIR / 'test' / 'test_server.py'), '--port', str(port)],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    try:
+        wait_for_port(port)
+    except TimeoutError:
+        server.kill()
+        raise
+    return server
+
+
+def server_request(port: int, path: str, method: str = 'GET') -> dict:
+    """Call one of the test server's JSON endpoints"""
+    request = urllib.request.Request(f"http://127.0.0.1:{port}{path}", data=b'' if method == 'POST' else None)
+    with urllib.request.urlopen(request, timeout=10) as response:
+        return json.loads(response.read())
+
+
+def compare_with_baseline(results: list, baseline: dict, tolerance: float) -> list:
+    """
+    Compare results with the baseline
+
+    Args:
+        results: Scenario results of this run
+        baseline: Previously saved results file
+        tolerance: Allowed relative slowdown (0.1 = 10%)
+
+    Returns:
+        List of regression descriptions (empty if none)
+    """
+    baseline_results = {
+        (result['scenario'], result['rows']): result for result in baseline.get('results', [])
+    }
+
+    regressions = []
+    for result in results:
+        reference = baseline_results.get((result['scenario'], result['rows']))
+        if reference is None:
+            result['baseline'] = None
+            continue
+
+        change = (result['rows_per_sec'] - reference['rows_per_sec']) / reference['rows_per_sec']
+        result['baseline'] = {
+            'rows_per_sec': reference['rows_per_sec'],
+            'rows_per_sec_change': round(change, 4),
+            'peak_rss_mb': reference.get('peak_rss_mb')
+        }
+
+        if change < -tolerance:
+            regressions.append(
+                f"{result['scenario']} ({result['rows']} rows): {result['rows_per_sec']:.1f} rows/s "
+                f"vs baseline {reference['rows_per_sec']:.1f} ({change:+.1%})"
+            )
+
+        rss, reference_rss = result.get('peak_rss_mb'), reference.get('peak_rss_mb')
+        if rss and reference_rss and rss > reference_rss * (1 + tolerance):
+            regressions.append(
+                f"{result['scenario']} ({result['rows']} rows): peak RSS {rss:.1f} MB "
+                f"vs baseline {reference_rss:.1f} MB"
+            )
+
+    return regressions
+
+
+def main():
+    """Main function with command-line argument parsing"""
+    parser = argparse.ArgumentParser(
+        description="Form Bot benchmark suite",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python benchmarks/run_benchmarks.py                          # http/async engines, 1000 rows
+  python benchmarks/run_benchmarks.py --rows 1000 10000        # Several dataset sizes
+  python benchmarks/run_benchmarks.py --scenarios selenium     # Needs Chrome
+  python benchmarks/run_benchmarks.py --save-baseline          # Store results as the new baseline
+        """
+    )
+    parser.add_argument('--scenarios', nargs='+', choices=sorted(SCENARIOS), default=list(DEFAULT_SCENARIOS),
+                        help=f"Scenarios to run (default: {' '.join(DEFAULT_SCENARIOS)})")
+    parser.add_argument('--rows', nargs='+', type=int, default=[1000], help='Dataset sizes (default: 1000)')
+    parser.add_argument('--format', choices=('csv', 'jsonl', 'xlsx'), default='csv', help='Dataset format (default: csv)')
+    parser.add_argument('--port', type=int, default=8765, help='Test server port (default: 8765)')
+    parser.add_argument('--output', default=str(DEFAULT_RESULTS), help='Results file')
+    parser.add_argument('--baseline', default=str(DEFAULT_BASELINE), help='Baseline file to compare with')
+    parser.add_argument('--tolerance', type=float, default=0.10, help='Allowed slowdown before failing (default: 0.10)')
+    parser.add_argument('--save-baseline', action='store_true', help='Write the results to the baseline file')
+    parser.add_argument('--run-scenario', help=argparse.SUPPRESS)
+    parser.add_argument('--data', help=argparse.SUPPRESS)
+    parser.add_argument('--url', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    # Child process: run a single scenario and print its measurements
+    if args.run_scenario:
+        os.chdir(ROOT_DIR)
+        print(json.dumps(run_scenario(args.run_scenario, args.data, args.url)))
+        return
+
+    from create_sample_data import create_synthetic_data
+
+    (BENCHMARK_DIR / 'results').mkdir(parents=True, exist_ok=True)
+    form_url = f"http://127.0.0.1:{args.port}/test_form.html"
+    server = start_test_server(args.port)
+
+    results = []
+    try:
+        for rows in args.rows:
+            data_file = BENCHMARK_DIR / 'data' / f'synthetic_{rows}.{args.format}'
+            if not data_file.exists():
+                create_synthetic_data(rows, str(data_file))
+
+            for name in args.scenarios:
+                print(f"Running {name} with {rows} rows...", flush=True)
+                server_request(args.port, '/reset', 'POST')
+                child = subprocess.run(
+                    [sys.executable, __file__, '--run-scenario', name, '--data', str(data_file), '--url', form_url],
+                    capture_output=True, text=True
+                )
+                if child.returncode != 0:
+                    print(f"  failed:\n{child.stderr.strip()}")
+                    continue
+
+                result = json.loads(child.stdout.strip().splitlines()[-1])
+                result['server'] = server_request(args.port, '/stats')
+                results.append(result)
+
+                # The server's count catches submissions the bot reported but never sent
+                if result['server']['accepted'] != result['successful']:
+                    print(f"  warning: bot reported {result['successful']} successful submissions, "
+                          f"server accepted {result['server']['accepted']}")
+                print(f"  {result['rows_per_sec']:.1f} rows/s, {result['failed']} failed, "
+                      f"peak RSS {result['peak_rss_mb']} MB")
+    finally:
+        server.terminate()
+        server.wait()
+
+    report = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results
+    }
+
+    regressions = []
+    baseline_file = Path(args.baseline)
+    if baseline_file.exists() and not args.save_baseline:
+        with open(baseline_file, encoding='utf-8') as file:
+            regressions = compare_with_baseline(results, json.load(file), args.tolerance)
+        report['regressions'] = regressions
+
+    with open(args.output, 'w', encoding='utf-8') as file:
+        json.dump(report, file, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.save_baseline:
+        with open(baseline_file, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2)
+        print(f"Baseline saved to {baseline_file}")
+
+    if regressions:
+        print("Performance regressions:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
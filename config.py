@@ -23,12 +23,33 @@ FORM_FIELDS = {
     'submit': '//*[@id="contact-form"]/div/div/button'
 }
 
+# Template Detection
+TEMPLATES = {
+    'auto_detect': False,  # Replace FORM_FIELDS with the best matching template from form_templates.py
+    'cache_file': 'logs/template_cache.json'  # Detected templates per URL and page fingerprint
+}
+
 # Excel Column Mappings
 EXCEL_COLUMNS = {
     'name': 'Nome',
     'email': 'Email',
     'subject': 'Assunto',
-    'message': 'Mensagem'
+    'message': 'Mensagem',
+    # Optional columns (used only when present in the file)
+    'url': 'URL',  # Form URL of the row (rows without one use FORM_URL)
+    'template': 'Template'  # Template name from form_templates.py (rows without one use FORM_FIELDS)
+}
+
+# Input Configuration
+INPUT = {
+    'chunk_size': 50000  # Rows read at a time from CSV, JSONL and Parquet files
+}
+
+# Data Validation
+VALIDATION = {
+    'strip_whitespace': True,  # Trim leading/trailing whitespace from every mapped column
+    'drop_invalid_emails': False,  # False = only warn about invalid emails
+    'max_lengths': {}  # Optional per-field limits, e.g. {'message': 5000}
 }
 
 # Timing Configuration (in seconds)
@@ -39,11 +60,39 @@ TIMING = {
     'implicit_wait': 5
 }
 
+# Rate Limiting (token bucket per target host, shared by all workers)
+RATE_LIMIT = {
+    # None = 1 / TIMING['delay_between_submissions'] with the selenium engine, unlimited with http/async; 0 = unlimited
+    'submissions_per_second': None,
+    'burst': 1,  # Submissions allowed back to back
+    'adaptive': True,  # Slow down on HTTP 429/5xx and slow responses
+    'backoff_factor': 0.5,  # Rate multiplier applied when the server struggles
+    'recovery_factor': 1.05,  # Rate multiplier applied after each healthy submission
+    'min_rate': 0.05,  # Lowest rate adaptation may reach (submissions per second)
+    'slow_response_seconds': 10  # Submissions slower than this count as a slowdown
+}
+
 # Browser Configuration
 BROWSER_CONFIG = {
     'headless': False,  # Set to True for headless mode
     'window_size': (1920, 1080),
-    'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+    'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    # Lean profile: eager page loads, no images or fonts, blocked URL patterns (less time and memory per browser)
+    'lean': False,
+    'block_stylesheets': False,  # Also block CSS in lean mode (may change which elements are visible)
+    'blocked_url_patterns': [
+        '*.woff', '*.woff2', '*.ttf', '*.otf',  # Fonts
+        '*.mp4', '*.webm', '*.mp3',  # Media
+        '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*',
+        '*connect.facebook.net*', '*hotjar.com*', '*clarity.ms*'  # Analytics and ads
+    ]
+}
+
+# ChromeDriver Cache
+DRIVER_CACHE = {
+    'enabled': True,  # Reuse the resolved ChromeDriver instead of resolving it on every run
+    'file': 'logs/driver_cache.json',
+    'max_age_days': 7  # Re-resolve the driver after this many days even if it still matches
 }
 
 # Logging Configuration
@@ -51,12 +100,78 @@ LOGGING = {
     'level': 'INFO',
     'file': 'logs/form_bot.log',
     'max_file_size': 10 * 1024 * 1024,  # 10MB
-    'backup_count': 5
+    'backup_count': 5,
+    'progress_interval': 2,  # Minimum seconds between progress lines
+    'progress_window': 30  # Seconds of history used for the rows/sec rate
+}
+
+# Submission Confirmation
+SUBMISSION = {
+    # Any of: 'url_change', 'success_selector', 'submit_event', 'network' (empty = don't wait)
+    'detectors': ['submit_event', 'url_change'],
+    'success_selector': '',  # XPath of an element shown after a successful submission
+    'error_selector': '',  # XPath of an element shown when the form rejects a submission (fails the row)
+    # 'submit_event' confirms on the response or a navigation after the submit event. Forms that
+    # handle submit in JS with neither are confirmed once this long passes with no request pending
+    'settle_seconds': 2,
+    'timeout': 10  # Maximum seconds to wait for confirmation
+}
+
+# Execution Configuration
+EXECUTION = {
+    'engine': 'selenium',  # 'selenium' (browser), 'http' or 'async' (direct submission, static forms only)
+    'workers': 1,  # Number of parallel browser workers
+    'stream': False,  # Read .xlsx rows lazily instead of loading the whole workbook
+    'concurrency': 50,  # Submissions in flight with the async engine
+    'connections_per_host': 20,  # Connection pool limit per host with the async engine
+    'reuse_page': False,  # Reset the loaded form in place instead of reloading it per row
+    'batch_fill': True,  # Fill all fields in a single script call
+    'group_window': 10000  # Rows buffered to group per-row URLs/templates (see EXCEL_COLUMNS)
+}
+
+# Latency Metrics
+METRICS = {
+    'enabled': True,  # Time every phase of each row (wait, navigate, fill, submit)
+    'prometheus_file': '',  # e.g. 'logs/form_bot.prom' for the node_exporter textfile collector
+    'json_file': '',  # e.g. 'logs/metrics.json'
+    'export_interval': 15  # Seconds between periodic exports
+}
+
+# Checkpoint Journal (used by --resume)
+CHECKPOINT = {
+    'enabled': True,  # Record every row outcome so interrupted runs can be resumed
+    'file': 'logs/checkpoints.db'
+}
+
+# Sharding (used by --shard i/N to split one input file across machines)
+SHARDING = {
+    'key_field': 'email',  # EXCEL_COLUMNS field hashed to pick the shard of a row
+    'results_dir': 'logs/shards',  # Per-shard results files, combined with --merge-shards
+    'merged_file': 'logs/shards/merged.json'
+}
+
+# Work-Queue Coordinator (--coordinate serves the rows, --coordinator URL joins as a worker)
+COORDINATOR = {
+    'host': os.getenv('COORDINATOR_HOST', '127.0.0.1'),  # e.g. '0.0.0.0' to accept workers on other machines
+    'port': 8600,
+    'token': os.getenv('COORDINATOR_TOKEN', ''),  # Shared secret of coordinator and workers; required unless host is local
+    'file': 'logs/coordinator.db',  # Row queue and outcomes; a restarted coordinator resumes from it
+    'batch_size': 10,  # Rows leased to a worker at a time
+    'lease_seconds': 120,  # Leased rows not renewed for this long go back to the queue
+    'heartbeat_interval': 30,  # Seconds between lease renewals while a worker keeps processing rows
+    'poll_interval': 2,  # Seconds a worker waits while every remaining row is leased
+    'request_attempts': 5,  # Tries per coordinator request before a worker gives up
+    'request_timeout': 30,  # Seconds the coordinator waits on a client's socket before dropping it
+    'max_request_bytes': 1000000,  # Larger request bodies are rejected (HTTP 413)
+    'max_lease_rows': 100  # Most rows one lease request can take
 }
 
 # Error Handling
 ERROR_HANDLING = {
     'max_retries': 3,
-    'retry_delay': 5,
+    'retry_delay': 5,  # Base backoff in seconds, doubled on every retry (with jitter)
+    'max_retry_delay': 60,
+    # Failure kinds retried at the end of the run
+    'retry_on': ['timeout', 'stale_element', 'driver_crash', 'connection', 'server_busy'],
     'continue_on_error': True
 } 
\ No newline at end of file
@@ -2,15 +2,16 @@
 Script to create sample Excel data for Form Bot testing
 """
 
+import argparse
+import random
+import unicodedata
 import pandas as pd
 import os
 from pathlib import Path
 
-def create_sample_data():
-    """Create sample Excel file with test data"""
-    
-    # Sample data
-    data = {
+def sample_data() -> dict:
+    """Sample rows used for the demo file and as seeds for synthetic data"""
+    return {
         'Nome': [
             'João Silva',
             'Maria Santos',
@@ -60,9 +61,12 @@ def create_sample_data():
             'Agradeço pelo excelente serviço prestado pela equipe.'
         ]
     }
+
+def create_sample_data():
+    """Create sample Excel file with test data"""
     
     # Create DataFrame
-    df = pd.DataFrame(data)
+    df = pd.DataFrame(sample_data())
     
     # Create data directory if it doesn't exist
     data_dir = Path('data')
@@ -77,5 +81,84 @@ def create_sample_data():
     print("\nSample data preview:")
     print(df.head(3).to_string(index=False))
 
+def generate_synthetic_data(rows: int, seed: int = 0, invalid_ratio: float = 0.0) -> pd.DataFrame:
+    """
+    Generate synthetic rows by recombining the sample data
+    
+    Args:
+        rows: Number of rows to generate
+        seed: Random seed, so the same arguments always give the same data
+        invalid_ratio: Fraction of rows given an invalid email
+        
+    Returns:
+        DataFrame with the Excel columns of the sample data
+    """
+    rng = random.Random(seed)
+    seeds = sample_data()
+    
+    data = {column: [] for column in seeds}
+    for i in range(rows):
+        name = rng.choice(seeds['Nome'])
+        user = unicodedata.normalize('NFKD', name.lower().replace(' ', '.')).encode('ascii', 'ignore').decode()
+        
+        data['Nome'].append(f"{name} {i + 1}")
+        if rng.random() < invalid_ratio:
+            data['Email'].append(f"{user}.{i + 1}-at-example.com")
+        else:
+            data['Email'].append(f"{user}.{i + 1}@example.com")
+        data['Assunto'].append(rng.choice(seeds['Assunto']))
+        data['Mensagem'].append(rng.choice(seeds['Mensagem']))
+    
+    return pd.DataFrame(data)
+
+def create_synthetic_data(rows: int, output: str, seed: int = 0, invalid_ratio: float = 0.0) -> Path:
+    """
+    Write a synthetic dataset to disk
+    
+    The format follows the extension: .xlsx, .csv or .jsonl.
+    
+    Args:
+        rows: Number of rows to generate
+        output: Output file path
+        seed: Random seed
+        invalid_ratio: Fraction of rows given an invalid email
+        
+    Returns:
+        Path of the written file
+    """
+    df = generate_synthetic_data(rows, seed, invalid_ratio)
+    
+    output_file = Path(output)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    
+    suffix = output_file.suffix.lower()
+    if suffix == '.xlsx':
+        df.to_excel(output_file, index=False)
+    elif suffix == '.csv':
+        df.to_csv(output_file, index=False)
+    elif suffix == '.jsonl':
+        df.to_json(output_file, orient='records', lines=True, force_ascii=False)
+    else:
+        raise ValueError(f"Unsupported output format: {suffix} (use .xlsx, .csv or .jsonl)")
+    
+    return output_file
+
+def main():
+    """Main function with command-line argument parsing"""
+    parser = argparse.ArgumentParser(description="Create sample or synthetic data for Form Bot")
+    parser.add_argument('--rows', '-n', type=int, help='Generate this many synthetic rows instead of the sample file')
+    parser.add_argument('--output', '-o', default='data/synthetic_data.csv', help='Synthetic data file (.xlsx, .csv or .jsonl)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for synthetic data (default: 0)')
+    parser.add_argument('--invalid-ratio', type=float, default=0.0, help='Fraction of rows with an invalid email')
+    args = parser.parse_args()
+    
+    if args.rows is None:
+        create_sample_data()
+        return
+    
+    output_file = create_synthetic_data(args.rows, args.output, args.seed, args.invalid_ratio)
+    print(f"Synthetic data created successfully: {output_file}")
+    print(f"Total rows: {args.rows}")
+
 if __name__ == "__main__":
-    create_sample_data() 
\ No newline at end of file
+    main() 
\ No newline at end of file
@@ -4,24 +4,72 @@ Orchestrates the automated form submission process
 """
 
 import time
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Optional
+from utils.async_engine import AsyncFormEngine
+from utils.checkpoint import CheckpointJournal, hash_file, row_key
+from utils.coordinator import CoordinatorClient
 from utils.excel_reader import ExcelReader
 from utils.form_handler import FormHandler
+from utils.http_engine import HttpFormEngine
 from utils.logger import Logger
+from utils.metrics import get_metrics
+from utils.progress import ProgressReporter
+from utils.rate_limiter import get_rate_limiter
+from utils.retry import RetryQueue, classify_failure
+from utils.sharding import Shard, write_shard_result
+from utils.targets import group_by_target, row_target, target_fields
+from utils.template_detector import TemplateDetector
+from utils.worker_pool import WorkerPool
 import config
 
+# Available submission engines
+ENGINES = ('selenium', 'http', 'async')
+
 class FormBot:
     """Main bot class for automated form submission"""
     
-    def __init__(self):
+    def __init__(self, workers: int = None, engine: str = None, concurrency: int = None,
+                 stream: bool = None, resume: bool = False, shard: Shard = None,
+                 coordinator: CoordinatorClient = None):
         self.logger = Logger()
         self.excel_reader = ExcelReader()
         self.form_handler = FormHandler()
+        self.workers = workers if workers is not None else config.EXECUTION['workers']
+        self.engine = engine if engine is not None else config.EXECUTION['engine']
+        self.concurrency = concurrency
+        self.stream = stream if stream is not None else config.EXECUTION['stream']
+        self.resume = resume
+        self.shard = shard
+        self.coordinator = coordinator
+        self.per_target = False
+        self.excel_file = None
+        self.form_url = None
+        self.http_engine = None
+        self.journal = None
+        self.retry_queue = RetryQueue()
+        self._completed_rows = set()
+        self._processed_rows = set()
+        self._browser_setup: Optional[Future] = None
+        self.progress: Optional[ProgressReporter] = None
+        self.metrics = get_metrics()
+        
+        # Only this shard's rows are served by the reader
+        self.excel_reader.shard = shard
+        
+        if self.engine not in ENGINES:
+            raise ValueError(f"Unknown engine '{self.engine}'. Available: {', '.join(ENGINES)}")
+        
+        self._stats_lock = threading.Lock()
         self.stats = {
             'total_rows': 0,
             'processed': 0,
             'successful': 0,
             'failed': 0,
+            'skipped': 0,
+            'retried': 0,
+            'targets': {},
             'start_time': None,
             'end_time': None
         }
@@ -36,13 +84,31 @@ class FormBot:
         """
         try:
             self.stats['start_time'] = time.time()
+            self.excel_file = excel_file or config.EXCEL_FILE
+            self.form_url = form_url or config.FORM_URL
             self.logger.info("Starting Form Bot...")
             
-            # Read Excel data
-            self._read_excel_data(excel_file)
+            # Start the browser while the data loads (parallel workers start their own)
+            if self.engine == 'selenium' and self.workers <= 1:
+                self._start_browser()
+            
+            if self.coordinator:
+                # Rows (and their outcomes) live in the coordinator's queue
+                self._join_coordinator()
+            else:
+                # Read Excel data
+                self._read_excel_data(excel_file)
+                
+                # Open the checkpoint journal (and load progress when resuming)
+                self._open_journal(excel_file)
+            
+            # Wait for the browser started above
+            if self._browser_setup:
+                self._wait_for_browser()
             
-            # Setup browser
-            self._setup_browser()
+            # Pick the form template (cached per URL and page fingerprint)
+            if config.TEMPLATES['auto_detect']:
+                self._detect_template(form_url)
             
             # Process each row
             self._process_all_rows(form_url)
@@ -58,91 +124,407 @@ class FormBot:
     def _read_excel_data(self, excel_file: str = None):
         """Read and validate Excel data"""
         try:
+            if self.stream:
+                # Only the header is read now; total_rows is an estimate until the stream ends
+                estimate = self.excel_reader.open_stream(excel_file)
+                if estimate == 0:
+                    raise ValueError("No valid data found in Excel file")
+                if estimate and self.shard:
+                    estimate = -(-estimate // self.shard.count)
+                self.stats['total_rows'] = estimate or 0
+                self.per_target = self.excel_reader.has_targets()
+                self.logger.info(f"Streaming up to {estimate} rows" if estimate else "Streaming rows")
+                return
+            
             self.excel_reader.read_file(excel_file)
             self.stats['total_rows'] = self.excel_reader.get_total_rows()
             
             if self.stats['total_rows'] == 0:
                 raise ValueError("No valid data found in Excel file")
             
-            self.logger.info(f"Found {self.stats['total_rows']} rows to process")
+            self.logger.info(f"Found {self.stats['total_rows']} rows to process"
+                             + (f" in shard {self.shard}" if self.shard else ""))
+            self.per_target = self.excel_reader.has_targets()
             self.excel_reader.display_sample(3)  # Show first 3 rows
             
+            # Rows are served from the compact store from here on
+            self.excel_reader.release_data()
+            
         except Exception as e:
             self.logger.error(f"Failed to read Excel data: {str(e)}")
             raise
     
-    def _setup_browser(self):
-        """Setup browser for form submission"""
+    def _join_coordinator(self):
+        """Join the coordinator's job as a worker"""
+        try:
+            job = self.coordinator.job()
+        except OSError as e:
+            self.logger.error(f"Failed to join coordinator: {str(e)}")
+            raise
+        
+        # Only an estimate: other workers take rows from the same queue
+        self.stats['total_rows'] = job['remaining']
+        self.per_target = job['has_targets']
+        self.logger.info(
+            f"Joined coordinator {self.coordinator.url} as {self.coordinator.worker_id}: "
+            f"{job['remaining']} of {job['total_rows']} rows remaining"
+        )
+    
+    def _start_browser(self):
+        """Start the browser in a background thread"""
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='browser-setup')
+        self._browser_setup = executor.submit(self.form_handler.setup_driver)
+        executor.shutdown(wait=False)
+    
+    def _wait_for_browser(self):
+        """Wait for the browser started by _start_browser"""
         try:
-            self.form_handler.setup_driver()
+            self._browser_setup.result()
         except Exception as e:
             self.logger.error(f"Failed to setup browser: {str(e)}")
             raise
+        finally:
+            self._browser_setup = None
+    
+    def _detect_template(self, form_url: str = None):
+        """Detect the form template and use it for this run"""
+        url = form_url or config.FORM_URL
+        detector = TemplateDetector()
+        
+        try:
+            if self.engine == 'selenium' and self.workers <= 1:
+                self.form_handler.navigate_to_form(url)
+                fields = detector.detect_in_browser(self.form_handler.driver, url)
+            else:
+                # Parallel workers and the HTTP engines detect from the page HTML
+                fields = detector.detect_url(url)
+        except Exception as e:
+            self.logger.warning(f"Template detection failed, keeping configured fields: {str(e)}")
+            return
+        
+        if fields:
+            config.FORM_FIELDS = fields
+    
+    def _open_journal(self, excel_file: str = None):
+        """Open the checkpoint journal for the input file"""
+        if not config.CHECKPOINT['enabled'] and not self.resume:
+            return
+        
+        self.journal = CheckpointJournal(excel_file or config.EXCEL_FILE)
+        
+        if self.resume:
+            self._completed_rows = self.journal.completed_rows()
+            self.logger.info(f"Resuming: {len(self._completed_rows)} rows already submitted will be skipped")
+    
+    def _iter_rows(self):
+        """
+        Yield (row index, row data) pairs for every row still to process
+        
+        Rows already marked successful in the journal are skipped when resuming.
+        """
+        for index, row_data in self._iter_input_rows():
+            if self._completed_rows and row_key(index, row_data) in self._completed_rows:
+                self.stats['skipped'] += 1
+                continue
+            yield index, row_data
+    
+    def _iter_input_rows(self):
+        """
+        Yield (row index, row data) pairs for every valid input row
+        
+        In streaming mode rows come lazily from the reader, and with a
+        coordinator they are leased batch by batch; total_rows is corrected
+        to the real count once the rows run out. A coordinator may lease the
+        same row again after a retry, so only distinct rows are counted.
+        """
+        if self.coordinator:
+            rows = self.coordinator.iter_rows()
+        elif not self.stream:
+            yield from self.excel_reader.iter_rows()
+            return
+        else:
+            rows = self.excel_reader.stream_rows()
+        
+        seen = set()
+        count = 0
+        for index, row_data in rows:
+            if index not in seen:
+                seen.add(index)
+                count += 1
+            yield index, row_data
+        self.stats['total_rows'] = count
     
     def _process_all_rows(self, form_url: str = None):
-        """Process all rows in the Excel file"""
-        for i in range(self.stats['total_rows']):
+        """Process all rows in the Excel file, then the deferred retries"""
+        self.progress = ProgressReporter(self.stats, self._stats_lock)
+        self.metrics.start_export()
+        self._process_rows(self._iter_rows(), form_url)
+        
+        # Transient failures were deferred so they don't hold up healthy rows
+        while len(self.retry_queue):
+            self.logger.info(f"Retrying {len(self.retry_queue)} deferred rows...")
+            # Draining sleeps until each row's backoff has elapsed
+            self._process_rows(self.retry_queue.drain(), form_url, blocking_rows=True)
+    
+    def _process_rows(self, rows, form_url: str = None, blocking_rows: bool = False):
+        """
+        Process rows with the configured engine
+        
+        Args:
+            rows: Iterable of (row index, row data) pairs
+            form_url: Form URL of rows without their own
+            blocking_rows: Whether getting the next row may block (kept off the async engine's event loop)
+        """
+        # Rows with per-row targets are grouped so each page stays loaded for a batch
+        if self.excel_reader.has_targets():
+            rows = group_by_target(rows, form_url or config.FORM_URL, config.EXECUTION['group_window'])
+        
+        if self.engine == 'http':
+            self._process_rows_http(rows, form_url)
+        elif self.engine == 'async':
+            self._process_rows_async(rows, form_url, blocking_rows)
+        elif self.workers > 1:
+            self._process_rows_parallel(rows, form_url)
+        else:
+            self._process_rows_sequential(
+                rows, lambda row_data: self._process_single_row(row_data, form_url),
+                self.form_handler, form_url
+            )
+    
+    def _process_rows_sequential(self, rows, process_row, handler, form_url: str = None):
+        """
+        Process rows one at a time
+        
+        Args:
+            rows: Iterable of (row index, row data) pairs
+            process_row: Callable taking the row data and returning True on success
+            handler: Object exposing last_error/last_status of the previous row
+            form_url: Form URL of rows without their own, used to pace submissions per host
+        """
+        rate_limiter = get_rate_limiter()
+        
+        for i, row_data in rows:
             try:
-                self.stats['processed'] += 1
-                self.logger.progress(self.stats['processed'], self.stats['total_rows'], "Processing forms")
+                # Wait for the rate limiter (only sleeps for the remaining budget)
+                with self.metrics.time('wait'):
+                    rate_limiter.acquire(row_target(row_data, form_url or config.FORM_URL)[0])
                 
-                # Get data for current row
-                row_data = self.excel_reader.get_data_for_row(i)
+                self._mark_processed(i)
                 
                 # Process single row
-                success = self._process_single_row(row_data, form_url)
+                with self.metrics.time('row'):
+                    success = process_row(row_data)
+                self._record_result(success, i, row_data, handler.last_error, handler.last_status)
                 
-                if success:
-                    self.stats['successful'] += 1
-                else:
-                    self.stats['failed'] += 1
+            except Exception as e:
+                self.logger.error(f"Error processing row {i + 1}: {str(e)}")
+                self._record_result(False, i, row_data, e)
                 
-                # Wait between submissions
-                if i < self.stats['total_rows'] - 1:  # Don't wait after last submission
-                    self.form_handler.wait_between_submissions()
+                if not config.ERROR_HANDLING['continue_on_error']:
+                    raise
+    
+    def _process_rows_http(self, rows, form_url: str = None):
+        """Process rows by submitting the form directly over HTTP"""
+        if self.workers > 1:
+            self.logger.warning("The http engine submits sequentially; ignoring the worker count")
+        
+        if self.http_engine is None:
+            self.http_engine = HttpFormEngine()
+            self.http_engine.load_form(form_url)
+        
+        def submit_row(row_data: dict) -> bool:
+            form_spec = self.http_engine.spec_for(*row_target(row_data, form_url or config.FORM_URL))
+            with self.metrics.time('submit_form'):
+                submitted = self.http_engine.submit(row_data, form_spec)
+            if not submitted:
+                return False
+            self.logger.success(f"Successfully processed: {row_data.get('name', 'Unknown')}")
+            return True
+        
+        self._process_rows_sequential(rows, submit_row, self.http_engine, form_url)
+    
+    def _process_rows_async(self, rows, form_url: str = None, blocking_rows: bool = False):
+        """Process rows concurrently with the asyncio HTTP engine"""
+        engine = AsyncFormEngine(concurrency=self.concurrency)
+        
+        def on_result(index: int, row_data: dict, success: bool, error=None, status=None):
+            self._mark_processed(index)
+            self._record_result(success, index, row_data, error, status)
+            
+            if success:
+                self.logger.success(f"Successfully processed: {row_data.get('name', 'Unknown')}")
+            elif not config.ERROR_HANDLING['continue_on_error'] and not self.retry_queue.is_retry(index):
+                raise RuntimeError(f"Row {index + 1} failed")
+        
+        # Leasing rows from a coordinator can block (e.g. while other workers hold the rest)
+        blocking_rows = blocking_rows or self.coordinator is not None
+        engine.run(rows, form_url, on_result, blocking_rows=blocking_rows)
+    
+    def _process_rows_parallel(self, rows, form_url: str = None):
+        """Process rows with a pool of parallel browser workers"""
+        def process_row(form_handler: FormHandler, index: int, row_data: dict):
+            try:
+                # The rate limiter is shared, so workers pace each other per host
+                with self.metrics.time('wait'):
+                    form_handler.wait_between_submissions(row_target(row_data, form_url or config.FORM_URL)[0])
+                self._mark_processed(index)
+                with self.metrics.time('row'):
+                    success = self._process_single_row(row_data, form_url, form_handler)
+                self._record_result(success, index, row_data, form_handler.last_error, form_handler.last_status)
                 
             except Exception as e:
-                self.logger.error(f"Error processing row {i + 1}: {str(e)}")
-                self.stats['failed'] += 1
+                self.logger.error(f"Error processing row {index + 1}: {str(e)}")
+                self._record_result(False, index, row_data, e)
                 
                 if not config.ERROR_HANDLING['continue_on_error']:
                     raise
+        
+        pool = WorkerPool(self.workers)
+        pool.run(rows, process_row)
+    
+    def _mark_processed(self, index: int = None):
+        """Count a row as processed (thread-safe)"""
+        with self._stats_lock:
+            # Retries of a deferred row don't count it twice. Rows retried through a
+            # coordinator come back as new leases, so those are tracked by index
+            if self.coordinator is not None and index is not None:
+                if index in self._processed_rows:
+                    return
+                self._processed_rows.add(index)
+                self.stats['processed'] += 1
+            elif index is None or not self.retry_queue.is_retry(index):
+                self.stats['processed'] += 1
     
-    def _process_single_row(self, row_data: dict, form_url: str = None) -> bool:
+    def _record_result(self, success: bool, index: int = None, row_data: dict = None,
+                       error: BaseException = None, status: int = None):
+        """
+        Record the outcome of a row in the stats and the journal (thread-safe)
+        
+        Failures classified as transient are deferred for a retry instead of
+        being counted as failed. With a coordinator, outcomes are reported to
+        it and retries go back to its queue, where any worker may take them.
+        """
+        detail = str(error) if error else (f"HTTP {status}" if status else None)
+        
+        if not success and row_data is not None:
+            kind = classify_failure(error, status)
+            if self._defer(index, row_data, kind, detail):
+                with self._stats_lock:
+                    self.stats['retried'] += 1
+                self._report_progress()
+                return
+        
+        with self._stats_lock:
+            if success:
+                self.stats['successful'] += 1
+            else:
+                self.stats['failed'] += 1
+            if row_data is not None and self.per_target:
+                self._count_target(row_data, success)
+        self._report_progress()
+        
+        if self.coordinator and index is not None:
+            self.coordinator.report(index, 'success' if success else 'failed', detail)
+        
+        if self.journal and row_data is not None:
+            self.journal.record(row_key(index, row_data), success, detail)
+    
+    def _defer(self, index: int, row_data: dict, kind: str, detail: str = None) -> bool:
+        """Schedule a transient failure for a retry; False if the row has failed for good"""
+        if self.coordinator is None:
+            return self.retry_queue.defer(index, row_data, kind)
+        
+        # The coordinator tracks attempts across workers and fails the row once they run out
+        if index is None or kind not in config.ERROR_HANDLING['retry_on']:
+            return False
+        self.coordinator.report(index, 'retry', detail or kind)
+        return True
+    
+    def _count_target(self, row_data: dict, success: bool):
+        """Count a row outcome under its target URL (caller holds the stats lock)"""
+        url = row_target(row_data, self.form_url or config.FORM_URL)[0]
+        target = self.stats['targets'].get(url)
+        if target is None:
+            target = self.stats['targets'][url] = {'successful': 0, 'failed': 0}
+        target['successful' if success else 'failed'] += 1
+    
+    def _report_progress(self):
+        """Report progress if the reporter's interval has elapsed"""
+        if self.progress:
+            self.progress.update()
+    
+    def _process_single_row(self, row_data: dict, form_url: str = None,
+                            form_handler: FormHandler = None) -> bool:
         """
         Process a single row of data
         
         Args:
             row_data: Dictionary with form data
-            form_url: Form URL to submit to
+            form_url: Form URL of rows without their own
+            form_handler: Handler to use (defaults to the bot's own handler)
             
         Returns:
-            True if successful, False otherwise
+            True if successful, False otherwise (the handler's last_error and
+            last_status tell why)
         """
+        if form_handler is None:
+            form_handler = self.form_handler
+        
+        form_handler.clear_last_failure()
+        url, template = row_target(row_data, form_url or config.FORM_URL)
+        
         try:
-            # Navigate to form
-            self.form_handler.navigate_to_form(form_url)
+            # Load (or reset) the form of the row's target
+            form_handler.set_form_fields(target_fields(template))
+            with self.metrics.time('navigate_to_form'):
+                form_handler.prepare_form(url)
             
-            # Fill form
-            if not self.form_handler.fill_form(row_data):
-                return False
-            
-            # Submit form
-            if not self.form_handler.submit_form():
-                return False
-            
-            self.logger.success(f"Successfully processed: {row_data.get('name', 'Unknown')}")
-            return True
+            # Fill form, then submit it
+            with self.metrics.time('fill_form'):
+                filled = form_handler.fill_form(row_data)
+            if filled:
+                with self.metrics.time('submit_form'):
+                    submitted = form_handler.submit_form()
+                if submitted:
+                    self.logger.success(f"Successfully processed: {row_data.get('name', 'Unknown')}")
+                    return True
             
         except Exception as e:
             self.logger.error(f"Failed to process row: {str(e)}")
-            return False
+            form_handler.last_error = e
+        
+        # A dead browser would fail every following row too
+        if classify_failure(form_handler.last_error) == 'driver_crash':
+            form_handler.restart_driver()
+        return False
     
     def _finalize(self):
         """Finalize the bot execution"""
         try:
-            # Close browser
+            # A browser still starting up must finish before it can be closed
+            if self._browser_setup:
+                self._browser_setup.exception()
+                self._browser_setup = None
+            
+            if self.progress:
+                self.progress.finish()
+            
+            try:
+                self.metrics.stop_export()
+            except OSError as e:
+                self.logger.warning(f"Could not export metrics: {str(e)}")
+            
+            # Close browser and HTTP connections
             self.form_handler.close_driver()
+            if self.http_engine:
+                self.http_engine.close()
+            
+            if self.journal:
+                self.journal.close()
+            
+            # Send the last outcomes and hand back rows this worker won't process
+            if self.coordinator:
+                self.coordinator.close()
             
             # Calculate statistics
             self.stats['end_time'] = time.time()
@@ -151,9 +533,18 @@ class FormBot:
             # Display final statistics
             self._display_final_stats(duration)
             
+            if self.shard:
+                self._write_shard_result()
+            
         except Exception as e:
             self.logger.warning(f"Error during finalization: {str(e)}")
     
+    def _write_shard_result(self):
+        """Write this shard's results file for --merge-shards"""
+        job_id = self.journal.job_id if self.journal else hash_file(self.excel_file)
+        path = write_shard_result(self.shard, job_id, self.get_stats(), self.metrics)
+        self.logger.info(f"Shard {self.shard} results written to {path}")
+    
     def _display_final_stats(self, duration: float):
         """Display final execution statistics"""
         self.logger.info("=" * 50)
@@ -163,8 +554,25 @@ class FormBot:
         self.logger.info(f"Processed: {self.stats['processed']}")
         self.logger.info(f"Successful: {self.stats['successful']}")
         self.logger.info(f"Failed: {self.stats['failed']}")
-        self.logger.info(f"Success rate: {(self.stats['successful'] / self.stats['total_rows'] * 100):.1f}%")
+        if self.stats['retried']:
+            self.logger.info(f"Retries: {self.stats['retried']}")
+        if self.stats['skipped']:
+            self.logger.info(f"Skipped (already submitted): {self.stats['skipped']}")
+        # Rows skipped on --resume were submitted by an earlier run
+        if self.stats['processed']:
+            self.logger.info(f"Success rate: {(self.stats['successful'] / self.stats['processed'] * 100):.1f}%")
         self.logger.info(f"Duration: {duration:.2f} seconds")
+        
+        if len(self.stats['targets']) > 1:
+            self.logger.info("Per target:")
+            for url, target in sorted(self.stats['targets'].items()):
+                self.logger.info(f"  {url}: {target['successful']} successful, {target['failed']} failed")
+        
+        latency_lines = self.metrics.summary_lines()
+        if latency_lines:
+            self.logger.info("Latency per phase:")
+            for line in latency_lines:
+                self.logger.info(f"  {line}")
         self.logger.info("=" * 50)
     
     def get_stats(self) -> dict:
@@ -178,6 +586,9 @@ class FormBot:
             'processed': 0,
             'successful': 0,
             'failed': 0,
+            'skipped': 0,
+            'retried': 0,
+            'targets': {},
             'start_time': None,
             'end_time': None
         } 
\ No newline at end of file
@@ -5,8 +5,15 @@ Provides command-line interface and main execution logic
 
 import sys
 import argparse
-from form_bot import FormBot
+import glob
+import json
+import os
+from form_bot import FormBot, ENGINES
+from utils.checkpoint import hash_file
+from utils.coordinator import Coordinator, CoordinatorClient, LeaseStore
+from utils.excel_reader import ExcelReader
 from utils.logger import Logger
+from utils.sharding import Shard, merge_results
 import config
 
 def main():
@@ -20,13 +27,26 @@ Examples:
   python main.py --excel data.xlsx                  # Use specific Excel file
   python main.py --url http://example.com/form     # Use specific form URL
   python main.py --excel data.xlsx --url http://example.com/form
+  python main.py --workers 4 --headless             # Run 4 browsers in parallel
+  python main.py --reuse-page                       # Reset the form instead of reloading it
+  python main.py --workers 8 --headless --lean      # Lighter browsers, more of them per host
+  python main.py --detect-template --url https://example.com/contact
+  python main.py --engine http                      # Submit static forms without a browser
+  python main.py --engine async --concurrency 100 --rate 50  # Concurrent HTTP submissions at 50/s
+  python main.py --stream --excel big.xlsx          # Start submitting before the file is fully read
+  python main.py --excel contacts.jsonl             # CSV, JSONL and Parquet inputs are supported too
+  python main.py --resume                           # Continue an interrupted run
+  python main.py --shard 2/4 --excel contacts.csv   # Second of four machines sharing one file
+  python main.py --merge-shards                     # Combine the shards' results copied to logs/shards
+  python main.py --coordinate --excel contacts.csv  # Serve the rows to workers on port 8600
+  python main.py --coordinator http://10.0.0.5:8600 --headless  # Join as a worker (start or stop any time)
         """
     )
     
     parser.add_argument(
         '--excel', '-e',
         type=str,
-        help='Path to Excel file (default: from config)'
+        help='Path to input file: .xlsx, .csv, .jsonl or .parquet (default: from config)'
     )
     
     parser.add_argument(
@@ -41,6 +61,88 @@ Examples:
         help='Run browser in headless mode'
     )
     
+    parser.add_argument(
+        '--detect-template',
+        action='store_true',
+        help='Detect the form template from the page (cached per URL)'
+    )
+    
+    parser.add_argument(
+        '--lean',
+        action='store_true',
+        help='Lightweight browser profile: eager page loads, no images, fonts or trackers'
+    )
+    
+    parser.add_argument(
+        '--engine',
+        choices=ENGINES,
+        help='Submission engine: selenium (browser), http or async (static forms, no browser)'
+    )
+    
+    parser.add_argument(
+        '--concurrency', '-c',
+        type=int,
+        help='Submissions in flight with the async engine (default: from config)'
+    )
+    
+    parser.add_argument(
+        '--rate',
+        type=float,
+        help='Target submissions per second per host, shared by all workers (0 = unlimited; '
+             'default: one per delay_between_submissions with selenium, unlimited with http/async)'
+    )
+    
+    parser.add_argument(
+        '--workers', '-w',
+        type=int,
+        help='Number of parallel browser workers (default: from config)'
+    )
+    
+    parser.add_argument(
+        '--resume', '-r',
+        action='store_true',
+        help='Skip rows already submitted successfully in a previous run of the same file'
+    )
+    
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Stream rows from the input file instead of loading it all into memory'
+    )
+    
+    parser.add_argument(
+        '--reuse-page',
+        action='store_true',
+        help='Reset the loaded form in place instead of reloading the page per row'
+    )
+    
+    parser.add_argument(
+        '--shard',
+        type=str,
+        metavar='I/N',
+        help='Process only shard I of N (rows split by a stable hash of SHARDING key_field)'
+    )
+    
+    parser.add_argument(
+        '--merge-shards',
+        nargs='*',
+        metavar='FILE',
+        help='Merge per-shard results files into one report (default: all in SHARDING results_dir)'
+    )
+    
+    parser.add_argument(
+        '--coordinate',
+        action='store_true',
+        help='Run a coordinator that leases the input rows to workers (see COORDINATOR in config)'
+    )
+    
+    parser.add_argument(
+        '--coordinator',
+        type=str,
+        metavar='URL',
+        help='Take rows from the coordinator at URL instead of reading the input file'
+    )
+    
     parser.add_argument(
         '--verbose', '-v',
         action='store_true',
@@ -71,12 +173,55 @@ Examples:
             config.BROWSER_CONFIG['headless'] = True
             logger.info("Running in headless mode")
         
+        if args.detect_template:
+            config.TEMPLATES['auto_detect'] = True
+            logger.info("Template detection enabled")
+        
+        if args.lean:
+            config.BROWSER_CONFIG['lean'] = True
+            logger.info("Lean browser profile enabled")
+        
         if args.verbose:
             config.LOGGING['level'] = 'DEBUG'
             logger.info("Verbose logging enabled")
         
+        # The default rate limit depends on the engine
+        if args.engine:
+            config.EXECUTION['engine'] = args.engine
+        
+        if args.rate is not None:
+            if args.rate < 0:
+                raise ValueError("--rate must not be negative")
+            config.RATE_LIMIT['submissions_per_second'] = args.rate
+            logger.info(f"Rate limit: {args.rate} submissions per second" if args.rate else "Rate limit disabled")
+        
+        if args.reuse_page:
+            config.EXECUTION['reuse_page'] = True
+            logger.info("Page reuse enabled")
+        
+        if args.workers is not None:
+            if args.workers < 1:
+                raise ValueError("--workers must be at least 1")
+            logger.info(f"Using {args.workers} parallel workers")
+        
+        if args.merge_shards is not None:
+            _merge_shards(args.merge_shards)
+            return
+        
+        shard = Shard.parse(args.shard) if args.shard else None
+        if shard:
+            logger.info(f"Processing shard {shard} (by {shard.key_field})")
+        
+        if args.coordinate:
+            _run_coordinator(args.excel, shard, args.stream)
+            return
+        
+        coordinator = CoordinatorClient(args.coordinator) if args.coordinator else None
+        
         # Create and run bot
-        bot = FormBot()
+        bot = FormBot(workers=args.workers, engine=args.engine, concurrency=args.concurrency,
+                      stream=args.stream or None, resume=args.resume, shard=shard,
+                      coordinator=coordinator)
         
         if args.dry_run:
             logger.info("DRY RUN MODE - No forms will be submitted")
@@ -113,5 +258,97 @@ def _run_dry_run(bot: FormBot, excel_file: str = None):
         logger.error(f"DRY RUN failed: {str(e)}")
         raise
 
+def _run_coordinator(excel_file: str = None, shard: Shard = None, stream: bool = False):
+    """Load the input rows into the lease store and serve them until every row is finished"""
+    logger = Logger()
+    excel_file = excel_file or config.EXCEL_FILE
+    
+    reader = ExcelReader()
+    reader.shard = shard
+    if stream:
+        reader.open_stream(excel_file)
+        rows = reader.stream_rows()
+    else:
+        reader.read_file(excel_file)
+        reader.release_data()
+        rows = reader.iter_rows()
+    
+    store = LeaseStore()
+    try:
+        # Checks the host/token settings before any rows are read
+        coordinator = Coordinator(store)
+        
+        total = store.load(hash_file(excel_file), rows)
+        if total == 0:
+            raise ValueError("No valid data found in Excel file")
+        logger.info(f"Queued {total} rows for workers")
+        
+        counts = coordinator.serve()
+        
+        logger.info("=" * 50)
+        logger.info("COORDINATED JOB COMPLETED")
+        logger.info("=" * 50)
+        logger.info(f"Total rows: {sum(counts.values())}")
+        logger.info(f"Successful: {counts['done']}")
+        logger.info(f"Failed: {counts['failed']}")
+        for reason, count in store.failure_reasons():
+            logger.info(f"  {reason}: {count}")
+        logger.info("Rows per worker:")
+        for worker, worker_counts in sorted(store.worker_counts().items()):
+            logger.info(f"  {worker}: {worker_counts['done']} successful, {worker_counts['failed']} failed")
+        logger.info("=" * 50)
+    finally:
+        store.close()
+
+def _merge_shards(paths):
+    """Combine per-shard results files and display the merged report"""
+    logger = Logger()
+    
+    if not paths:
+        paths = sorted(glob.glob(os.path.join(config.SHARDING['results_dir'], 'shard-*-of-*.json')))
+    
+    report = merge_results(paths)
+    stats = report['stats']
+    
+    logger.info("=" * 50)
+    logger.info(f"MERGED REPORT ({len(report['shards'])} of {report['shard_count']} shards)")
+    logger.info("=" * 50)
+    logger.info(f"Total rows: {stats['total_rows']}")
+    logger.info(f"Processed: {stats['processed']}")
+    logger.info(f"Successful: {stats['successful']}")
+    logger.info(f"Failed: {stats['failed']}")
+    if stats['retried']:
+        logger.info(f"Retries: {stats['retried']}")
+    if stats['skipped']:
+        logger.info(f"Skipped (already submitted): {stats['skipped']}")
+    # Rows skipped on --resume were submitted by an earlier run
+    if stats['processed']:
+        logger.info(f"Success rate: {(stats['successful'] / stats['processed'] * 100):.1f}%")
+    if stats['start_time'] and stats['end_time']:
+        logger.info(f"Wall time: {stats['end_time'] - stats['start_time']:.2f} seconds")
+    
+    if len(stats['targets']) > 1:
+        logger.info("Per target:")
+        for url, target in sorted(stats['targets'].items()):
+            logger.info(f"  {url}: {target['successful']} successful, {target['failed']} failed")
+    
+    if report['latency_lines']:
+        logger.info("Latency per phase:")
+        for line in report['latency_lines']:
+            logger.info(f"  {line}")
+    logger.info("=" * 50)
+    
+    if report['missing_shards']:
+        logger.warning(f"Missing shards: {', '.join(map(str, report['missing_shards']))}")
+    if report['duplicate_shards']:
+        logger.warning(f"Shards reported more than once: {', '.join(map(str, report['duplicate_shards']))}")
+    
+    output = config.SHARDING['merged_file']
+    if os.path.dirname(output):
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as file:
+        json.dump(report, file, indent=2)
+    logger.info(f"Merged report written to {output}")
+
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -1,38 +1,227 @@
 """
 Test server for Form Bot
-Provides a simple HTTP server to serve the test form
+Provides a threaded HTTP server that serves the test form, accepts and records
+submissions, and can inject latency and errors
 """
 
+import errno
 import http.server
-import socketserver
-import os
+import json
+import random
 import sys
+import threading
+import time
 from pathlib import Path
+from urllib.parse import parse_qsl, urlsplit
+
+# Fields that make a request count as a form submission
+FORM_FIELDS = ('name', 'email', 'subject', 'message')
+
+SUCCESS_PAGE = b"""<!DOCTYPE html>
+<html><body><div class="success-message" id="success-message">Form submitted</div></body></html>
+"""
+
+class SubmissionRecorder:
+    """Thread-safe record of submissions and request counters"""
+    
+    def __init__(self, record_file=None):
+        self.record_file = open(record_file, 'a', encoding='utf-8') if record_file else None
+        self._lock = threading.Lock()
+        self.reset()
+    
+    def reset(self):
+        """Forget every submission and counter"""
+        with self._lock:
+            self.submissions = []
+            self.counters = {
+                'requests': 0,
+                'submissions': 0,
+                'accepted': 0,
+                'injected_errors': 0,
+                'slow_responses': 0,
+                'in_flight': 0,
+                'max_in_flight': 0
+            }
+            self.started = time.time()
+    
+    def request_started(self):
+        with self._lock:
+            self.counters['requests'] += 1
+            self.counters['in_flight'] += 1
+            self.counters['max_in_flight'] = max(self.counters['max_in_flight'], self.counters['in_flight'])
+    
+    def request_finished(self):
+        with self._lock:
+            self.counters['in_flight'] -= 1
+    
+    def count(self, counter):
+        with self._lock:
+            self.counters[counter] += 1
+    
+    def record(self, method, path, fields, status):
+        """Record one submission and the status it was answered with"""
+        entry = {'time': time.time(), 'method': method, 'path': path, 'status': status, 'fields': fields}
+        with self._lock:
+            self.counters['submissions'] += 1
+            if status < 400:
+                self.counters['accepted'] += 1
+            entry['id'] = self.counters['submissions']
+            self.submissions.append(entry)
+            if self.record_file:
+                self.record_file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+                self.record_file.flush()
+    
+    def stats(self):
+        """Counters plus submissions per second since the last reset"""
+        with self._lock:
+            stats = dict(self.counters)
+            elapsed = time.time() - self.started
+        stats['uptime'] = round(elapsed, 3)
+        stats['submissions_per_sec'] = round(stats['submissions'] / elapsed, 2) if elapsed else 0.0
+        return stats
+    
+    def since(self, submission_id=0):
+        """Submissions recorded after the given submission id"""
+        with self._lock:
+            return self.submissions[submission_id:]
+
+class FormBotRequestHandler(http.server.SimpleHTTPRequestHandler):
+    """Serves the test directory, records submissions and injects faults"""
+    
+    # Keep-alive connections, so clients can reuse them like a real site
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately; don't let Nagle delay the body
+    disable_nagle_algorithm = True
+    
+    # Set by FormBotTestServer
+    recorder = None
+    faults = None
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, directory=str(Path(__file__).parent), **kwargs)
+    
+    def log_message(self, format, *args):
+        if self.faults.get('verbose'):
+            super().log_message(format, *args)
+    
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        
+        if parts.path == '/stats':
+            return self._send_json(self.recorder.stats())
+        if parts.path == '/submissions':
+            since = int(dict(parse_qsl(parts.query)).get('since', 0))
+            return self._send_json(self.recorder.since(since))
+        if parts.path == '/':
+            self.path = '/test_form.html'
+        
+        # A GET carrying form fields is a submission of a method-less form
+        fields = dict(parse_qsl(parts.query, keep_blank_values=True))
+        if any(field in fields for field in FORM_FIELDS):
+            return self._handle_submission('GET', parts.path, fields)
+        
+        self._tracked(super().do_GET)
+    
+    def do_POST(self):
+        parts = urlsplit(self.path)
+        
+        if parts.path == '/reset':
+            self.recorder.reset()
+            return self._send_json({'reset': True})
+        
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length).decode('utf-8', errors='replace')
+        self._handle_submission('POST', parts.path, dict(parse_qsl(body, keep_blank_values=True)))
+    
+    def _tracked(self, handler):
+        self.recorder.request_started()
+        try:
+            handler()
+        finally:
+            self.recorder.request_finished()
+    
+    def _handle_submission(self, method, path, fields):
+        """Apply the configured faults, then record and answer the submission"""
+        def respond():
+            faults = self.faults
+            delay = faults['latency'] + random.uniform(0, faults['jitter'])
+            if faults['slow_rate'] and random.random() < faults['slow_rate']:
+                delay += faults['slow_seconds']
+                self.recorder.count('slow_responses')
+            if delay > 0:
+                time.sleep(delay)
+            
+            status = 200
+            if faults['error_rate'] and random.random() < faults['error_rate']:
+                status = faults['error_status']
+                self.recorder.count('injected_errors')
+            
+            self.recorder.record(method, path, fields, status)
+            body = SUCCESS_PAGE if status < 400 else b'Injected error\n'
+            self.send_response(status)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        
+        self._tracked(respond)
+    
+    def _send_json(self, data):
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
 
 class FormBotTestServer:
-    """Simple HTTP server for testing Form Bot"""
+    """Threaded HTTP server for testing Form Bot"""
     
-    def __init__(self, port=8000):
+    def __init__(self, port=8000, latency=0.0, jitter=0.0, error_rate=0.0, error_status=503,
+                 slow_rate=0.0, slow_seconds=5.0, record_file=None, verbose=False):
+        """
+        Args:
+            port: Port to listen on
+            latency: Seconds added to every submission
+            jitter: Extra random delay of up to this many seconds per submission
+            error_rate: Fraction of submissions answered with error_status
+            error_status: HTTP status used for injected errors
+            slow_rate: Fraction of submissions delayed by slow_seconds
+            slow_seconds: Extra delay of a slow response
+            record_file: Append every submission to this JSON lines file
+            verbose: Log every request to the console
+        """
         self.port = port
         self.server = None
-        
+        self.recorder = SubmissionRecorder(record_file)
+        self.faults = {
+            'latency': latency,
+            'jitter': jitter,
+            'error_rate': error_rate,
+            'error_status': error_status,
+            'slow_rate': slow_rate,
+            'slow_seconds': slow_seconds,
+            'verbose': verbose
+        }
+    
+    def _create_server(self):
+        handler = type('Handler', (FormBotRequestHandler,), {'recorder': self.recorder, 'faults': self.faults})
+        server = http.server.ThreadingHTTPServer(("", self.port), handler)
+        server.daemon_threads = True
+        return server
+    
     def start(self):
         """Start the test server"""
         try:
-            # Change to the test directory
-            test_dir = Path(__file__).parent
-            os.chdir(test_dir)
-            
-            # Create server
-            handler = http.server.SimpleHTTPRequestHandler
-            
-            with socketserver.TCPServer(("", self.port), handler) as httpd:
+            with self._create_server() as httpd:
                 self.server = httpd
                 print("=" * 60)
                 print("FORM BOT TEST SERVER")
                 print("=" * 60)
                 print(f"Server running at: http://localhost:{self.port}")
                 print(f"Test form available at: http://localhost:{self.port}/test_form.html")
+                print(f"Counters: http://localhost:{self.port}/stats")
+                print(f"Recorded submissions: http://localhost:{self.port}/submissions")
                 print("=" * 60)
                 print("Press Ctrl+C to stop the server")
                 print("=" * 60)
@@ -41,9 +230,9 @@ class FormBotTestServer:
                     httpd.serve_forever()
                 except KeyboardInterrupt:
                     print("\nServer stopped by user")
-                    
+        
         except OSError as e:
-            if e.errno == 48:  # Address already in use
+            if e.errno == errno.EADDRINUSE:
                 print(f"Error: Port {self.port} is already in use.")
                 print(f"Try using a different port: python test_server.py --port {self.port + 1}")
             else:
@@ -51,10 +240,18 @@ class FormBotTestServer:
         except Exception as e:
             print(f"Unexpected error: {e}")
     
+    def start_background(self):
+        """Start the server on a daemon thread and return immediately"""
+        self.server = self._create_server()
+        thread = threading.Thread(target=self.server.serve_forever, name='test-server', daemon=True)
+        thread.start()
+        return thread
+    
     def stop(self):
         """Stop the test server"""
         if self.server:
             self.server.shutdown()
+            self.server.server_close()
 
 def main():
     """Main function with command-line argument parsing"""
@@ -65,8 +262,12 @@ def main():
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
 Examples:
-  python test_server.py              # Start server on port 8000
-  python test_server.py --port 8080  # Start server on port 8080
+  python test_server.py                                # Start server on port 8000
+  python test_server.py --port 8080                    # Start server on port 8080
+  python test_server.py --latency 0.2 --jitter 0.1     # 200-300ms per submission
+  python test_server.py --error-rate 0.05              # Answer 5%% of submissions with HTTP 503
+  python test_server.py --slow-rate 0.01 --slow-seconds 15
+  python test_server.py --record submissions.jsonl     # Keep every submission on disk
         """
     )
     
@@ -76,6 +277,14 @@ Examples:
         default=8000,
         help='Port to run the server on (default: 8000)'
     )
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every submission')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Random extra delay of up to this many seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of submissions answered with an error')
+    parser.add_argument('--error-status', type=int, default=503, help='HTTP status of injected errors (default: 503)')
+    parser.add_argument('--slow-rate', type=float, default=0.0, help='Fraction of submissions answered slowly')
+    parser.add_argument('--slow-seconds', type=float, default=5.0, help='Extra delay of a slow response (default: 5)')
+    parser.add_argument('--record', help='Append every submission to this JSON lines file')
+    parser.add_argument('--verbose', '-v', action='store_true', help='Log every request')
     
     args = parser.parse_args()
     
@@ -85,8 +294,12 @@ Examples:
         sys.exit(1)
     
     # Start server
-    server = FormBotTestServer(args.port)
+    server = FormBotTestServer(
+        args.port, latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+        error_status=args.error_status, slow_rate=args.slow_rate, slow_seconds=args.slow_seconds,
+        record_file=args.record, verbose=args.verbose
+    )
     server.start()
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
@@ -0,0 +1,67 @@
+"""
+Shared pytest setup for the Form Bot unit tests
+"""
+
+import os
+import sys
+import time
+import pytest
+
+# Make the top-level modules (config, form_templates) and the utils package importable
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class FakeClock:
+    """Stands in for time.time or time.monotonic so timing can be checked exactly"""
+
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.now += seconds
+
+
+@pytest.fixture
+def monotonic_clock(monkeypatch):
+    """Fake time.monotonic; time.sleep advances it instead of sleeping"""
+    clock = FakeClock()
+    monkeypatch.setattr(time, 'monotonic', clock)
+    monkeypatch.setattr(time, 'sleep', clock.sleep)
+    return clock
+
+
+@pytest.fixture
+def wall_clock(monkeypatch):
+    """Fake time.time (time.monotonic and time.sleep stay real, so threads and sockets work)"""
+    clock = FakeClock()
+    monkeypatch.setattr(time, 'time', clock)
+    return clock
+
+
+@pytest.fixture
+def make_rows():
+    """Build (row index, row data) pairs with the given per-row URLs"""
+    def make(urls):
+        return [(index, {'name': f'n{index}', 'url': url}) for index, url in enumerate(urls)]
+    return make
+
+
+@pytest.fixture
+def write_contacts(tmp_path):
+    """Write contact records to an input file in tmp_path; the format follows the extension"""
+    import pandas as pd
+
+    def write(records, name='contacts.csv'):
+        path = tmp_path / name
+        data = pd.DataFrame(records)
+        if name.endswith('.jsonl'):
+            data.to_json(path, orient='records', lines=True, force_ascii=False)
+        elif name.endswith('.parquet'):
+            data.to_parquet(path, index=False)
+        else:
+            data.to_csv(path, index=False)
+        return str(path)
+    return write
@@ -0,0 +1,98 @@
+"""
+Tests for the checkpoint journal and skipping finished rows on --resume
+"""
+
+import pytest
+import config
+from form_bot import FormBot
+from utils.checkpoint import CheckpointJournal, hash_file, row_key
+
+CONTACTS = [
+    {'Nome': name, 'Email': f'{name.lower()}@example.com', 'Assunto': 'Hello', 'Mensagem': 'Hi there'}
+    for name in ('Ana', 'Bia', 'Caio', 'Duda')
+]
+
+
+@pytest.fixture
+def journal_path(tmp_path, monkeypatch):
+    path = str(tmp_path / 'checkpoints.db')
+    monkeypatch.setitem(config.CHECKPOINT, 'file', path)
+    return path
+
+
+def resumed_bot(input_path):
+    bot = FormBot(engine='http', resume=True)
+    bot._read_excel_data(input_path)
+    bot._open_journal(input_path)
+    return bot
+
+
+def test_row_key_depends_on_position_and_values():
+    row = {'name': 'Ana', 'email': 'ana@example.com'}
+
+    assert row_key(0, row) == row_key(0, dict(reversed(list(row.items()))))
+    assert row_key(0, row) != row_key(1, row)
+    assert row_key(0, row) != row_key(0, {**row, 'email': 'bia@example.com'})
+
+
+def test_outcomes_survive_reopening_the_journal(write_contacts, journal_path):
+    input_path = write_contacts(CONTACTS)
+    journal = CheckpointJournal(input_path)
+    journal.record('0:a', True)
+    journal.record('1:b', False, 'HTTP 400')
+    journal.record('2:c', False, 'timeout')
+    journal.record('2:c', True)
+    journal.close()
+
+    reopened = CheckpointJournal(input_path)
+
+    assert reopened.job_id == hash_file(input_path)
+    assert reopened.completed_rows() == {'0:a', '2:c'}
+    reopened.close()
+
+
+def test_a_changed_input_file_starts_a_new_job(write_contacts, journal_path):
+    input_path = write_contacts(CONTACTS)
+    journal = CheckpointJournal(input_path)
+    journal.record('0:a', True)
+    journal.close()
+
+    write_contacts(CONTACTS + [{**CONTACTS[0], 'Nome': 'Eva'}])
+    changed = CheckpointJournal(input_path)
+
+    assert changed.job_id != journal.job_id
+    assert changed.completed_rows() == set()
+    changed.close()
+
+
+def test_resume_skips_successful_rows_only(write_contacts, journal_path):
+    input_path = write_contacts(CONTACTS)
+    first = resumed_bot(input_path)
+    rows = list(first._iter_rows())
+    first._record_result(True, *rows[0])
+    first._record_result(False, *rows[1], status=400)
+    first._record_result(True, *rows[3])
+    first.journal.close()
+
+    second = resumed_bot(input_path)
+    remaining = [row_data['name'] for _, row_data in second._iter_rows()]
+    second.journal.close()
+
+    assert remaining == ['Bia', 'Caio']
+    assert second.stats['skipped'] == 2
+
+
+def test_resume_after_the_file_changed_processes_every_row(write_contacts, journal_path):
+    input_path = write_contacts(CONTACTS)
+    first = resumed_bot(input_path)
+    for index, row_data in first._iter_rows():
+        first._record_result(True, index, row_data)
+    first.journal.close()
+
+    write_contacts([{**contact, 'Assunto': 'Hello again'} for contact in CONTACTS])
+    second = resumed_bot(input_path)
+    remaining = list(second._iter_rows())
+    second.journal.close()
+
+    assert len(remaining) == 4
+    assert second.stats['skipped'] == 0
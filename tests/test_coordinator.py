@@ -0,0 +1,238 @@
+"""
+Tests for the coordinator's lease store and request validation
+"""
+
+import json
+import socket
+import urllib.error
+import urllib.request
+import pytest
+import config
+from utils.coordinator import (
+    DONE, FAILED, LEASED, PENDING, TOKEN_HEADER,
+    Coordinator, CoordinatorClient, LeaseStore, _parse_results,
+)
+
+
+@pytest.fixture
+def store(tmp_path, wall_clock):
+    store = LeaseStore(str(tmp_path / 'coordinator.db'), lease_seconds=60, max_attempts=2)
+    store._retry.backoff = lambda attempt: 10.0
+    yield store
+    store.close()
+
+
+def test_load_and_lease_grouped_by_target(store, make_rows):
+    assert store.load('job', make_rows(['b', 'a', 'b', 'a'])) == 4
+    assert store.has_targets
+
+    status, leased = store.lease('w1', 2)
+
+    assert status == 'ok'
+    assert [index for index, _ in leased] == [1, 3]
+    assert leased[0][1] == {'name': 'n1', 'url': 'a'}
+    assert store.counts() == {PENDING: 2, LEASED: 2, DONE: 0, FAILED: 0}
+
+
+def test_lease_waits_while_rows_are_leased_and_reports_done(store, make_rows):
+    store.load('job', make_rows(['', '']))
+    store.lease('w1', 2)
+
+    assert store.lease('w2', 2) == ('wait', [])
+
+    assert store.complete('w1', [(0, 'success', None), (1, 'failed', 'validation')]) == 2
+    assert store.lease('w2', 2) == ('done', [])
+    assert store.counts()[DONE] == 1
+    assert store.failure_reasons() == [('validation', 1)]
+    assert store.worker_counts() == {'w1': {DONE: 1, FAILED: 1}}
+
+
+def test_retry_goes_back_after_backoff_until_attempts_run_out(store, wall_clock, make_rows):
+    store.load('job', make_rows(['']))
+    store.lease('w1', 1)
+
+    store.complete('w1', [(0, 'retry', 'timeout')])
+    assert store.counts()[PENDING] == 1
+    assert store.lease('w1', 1) == ('wait', [])
+
+    wall_clock.now += 10
+    status, leased = store.lease('w2', 1)
+    assert status == 'ok' and leased[0][0] == 0
+
+    store.complete('w2', [(0, 'retry', 'timeout')])
+    assert store.counts()[FAILED] == 1
+    assert store.lease('w2', 1) == ('done', [])
+
+
+def test_failures_only_count_for_the_lease_holder(store, make_rows):
+    store.load('job', make_rows(['', '']))
+    store.lease('w1', 2)
+
+    assert store.complete('w2', [(0, 'failed', 'x'), (1, 'retry', 'x')]) == 0
+    # A success is kept even from a worker that lost the lease
+    assert store.complete('w2', [(0, 'success', None)]) == 1
+    assert store.counts() == {PENDING: 0, LEASED: 1, DONE: 1, FAILED: 0}
+
+
+def test_expired_leases_are_reclaimed_unless_renewed(store, wall_clock, make_rows):
+    store.load('job', make_rows(['', '', '']))
+    store.lease('w1', 3)
+
+    wall_clock.now += 50
+    assert store.renew('w1', [1]) == 1
+    assert store.renew('w2', [2]) == 0
+
+    wall_clock.now += 20
+    assert store.reclaim() == 2
+    assert store.counts() == {PENDING: 2, LEASED: 1, DONE: 0, FAILED: 0}
+
+    # A second expiry uses up the last attempt of the reclaimed rows
+    store.lease('w1', 2)
+    wall_clock.now += 61
+    assert store.reclaim() == 3
+    assert store.counts() == {PENDING: 1, LEASED: 0, DONE: 0, FAILED: 2}
+    assert store.failure_reasons() == [('lease expired', 2)]
+
+
+def test_release_returns_rows_without_using_an_attempt(store, make_rows):
+    store.load('job', make_rows(['', '']))
+    store.lease('w1', 2)
+
+    assert store.release('w1') == 2
+
+    store.lease('w2', 2)
+    assert store.release('w2') == 2
+    store.lease('w3', 2)
+    assert store.complete('w3', [(0, 'retry', 'x')]) == 1
+    assert store.counts()[PENDING] == 1
+
+
+def test_existing_job_is_resumed_without_reading_rows(store, tmp_path, make_rows):
+    store.load('job', make_rows(['a', '']))
+    store.lease('w1', 1)
+    store.complete('w1', [(0, 'success', None)])
+
+    resumed = LeaseStore(store.path, lease_seconds=60)
+    try:
+        assert resumed.load('job', iter(())) == 2
+        assert resumed.has_targets
+        assert resumed.counts()[DONE] == 1
+    finally:
+        resumed.close()
+
+
+@pytest.mark.parametrize('results', ['abc', [[1]], [[1, 'bogus', None]], [['x', 'success', None]], [None]])
+def test_parse_results_rejects_malformed_results(results):
+    with pytest.raises((ValueError, TypeError)):
+        _parse_results(results)
+
+
+def test_parse_results():
+    assert _parse_results(None) == []
+    assert _parse_results([[1, 'success', None], ['2', 'retry', 503]]) == [(1, 'success', None), (2, 'retry', '503')]
+
+
+def test_remote_host_requires_a_token(tmp_path):
+    store = LeaseStore(str(tmp_path / 'coordinator.db'))
+    try:
+        with pytest.raises(ValueError):
+            Coordinator(store, host='0.0.0.0', port=0, token='')
+        Coordinator(store, host='0.0.0.0', port=0, token='secret')
+        Coordinator(store, host='127.0.0.1', port=0, token='')
+    finally:
+        store.close()
+
+
+def test_requests_need_the_token_and_a_valid_body(tmp_path, make_rows):
+    store = LeaseStore(str(tmp_path / 'coordinator.db'))
+    store.load('job', make_rows(['']))
+    coordinator = Coordinator(store, host='127.0.0.1', port=0, token='secret')
+    coordinator.start_background()
+    url = f"http://127.0.0.1:{coordinator.server.server_address[1]}"
+
+    def post(path, body, token='secret'):
+        headers = {TOKEN_HEADER: token} if token else {}
+        request = urllib.request.Request(url + path, data=body, headers=headers)
+        try:
+            with urllib.request.urlopen(request, timeout=5) as response:
+                return response.status, json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            return e.code, json.loads(e.read())
+
+    try:
+        assert post('/lease', b'{"worker": "w1"}', token=None)[0] == 401
+        assert post('/lease', b'{"worker": "w1"}', token='wrong')[0] == 401
+        assert post('/lease', b'not json')[0] == 400
+        assert post('/lease', b'[1, 2]')[0] == 400
+        assert post('/lease', b'{"worker": "w1", "results": [[0]]}')[0] == 400
+        assert post('/lease', b'{"worker": "w1", "count": "many"}')[0] == 400
+        assert store.counts()[PENDING] == 1
+
+        status, response = post('/lease', b'{"worker": "w1", "count": 5}')
+        assert status == 200
+        assert response['status'] == 'ok' and len(response['rows']) == 1
+    finally:
+        coordinator.stop()
+        store.close()
+
+
+def test_oversized_requests_and_lease_counts_are_capped(tmp_path, monkeypatch, make_rows):
+    monkeypatch.setitem(config.COORDINATOR, 'max_request_bytes', 100)
+    monkeypatch.setitem(config.COORDINATOR, 'max_lease_rows', 3)
+    store = LeaseStore(str(tmp_path / 'coordinator.db'))
+    store.load('job', make_rows([''] * 10))
+    coordinator = Coordinator(store, host='127.0.0.1', port=0, token='secret')
+    coordinator.start_background()
+    address = coordinator.server.server_address
+
+    try:
+        # The coordinator answers from the headers alone, without waiting for the body
+        with socket.create_connection(address, timeout=5) as client:
+            client.sendall(b'POST /lease HTTP/1.1\r\nHost: x\r\nContent-Length: 1000000000\r\n'
+                           b'X-Coordinator-Token: secret\r\n\r\n')
+            assert client.recv(1024).startswith(b'HTTP/1.1 413')
+        with socket.create_connection(address, timeout=5) as client:
+            client.sendall(b'POST /lease HTTP/1.1\r\nHost: x\r\nContent-Length: 1000000000\r\n\r\n')
+            assert client.recv(1024).startswith(b'HTTP/1.1 401')
+
+        request = urllib.request.Request(
+            f"http://{address[0]}:{address[1]}/lease", data=b'{"worker": "w1", "count": 1000}',
+            headers={TOKEN_HEADER: 'secret'}
+        )
+        with urllib.request.urlopen(request, timeout=5) as response:
+            assert len(json.loads(response.read())['rows']) == 3
+    finally:
+        coordinator.stop()
+        store.close()
+
+
+def test_client_renews_every_row_it_has_not_reported(tmp_path, wall_clock, make_rows):
+    store = LeaseStore(str(tmp_path / 'coordinator.db'), lease_seconds=60)
+    store.load('job', make_rows([''] * 4))
+    coordinator = Coordinator(store, host='127.0.0.1', port=0, token='secret')
+    coordinator.start_background()
+    client = CoordinatorClient(
+        f"http://127.0.0.1:{coordinator.server.server_address[1]}", 'w1', batch_size=2, token='secret'
+    )
+    client.heartbeat_interval = 0
+
+    try:
+        taken = client.iter_rows()
+        assert [next(taken)[0], next(taken)[0]] == [0, 1]
+
+        # Rows 0 and 1 are still being processed when the next batch is leased
+        wall_clock.now += 50
+        assert next(taken)[0] == 2
+        wall_clock.now += 20
+        assert store.reclaim() == 0
+
+        client.report(0, 'success')
+        wall_clock.now += 50
+        assert next(taken)[0] == 3
+        assert client._in_flight == {1, 2, 3}
+        wall_clock.now += 20
+        assert store.reclaim() == 0
+        assert store.counts() == {PENDING: 0, LEASED: 3, DONE: 1, FAILED: 0}
+    finally:
+        coordinator.stop()
+        store.close()
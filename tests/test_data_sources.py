@@ -0,0 +1,76 @@
+"""
+Tests for reading input files in chunks through their data source
+"""
+
+import pytest
+from utils.data_sources import CsvSource, DataSource, JsonlSource, ParquetSource, get_data_source
+
+CONTACTS = [
+    {'Nome': f'Name {number}', 'Email': f'user{number}@example.com', 'Telefone': f'0{number:04d}'}
+    for number in range(10)
+]
+
+
+def test_data_source_is_abstract():
+    with pytest.raises(TypeError):
+        DataSource('contacts.csv')
+
+
+@pytest.mark.parametrize('name, source_type', [
+    ('contacts.csv', CsvSource),
+    ('contacts.jsonl', JsonlSource),
+    ('contacts.NDJSON', JsonlSource),
+    ('contacts.parquet', ParquetSource),
+])
+def test_source_is_picked_by_extension(name, source_type):
+    assert isinstance(get_data_source(name), source_type)
+
+
+def test_unsupported_extension_is_an_error():
+    with pytest.raises(ValueError, match="Unsupported input format '.txt'"):
+        get_data_source('contacts.txt')
+
+
+@pytest.mark.parametrize('name', ['contacts.csv', 'contacts.jsonl'])
+def test_text_files_are_read_in_chunks(write_contacts, name):
+    source = get_data_source(write_contacts(CONTACTS, name), chunk_size=4)
+
+    chunks = list(source.iter_chunks(['Nome', 'Telefone']))
+
+    assert [len(chunk) for chunk in chunks] == [4, 4, 2]
+    assert all(list(chunk.columns) == ['Nome', 'Telefone'] for chunk in chunks)
+    assert source.estimate_rows() == 10
+    # Values are kept as written, leading zeros included
+    assert source.read(['Telefone'])['Telefone'].tolist() == [contact['Telefone'] for contact in CONTACTS]
+
+
+def test_jsonl_columns_are_collected_from_every_line(write_contacts):
+    records = [{'Nome': 'Ana', 'Email': 'ana@example.com'}, {'Nome': 'Bia', 'URL': 'https://example.com/contact'}]
+    source = get_data_source(write_contacts(records, 'contacts.jsonl'))
+
+    assert source.columns() == ['Nome', 'Email', 'URL']
+
+    data = source.read(['Nome', 'URL'])
+    assert data['Nome'].tolist() == ['Ana', 'Bia']
+    assert data['URL'].isna().tolist() == [True, False]
+
+
+def test_empty_jsonl_file_has_no_rows(tmp_path):
+    path = tmp_path / 'contacts.jsonl'
+    path.write_text('')
+    source = get_data_source(str(path))
+
+    assert source.columns() == []
+    assert len(source.read(['Nome'])) == 0
+
+
+def test_parquet_files_are_read_in_record_batches(write_contacts):
+    pytest.importorskip('pyarrow')
+    source = get_data_source(write_contacts(CONTACTS, 'contacts.parquet'), chunk_size=4)
+
+    chunks = list(source.iter_chunks(['Nome', 'Telefone']))
+
+    assert source.columns() == ['Nome', 'Email', 'Telefone']
+    assert [len(chunk) for chunk in chunks] == [4, 4, 2]
+    assert all(list(chunk.columns) == ['Nome', 'Telefone'] for chunk in chunks)
+    assert source.estimate_rows() == 10
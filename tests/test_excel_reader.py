@@ -0,0 +1,166 @@
+"""
+Tests for input validation: trimming, length limits and rejection reasons
+"""
+
+import pytest
+import config
+from utils.excel_reader import REJECTION_COLUMN, ExcelReader
+
+
+def contact(name='Ana', email='ana@example.com', subject='Hello', message='Hi there', **extra):
+    record = {'Nome': name, 'Email': email, 'Assunto': subject, 'Mensagem': message}
+    record.update(extra)
+    return record
+
+
+def read(path):
+    reader = ExcelReader()
+    reader.read_file(path)
+    return reader
+
+
+def stream(path):
+    reader = ExcelReader()
+    reader.open_stream(path)
+    return reader, list(reader.stream_rows())
+
+
+def test_valid_rows_are_kept(write_contacts):
+    reader = read(write_contacts([contact(), contact(name='Bia', email='bia@example.com')]))
+
+    assert reader.get_total_rows() == 2
+    assert len(reader.rejected) == 0
+    assert reader.get_data_for_row(1)['name'] == 'Bia'
+
+
+def test_whitespace_is_trimmed(write_contacts):
+    reader = read(write_contacts([contact(name='  Ana ', email=' ana@example.com\t', subject=' Hello')]))
+
+    row = reader.get_data_for_row(0)
+    assert row['name'] == 'Ana'
+    assert row['email'] == 'ana@example.com'
+    assert row['subject'] == 'Hello'
+
+
+def test_whitespace_is_kept_when_trimming_is_disabled(monkeypatch, write_contacts):
+    monkeypatch.setitem(config.VALIDATION, 'strip_whitespace', False)
+
+    reader = read(write_contacts([contact(name='  Ana ')]))
+
+    assert reader.get_data_for_row(0)['name'] == '  Ana '
+
+
+@pytest.mark.parametrize('record, reason', [
+    (contact(name=''), 'missing_name'),
+    (contact(name='   '), 'missing_name'),
+    (contact(email=''), 'missing_email'),
+    (contact(subject=''), 'missing_subject'),
+    (contact(message=''), 'missing_message'),
+    (contact(message='x' * 11), 'too_long_message'),
+    (contact(name='Ana Maria Silva'), 'too_long_name'),
+    (contact(URL='ftp://example.com/contact'), 'invalid_url'),
+    (contact(Template='no-such-template'), 'invalid_template'),
+])
+def test_each_rejection_reason(monkeypatch, write_contacts, record, reason):
+    monkeypatch.setitem(config.VALIDATION, 'max_lengths', {'name': 10, 'message': 10})
+    valid = contact(URL='https://example.com/contact', Template='bootstrap')
+    record = {**valid, **record}
+
+    reader = read(write_contacts([valid, record]))
+
+    assert reader.get_total_rows() == 1
+    assert reader.rejected[REJECTION_COLUMN].tolist() == [reason]
+
+
+def test_length_limit_applies_after_trimming(monkeypatch, write_contacts):
+    monkeypatch.setitem(config.VALIDATION, 'max_lengths', {'message': 8})
+
+    reader = read(write_contacts([contact(message='  Hi there  ')]))
+
+    assert reader.get_total_rows() == 1
+
+
+def test_only_the_first_failing_check_is_reported(write_contacts):
+    reader = read(write_contacts([contact(name='', subject='')]))
+
+    assert reader.rejected[REJECTION_COLUMN].tolist() == ['missing_name']
+
+
+def test_empty_optional_targets_are_valid(write_contacts):
+    records = [contact(URL='', Template=''), contact(URL='https://example.com/contact', Template='bootstrap')]
+
+    reader = read(write_contacts(records))
+
+    assert reader.get_total_rows() == 2
+    assert reader.has_targets()
+
+
+def test_invalid_emails_are_only_warned_about_by_default(write_contacts):
+    reader = read(write_contacts([contact(email='not-an-email'), contact()]))
+
+    assert reader.get_total_rows() == 2
+    assert len(reader.rejected) == 0
+
+
+def test_invalid_emails_are_dropped_when_configured(monkeypatch, write_contacts):
+    monkeypatch.setitem(config.VALIDATION, 'drop_invalid_emails', True)
+    records = [
+        contact(email='not-an-email'),
+        contact(email='ana@example'),
+        contact(email='bia@example.com'),
+        contact(email=' caio@example.com '),
+    ]
+
+    reader = read(write_contacts(records))
+
+    assert [row['email'] for _, row in reader.iter_rows()] == ['bia@example.com', 'caio@example.com']
+    assert reader.rejected[REJECTION_COLUMN].tolist() == ['invalid_email', 'invalid_email']
+    assert reader.rejected['Email'].tolist() == ['not-an-email', 'ana@example']
+
+
+def test_missing_required_column_is_an_error(write_contacts):
+    path = write_contacts([{'Nome': 'Ana', 'Email': 'ana@example.com', 'Assunto': 'Hello'}])
+
+    with pytest.raises(ValueError, match='Mensagem'):
+        read(path)
+
+
+def test_streaming_applies_the_same_rules(monkeypatch, write_contacts):
+    monkeypatch.setitem(config.VALIDATION, 'drop_invalid_emails', True)
+    monkeypatch.setitem(config.VALIDATION, 'max_lengths', {'message': 10})
+    records = [
+        contact(name=' Ana '),
+        contact(email='not-an-email'),
+        contact(message='x' * 11),
+        contact(URL='ftp://example.com/contact'),
+        contact(name='', URL='https://example.com/contact'),
+        contact(name='Bia', email='bia@example.com', Template='bootstrap'),
+    ]
+    path = write_contacts(records)
+
+    reader = read(path)
+    _, streamed = stream(path)
+
+    assert streamed == list(reader.iter_rows())
+    assert [row['name'] for _, row in streamed] == ['Ana', 'Bia']
+    assert reader.rejected[REJECTION_COLUMN].tolist() == [
+        'invalid_email', 'too_long_message', 'invalid_url', 'missing_name'
+    ]
+
+
+def test_vectorized_reasons_match_the_per_row_check(monkeypatch, write_contacts):
+    monkeypatch.setitem(config.VALIDATION, 'drop_invalid_emails', True)
+    monkeypatch.setitem(config.VALIDATION, 'max_lengths', {'subject': 5})
+    records = [
+        contact(email=email, subject=subject)
+        for email in ('ana@example.com', 'bad', ' ', 'a.b+c@sub.example.org', 'x@y.z')
+        for subject in ('Hi', 'Hello there', '')
+    ]
+    reader = read(write_contacts(records))
+
+    expected = [reader._row_rejection_reason(
+        {'name': record['Nome'], 'email': record['Email'], 'subject': record['Assunto'], 'message': record['Mensagem']}
+    ) for record in records]
+
+    rejected = dict(zip(reader.rejected.index, reader.rejected[REJECTION_COLUMN]))
+    assert [rejected.get(position, '') for position in range(len(records))] == expected
@@ -0,0 +1,43 @@
+"""
+Tests for FormBot's row accounting
+"""
+
+from form_bot import FormBot
+
+
+class FakeCoordinator:
+    """Hands out a fixed lease sequence, with retried rows leased again"""
+
+    url = 'http://coordinator.example'
+    worker_id = 'test-worker'
+
+    def __init__(self, indexes):
+        self.indexes = indexes
+        self.reports = []
+
+    def iter_rows(self):
+        for index in self.indexes:
+            yield index, {'name': f'n{index}', 'email': f'n{index}@example.com'}
+
+    def report(self, index, outcome, detail=None):
+        self.reports.append((index, outcome))
+
+
+def test_rows_leased_again_after_a_retry_are_counted_once():
+    # Rows 0 and 1 fail transiently, go back to the coordinator and are leased again
+    coordinator = FakeCoordinator([0, 1, 2, 0, 1])
+    bot = FormBot(engine='http', coordinator=coordinator)
+    failures = {0: 1, 1: 1}
+
+    for index, row_data in bot._iter_rows():
+        bot._mark_processed(index)
+        if failures.get(index):
+            failures[index] -= 1
+            bot._record_result(False, index, row_data, ConnectionResetError())
+        else:
+            bot._record_result(True, index, row_data)
+
+    assert bot.stats['total_rows'] == 3
+    assert bot.stats['processed'] == 3
+    assert (bot.stats['successful'], bot.stats['failed'], bot.stats['retried']) == (3, 0, 2)
+    assert coordinator.reports == [(0, 'retry'), (1, 'retry'), (2, 'success'), (0, 'success'), (1, 'success')]
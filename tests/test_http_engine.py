@@ -0,0 +1,180 @@
+"""
+Tests for the HTTP engine's form parsing and keep-alive connection handling
+"""
+
+import http.client
+import http.server
+import socket
+import threading
+import time
+import pytest
+import config
+from utils.http_engine import HttpFormEngine, parse_form
+
+FIELDS = {
+    'name': '//input[@name="name"]',
+    'email': '//*[@id="email"]',
+    'subject': '//input[@name="subject"]',
+    'message': '//textarea[@name="message"]',
+    'consent': '//input[@name="consent"]',
+    'submit': '//button[@type="submit"]'
+}
+
+PAGE = """
+<form action="/search"><input name="q"></form>
+<form action="/contact" method="post">
+  <input type="hidden" name="token" value="abc">
+  <input name="name">
+  <input id="email" name="email" type="email">
+  <input name="subject" value="Hello">
+  <textarea name="message">Default text</textarea>
+  <select name="topic"><option value="a">A</option><option value="b" selected>B</option></select>
+  <input type="checkbox" name="consent" value="yes">
+  <input type="checkbox" name="newsletter" checked>
+  <input type="text" name="disabled_field" disabled>
+  <input type="submit" name="send" value="Send">
+  <button type="submit">Send</button>
+</form>
+"""
+
+
+def test_parse_form_picks_the_matching_form():
+    spec = parse_form(PAGE, 'http://example.com/page/', FIELDS)
+
+    assert spec.action == 'http://example.com/contact'
+    assert spec.method == 'POST'
+    assert spec.field_names == {'name': 'name', 'email': 'email', 'subject': 'subject', 'message': 'message'}
+    assert spec.consent == ('consent', 'yes')
+    assert spec.defaults == [
+        ('token', 'abc'), ('name', ''), ('email', ''), ('subject', 'Hello'),
+        ('message', 'Default text'), ('topic', 'b'), ('newsletter', 'on')
+    ]
+
+
+def test_build_payload_fills_row_data_in_form_order():
+    spec = parse_form(PAGE, 'http://example.com/', FIELDS)
+
+    payload = spec.build_payload({'name': 'Ana', 'email': 'ana@example.com', 'subject': '', 'message': 'Hi'})
+
+    assert payload == [
+        ('token', 'abc'), ('name', 'Ana'), ('email', 'ana@example.com'), ('subject', 'Hello'),
+        ('message', 'Hi'), ('topic', 'b'), ('newsletter', 'on'), ('consent', 'yes')
+    ]
+
+
+def test_parse_form_defaults_to_get_on_the_page_url():
+    spec = parse_form('<form><input name="name"></form>', 'http://example.com/form?x=1', FIELDS)
+
+    assert (spec.action, spec.method) == ('http://example.com/form?x=1', 'GET')
+
+
+def test_parse_form_without_a_matching_form():
+    with pytest.raises(ValueError):
+        parse_form('<form><input name="other"></form>', 'http://example.com/', FIELDS)
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    """Answers 200, but drops or stalls the requests the test asks it to"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _answer(self):
+        server = self.server
+        length = int(self.headers.get('Content-Length') or 0)
+        self.rfile.read(length)
+        with server.lock:
+            server.requests.append((self.command, self.path))
+            action = server.actions.pop(0) if server.actions else 'ok'
+
+        if action == 'drop':
+            self.close_connection = True
+            self.connection.shutdown(socket.SHUT_RDWR)
+            return
+        if action == 'stall':
+            time.sleep(server.stall_seconds)
+
+        body = b'ok'
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = _answer
+    do_POST = _answer
+
+
+@pytest.fixture
+def server():
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.requests = []
+    server.actions = []
+    server.stall_seconds = 0.5
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def engine():
+    engine = HttpFormEngine()
+    yield engine
+    engine.close()
+
+
+def test_connection_is_kept_alive(server, engine):
+    assert engine._request('GET', server.url + '/a') == (200, b'ok')
+    assert engine._request('GET', server.url + '/b') == (200, b'ok')
+
+    assert len(engine._connections) == 1
+
+
+def test_get_is_resent_after_the_connection_dropped(server, engine):
+    server.actions = ['drop']
+
+    assert engine._request('GET', server.url + '/a') == (200, b'ok')
+
+    assert server.requests == [('GET', '/a'), ('GET', '/a')]
+    assert len(engine._connections) == 1
+
+
+def test_post_is_not_resent_once_it_was_sent(server, engine):
+    server.actions = ['drop']
+
+    with pytest.raises((http.client.RemoteDisconnected, ConnectionResetError)):
+        engine._request('POST', server.url + '/form', b'a=1')
+
+    assert server.requests == [('POST', '/form')]
+    assert engine._request('POST', server.url + '/form', b'a=1') == (200, b'ok')
+    assert len(engine._connections) == 1
+
+
+def test_connection_is_replaced_after_a_timeout(server, engine, monkeypatch):
+    monkeypatch.setitem(config.TIMING, 'page_load_timeout', 0.1)
+    server.actions = ['stall']
+
+    with pytest.raises(socket.timeout):
+        engine._request('POST', server.url + '/form', b'a=1')
+
+    # The timed-out connection is left mid-request; later requests must not reuse it
+    assert engine._request('POST', server.url + '/form', b'a=1') == (200, b'ok')
+    assert len(engine._connections) == 1
+
+
+def test_submit_recovers_after_a_timeout(server, engine, monkeypatch):
+    monkeypatch.setitem(config.TIMING, 'page_load_timeout', 0.1)
+    monkeypatch.setitem(config.RATE_LIMIT, 'adaptive', False)
+    spec = parse_form(PAGE, server.url + '/', FIELDS)
+    server.actions = ['stall']
+
+    assert not engine.submit({'name': 'a'}, spec)
+    assert isinstance(engine.last_error, socket.timeout)
+    assert engine.submit({'name': 'b'}, spec)
+    assert engine.last_status == 200
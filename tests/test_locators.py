@@ -0,0 +1,45 @@
+"""
+Tests for the XPath to ID/CSS locator compiler
+"""
+
+import pytest
+from selenium.webdriver.common.by import By
+from utils.locators import compile_locator, script_locator, xpath_to_css
+
+
+@pytest.mark.parametrize('xpath, css', [
+    ('//*[@id="name"]', '#name'),
+    ("//*[@id='name']", '#name'),
+    ('//input[@name="email"]', 'input[name="email"]'),
+    ('//*[@id="contact-form"]/div/div/button', '#contact-form > div > div > button'),
+    ('//form//button[@type="submit"]', 'form button[type="submit"]'),
+    ('//*[@id="jform.name"]', '[id="jform.name"]'),
+    ('//input[@value=\'say "hi"\']', 'input[value="say \\"hi\\""]'),
+])
+def test_simple_xpaths_translate_to_css(xpath, css):
+    assert xpath_to_css(xpath) == css
+
+
+@pytest.mark.parametrize('xpath', [
+    '',
+    '/html/body/form',
+    '//div[1]',
+    '(//input)[2]',
+    '//input[contains(@name, "mail")]',
+    '//*[@id="form"]//input[@type="text" and @name="a"]',
+    '//label/following-sibling::input',
+])
+def test_other_xpaths_are_not_translated(xpath):
+    assert xpath_to_css(xpath) is None
+
+
+def test_compile_locator_picks_the_fastest_strategy():
+    assert compile_locator('//*[@id="name"]') == (By.ID, 'name')
+    assert compile_locator('//input[@name="email"]') == (By.CSS_SELECTOR, 'input[name="email"]')
+    assert compile_locator('//*[@id="jform.name"]') == (By.CSS_SELECTOR, '[id="jform.name"]')
+    assert compile_locator('//div[1]') == (By.XPATH, '//div[1]')
+
+
+def test_script_locator():
+    assert script_locator('//*[@id="name"]') == ['css', '#name']
+    assert script_locator('//div[1]') == ['xpath', '//div[1]']
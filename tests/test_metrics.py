@@ -0,0 +1,80 @@
+"""
+Tests for the latency histograms
+"""
+
+import pytest
+from utils.metrics import BUCKETS, LatencyHistogram, Metrics
+
+
+def test_empty_histogram_percentile_is_zero():
+    assert LatencyHistogram().percentile(0.95) == 0.0
+
+
+def test_percentile_stays_within_observed_range():
+    histogram = LatencyHistogram()
+    for value in (0.012, 0.013, 0.014):
+        histogram.observe(value)
+
+    assert 0.012 <= histogram.percentile(0.5) <= 0.014
+    assert histogram.percentile(1.0) == pytest.approx(0.014)
+
+
+def test_percentile_estimate_lands_in_the_right_bucket():
+    histogram = LatencyHistogram()
+    for _ in range(90):
+        histogram.observe(0.01)
+    for _ in range(10):
+        histogram.observe(2.0)
+
+    # Interpolated inside the bucket holding the rank: (0.0075, 0.01] and (1.5, 2]
+    assert histogram.percentile(0.5) == pytest.approx(0.01)
+    assert histogram.percentile(0.9) == pytest.approx(0.01)
+    assert 1.5 < histogram.percentile(0.99) <= 2.0
+
+
+def test_values_above_the_last_bucket_use_the_observed_max():
+    histogram = LatencyHistogram()
+    histogram.observe(BUCKETS[-1] * 2)
+
+    assert histogram.percentile(0.99) == pytest.approx(BUCKETS[-1] * 2)
+
+
+def test_merge_matches_observing_everything_in_one_histogram():
+    first, second, combined = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+    for value in (0.002, 0.05, 0.3):
+        first.observe(value)
+        combined.observe(value)
+    for value in (0.004, 1.2, 7.0, 7.5):
+        second.observe(value)
+        combined.observe(value)
+
+    first.merge(second.state())
+
+    assert first.state() == pytest.approx(combined.state())
+    for fraction in (0.5, 0.95, 0.99):
+        assert first.percentile(fraction) == pytest.approx(combined.percentile(fraction))
+
+
+def test_merge_ignores_empty_states_and_rejects_other_buckets():
+    histogram = LatencyHistogram()
+    histogram.observe(0.1)
+
+    histogram.merge(LatencyHistogram().state())
+    assert histogram.count == 1
+
+    other = LatencyHistogram(buckets=(0.1, 1.0))
+    other.observe(0.5)
+    with pytest.raises(ValueError):
+        histogram.merge(other.state())
+
+
+def test_metrics_merge_state_adds_unknown_phases():
+    source, target = Metrics(), Metrics()
+    source.observe('row', 0.2)
+    source.observe('submit_form', 0.1)
+    target.observe('row', 0.4)
+
+    target.merge_state(source.state())
+
+    assert target.histogram('row').count == 2
+    assert target.histogram('submit_form').count == 1
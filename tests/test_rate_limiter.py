@@ -0,0 +1,101 @@
+"""
+Tests for the per-host token bucket rate limiter
+"""
+
+import pytest
+import config
+from utils.rate_limiter import RateLimiter, TokenBucket, configured_rate
+
+
+def test_bucket_allows_burst_then_paces(monotonic_clock):
+    bucket = TokenBucket(rate=10, burst=2)
+
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == pytest.approx(0.1)
+    assert bucket.reserve() == pytest.approx(0.2)
+
+
+def test_bucket_refills_over_time_up_to_burst(monotonic_clock):
+    bucket = TokenBucket(rate=2, burst=1)
+    bucket.reserve()
+
+    monotonic_clock.now += 0.5
+    assert bucket.reserve() == 0.0
+
+    # Idle time never saves up more than the burst
+    monotonic_clock.now += 60
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == pytest.approx(0.5)
+
+
+def test_bucket_adapts_between_min_and_target_rate():
+    bucket = TokenBucket(rate=4, min_rate=1)
+
+    bucket.slow_down(0.5)
+    assert bucket.rate == 2
+    bucket.slow_down(0.1)
+    assert bucket.rate == 1
+
+    bucket.recover(3)
+    assert bucket.rate == 3
+    bucket.recover(3)
+    assert bucket.rate == 4
+
+
+def test_limiter_keeps_one_bucket_per_host(monotonic_clock):
+    limiter = RateLimiter(rate=1)
+
+    assert limiter.reserve('http://a.example/form') == 0.0
+    assert limiter.reserve('http://b.example/form') == 0.0
+    assert limiter.reserve('http://a.example/other') == pytest.approx(1.0)
+    assert set(limiter.buckets) == {'a.example', 'b.example'}
+
+
+def test_limiter_disabled_with_zero_rate():
+    limiter = RateLimiter(rate=0)
+
+    assert limiter.reserve('http://a.example/') == 0.0
+    assert limiter.reserve('http://a.example/') == 0.0
+    assert limiter.buckets == {}
+
+
+def test_report_slows_down_on_overload_and_recovers(monkeypatch):
+    monkeypatch.setitem(config.RATE_LIMIT, 'adaptive', True)
+    monkeypatch.setitem(config.RATE_LIMIT, 'min_rate', 0.05)
+    limiter = RateLimiter(rate=4)
+    url = 'http://a.example/form'
+
+    limiter.report(url, status=429)
+    assert limiter.buckets['a.example'].rate == 4 * config.RATE_LIMIT['backoff_factor']
+
+    limiter.report(url, status=200, elapsed=config.RATE_LIMIT['slow_response_seconds'] + 1)
+    assert limiter.buckets['a.example'].rate == 4 * config.RATE_LIMIT['backoff_factor'] ** 2
+
+    for _ in range(100):
+        limiter.report(url, status=200, elapsed=0.1)
+    assert limiter.buckets['a.example'].rate == 4
+
+
+def test_configured_rate_derives_from_submission_delay_with_selenium(monkeypatch):
+    monkeypatch.setitem(config.EXECUTION, 'engine', 'selenium')
+    monkeypatch.setitem(config.RATE_LIMIT, 'submissions_per_second', None)
+    monkeypatch.setitem(config.TIMING, 'delay_between_submissions', 0.5)
+    assert configured_rate() == 2.0
+
+    monkeypatch.setitem(config.TIMING, 'delay_between_submissions', 0)
+    assert configured_rate() == 0.0
+
+    monkeypatch.setitem(config.RATE_LIMIT, 'submissions_per_second', 3)
+    assert configured_rate() == 3
+
+
+@pytest.mark.parametrize('engine', ['http', 'async'])
+def test_configured_rate_is_unlimited_by_default_without_a_browser(monkeypatch, engine):
+    monkeypatch.setitem(config.EXECUTION, 'engine', engine)
+    monkeypatch.setitem(config.RATE_LIMIT, 'submissions_per_second', None)
+    monkeypatch.setitem(config.TIMING, 'delay_between_submissions', 2)
+    assert configured_rate() == 0.0
+
+    monkeypatch.setitem(config.RATE_LIMIT, 'submissions_per_second', 5)
+    assert configured_rate() == 5
@@ -0,0 +1,83 @@
+"""
+Tests for failure classification and the deferred RetryQueue
+"""
+
+import pytest
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+    WebDriverException,
+)
+import config
+from utils import retry
+from utils.retry import RetryQueue, classify_failure
+
+
+@pytest.mark.parametrize('error, status, kind', [
+    (None, 503, 'server_busy'),
+    (None, 429, 'server_busy'),
+    (None, 422, 'validation'),
+    (TimeoutException(), None, 'timeout'),
+    (StaleElementReferenceException(), None, 'stale_element'),
+    (NoSuchElementException(), None, 'validation'),
+    (WebDriverException('chrome not reachable'), None, 'driver_crash'),
+    (ConnectionResetError(), None, 'connection'),
+    (None, None, 'unknown'),
+])
+def test_classify_failure(error, status, kind):
+    assert classify_failure(error, status) == kind
+
+
+def test_backoff_is_exponential_capped_and_jittered():
+    queue = RetryQueue(max_retries=5, retry_delay=1, max_delay=5)
+
+    for attempt, ceiling in ((1, 1), (2, 2), (3, 4), (4, 5), (5, 5)):
+        for _ in range(20):
+            assert ceiling * 0.5 <= queue.backoff(attempt) <= ceiling
+
+
+def test_defer_only_transient_failures_until_retries_run_out(monkeypatch):
+    monkeypatch.setitem(config.ERROR_HANDLING, 'retry_on', ['timeout'])
+    queue = RetryQueue(max_retries=2, retry_delay=0, max_delay=0)
+
+    assert not queue.defer(0, {'name': 'a'}, 'validation')
+    assert not queue.is_retry(0)
+
+    assert queue.defer(1, {'name': 'b'}, 'timeout')
+    assert queue.defer(1, {'name': 'b'}, 'timeout')
+    assert not queue.defer(1, {'name': 'b'}, 'timeout')
+    assert queue.is_retry(1)
+    assert queue.attempts[1] == 2
+
+
+def test_drain_yields_rows_in_due_order_once(monkeypatch):
+    monkeypatch.setitem(config.ERROR_HANDLING, 'retry_on', ['timeout'])
+    queue = RetryQueue(max_retries=3, retry_delay=0, max_delay=0)
+    delays = iter([0.3, 0.1, 0.2])
+    monkeypatch.setattr(queue, 'backoff', lambda attempt: next(delays))
+    slept = []
+    monkeypatch.setattr(retry.time, 'sleep', slept.append)
+
+    for index in range(3):
+        queue.defer(index, {'row': index}, 'timeout')
+    assert len(queue) == 3
+
+    assert [index for index, _ in queue.drain()] == [1, 2, 0]
+    assert len(queue) == 0
+    assert all(wait <= 0.3 for wait in slept)
+
+
+def test_rows_deferred_while_draining_wait_for_the_next_drain(monkeypatch):
+    monkeypatch.setitem(config.ERROR_HANDLING, 'retry_on', ['timeout'])
+    queue = RetryQueue(max_retries=3, retry_delay=0, max_delay=0)
+    queue.defer(0, {'row': 0}, 'timeout')
+
+    drained = []
+    for index, row_data in queue.drain():
+        drained.append(index)
+        queue.defer(index, row_data, 'timeout')
+
+    assert drained == [0]
+    assert len(queue) == 1
+    assert [index for index, _ in queue.drain()] == [0]
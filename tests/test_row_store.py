@@ -0,0 +1,59 @@
+"""
+Tests for the compact tuple row store
+"""
+
+import pandas as pd
+from utils.row_store import RowStore
+
+COLUMNS = {'name': 'Nome', 'email': 'Email', 'subject': 'Assunto'}
+
+
+def make_frame(count):
+    return pd.DataFrame({
+        'Nome': [f'Name {number}' for number in range(count)],
+        'Email': [f'user{number}@example.com' for number in range(count)],
+        'Assunto': ['Hello'] * count,
+        'Ignored': range(count),
+    })
+
+
+def test_rows_round_trip_through_tuples():
+    store = RowStore.from_frame(make_frame(3), COLUMNS)
+
+    assert len(store) == 3
+    assert store.fields == ('name', 'email', 'subject')
+    assert store.rows[1] == ('Name 1', 'user1@example.com', 'Hello')
+    assert store.get(2) == {'name': 'Name 2', 'email': 'user2@example.com', 'subject': 'Hello'}
+
+
+def test_iter_rows_yields_every_row_from_start():
+    store = RowStore.from_frame(make_frame(5), COLUMNS)
+
+    assert list(store.iter_rows()) == [(index, store.get(index)) for index in range(5)]
+    assert [index for index, _ in store.iter_rows(start=3)] == [3, 4]
+    assert list(store.iter_rows(start=5)) == []
+
+
+def test_missing_values_become_empty_strings():
+    frame = pd.DataFrame({'Nome': ['Ana', None], 'Email': ['ana@example.com', 'bia@example.com'],
+                          'Assunto': [float('nan'), 'Hello']})
+
+    store = RowStore.from_frame(frame, COLUMNS)
+
+    assert store.get(0)['subject'] == ''
+    assert store.get(1)['name'] == ''
+
+
+def test_repeated_values_share_one_string():
+    store = RowStore.from_frame(make_frame(4), COLUMNS)
+
+    subjects = [row[2] for row in store.rows]
+    assert all(subject is subjects[0] for subject in subjects)
+
+
+def test_frame_index_is_ignored():
+    frame = make_frame(4).iloc[[3, 1]]
+
+    store = RowStore.from_frame(frame, COLUMNS)
+
+    assert [row['name'] for _, row in store.iter_rows()] == ['Name 3', 'Name 1']
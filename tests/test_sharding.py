@@ -0,0 +1,116 @@
+"""
+Tests for deterministic sharding and merging per-shard results
+"""
+
+import json
+import pytest
+from utils.metrics import Metrics
+from utils.sharding import Shard, merge_results, shard_of, write_shard_result
+
+EMAILS = [f'user{number}@example.com' for number in range(1000)]
+
+
+def test_shard_of_is_stable_and_in_range():
+    for count in (1, 2, 3, 7):
+        shards = [shard_of(email, count) for email in EMAILS]
+        assert shards == [shard_of(email, count) for email in EMAILS]
+        assert set(shards) == set(range(count))
+
+
+def test_shard_of_ignores_case_and_surrounding_whitespace():
+    assert shard_of('  User@Example.COM ', 5) == shard_of('user@example.com', 5)
+
+
+def test_shard_of_spreads_keys_evenly():
+    counts = [0] * 4
+    for email in EMAILS:
+        counts[shard_of(email, 4)] += 1
+
+    assert all(200 <= count <= 300 for count in counts)
+
+
+def test_shards_partition_the_rows():
+    shards = [Shard(number, 3, 'email') for number in (1, 2, 3)]
+    for email in EMAILS:
+        assert sum(shard.owns({'email': email}) for shard in shards) == 1
+
+
+def test_parse():
+    shard = Shard.parse(' 2 / 4 ')
+    assert (shard.number, shard.count, str(shard)) == (2, 4, '2/4')
+
+
+@pytest.mark.parametrize('spec', ['', '2', '0/3', '4/3', '1/0', 'a/b'])
+def test_parse_rejects_invalid_specs(spec):
+    with pytest.raises(ValueError):
+        Shard.parse(spec)
+
+
+def test_unknown_key_field_is_rejected():
+    with pytest.raises(ValueError):
+        Shard(1, 2, 'phone')
+
+
+def write_result(tmp_path, number, count, stats, latencies=(), job_id='job'):
+    metrics = Metrics()
+    for seconds in latencies:
+        metrics.observe('row', seconds)
+    stats = {'total_rows': 0, 'processed': 0, 'successful': 0, 'failed': 0, 'skipped': 0, 'retried': 0, **stats}
+    path = tmp_path / f'shard-{number}-of-{count}-{len(list(tmp_path.iterdir()))}.json'
+    return write_shard_result(Shard(number, count, 'email'), job_id, stats, metrics, str(path))
+
+
+def test_merge_results_sums_stats_targets_and_latency(tmp_path):
+    paths = [
+        write_result(tmp_path, 1, 3, {
+            'total_rows': 10, 'processed': 10, 'successful': 9, 'failed': 1,
+            'start_time': 100.0, 'end_time': 150.0,
+            'targets': {'http://a.example/': {'successful': 9, 'failed': 1}}
+        }, latencies=(0.1, 0.2)),
+        write_result(tmp_path, 2, 3, {
+            'total_rows': 5, 'processed': 5, 'successful': 5, 'retried': 2,
+            'start_time': 90.0, 'end_time': 160.0,
+            'targets': {'http://a.example/': {'successful': 3, 'failed': 0},
+                        'http://b.example/': {'successful': 2, 'failed': 0}}
+        }, latencies=(0.3,)),
+    ]
+
+    merged = merge_results(paths)
+
+    assert merged['shards'] == [1, 2]
+    assert merged['missing_shards'] == [3]
+    assert merged['duplicate_shards'] == []
+    stats = merged['stats']
+    assert (stats['total_rows'], stats['successful'], stats['failed'], stats['retried']) == (15, 14, 1, 2)
+    assert (stats['start_time'], stats['end_time']) == (90.0, 160.0)
+    assert stats['targets'] == {
+        'http://a.example/': {'successful': 12, 'failed': 1},
+        'http://b.example/': {'successful': 2, 'failed': 0}
+    }
+    assert merged['latency']['row']['count'] == 3
+
+
+def test_merge_results_reports_duplicate_shards(tmp_path):
+    paths = [write_result(tmp_path, 1, 2, {}), write_result(tmp_path, 1, 2, {}), write_result(tmp_path, 2, 2, {})]
+
+    merged = merge_results(paths)
+
+    assert merged['missing_shards'] == []
+    assert merged['duplicate_shards'] == [1]
+
+
+def test_merge_results_rejects_mixed_jobs_and_counts(tmp_path):
+    with pytest.raises(ValueError):
+        merge_results([write_result(tmp_path, 1, 2, {}, job_id='a'), write_result(tmp_path, 2, 2, {}, job_id='b')])
+    with pytest.raises(ValueError):
+        merge_results([write_result(tmp_path, 1, 2, {}), write_result(tmp_path, 2, 3, {})])
+    with pytest.raises(ValueError):
+        merge_results([])
+
+
+def test_written_result_is_json(tmp_path):
+    path = write_result(tmp_path, 1, 1, {'successful': 1})
+
+    with open(path, encoding='utf-8') as file:
+        result = json.load(file)
+    assert (result['shard'], result['shard_count'], result['key_field']) == (1, 1, 'email')
@@ -0,0 +1,85 @@
+"""
+Tests for submission confirmation, with the page scripts' results faked
+"""
+
+from utils import submission
+from utils.submission import SubmissionWatcher
+
+
+class FakeDriver:
+    """Returns a scripted page state from each CHECK_SCRIPT call"""
+
+    def __init__(self, states, url='http://example.com/form'):
+        self.states = list(states)
+        self.current_url = url
+
+    def execute_script(self, script, *args):
+        if script == submission.ARM_SCRIPT:
+            return None
+        state = self.states.pop(0) if len(self.states) > 1 else self.states[0]
+        return {'navigated': False, 'submitted': False, 'pending': 0, 'status': None,
+                'success': False, 'error': False, **state}
+
+
+def watch(states, clock, **options):
+    options = {'detectors': ['submit_event', 'url_change'], 'timeout': 10, 'settle_seconds': 2,
+               'success_selector': '', 'error_selector': '', **options}
+    watcher = SubmissionWatcher(FakeDriver(states), **options)
+    watcher.arm(object())
+    started = clock.now
+    return watcher, watcher.wait(), clock.now - started
+
+
+def test_submit_event_alone_does_not_confirm_before_the_response(monotonic_clock):
+    states = [{'submitted': True, 'pending': 1}] * 3 + [{'status': 200}]
+    watcher, detector, elapsed = watch(states, monotonic_clock)
+
+    assert detector == 'submit_event'
+    assert watcher.last_status == 200
+    assert elapsed < 1
+
+
+def test_error_response_fails_the_submission(monotonic_clock):
+    watcher, detector, _ = watch([{'submitted': True, 'status': 503}], monotonic_clock)
+
+    assert detector is None
+    assert watcher.last_status == 503
+
+
+def test_navigation_confirms(monotonic_clock):
+    assert watch([{'navigated': True}], monotonic_clock)[1] == 'submit_event'
+
+
+def test_js_form_without_requests_is_confirmed_after_settling(monotonic_clock):
+    _, detector, elapsed = watch([{'submitted': True}], monotonic_clock)
+
+    assert detector == 'submit_event'
+    assert 2 <= elapsed < 3
+
+
+def test_pending_request_delays_settling(monotonic_clock):
+    _, detector, _ = watch([{'submitted': True, 'pending': 1}], monotonic_clock)
+
+    assert detector is None
+
+
+def test_no_submit_event_times_out(monotonic_clock):
+    _, detector, elapsed = watch([{}], monotonic_clock)
+
+    assert detector is None
+    assert elapsed >= 10
+
+
+def test_error_selector_fails_the_submission(monotonic_clock):
+    watcher, detector, elapsed = watch(
+        [{'submitted': True, 'error': True}], monotonic_clock, error_selector='//div[@class="error"]'
+    )
+
+    assert detector is None
+    assert watcher.rejected
+    assert elapsed < 1
+
+
+def test_success_selector_confirms(monotonic_clock):
+    options = {'detectors': ['success_selector'], 'success_selector': '//div[@class="ok"]'}
+    assert watch([{}, {'success': True}], monotonic_clock, **options)[1] == 'success_selector'
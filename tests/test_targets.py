@@ -0,0 +1,66 @@
+"""
+Tests for per-row targets and grouping rows by target
+"""
+
+from utils.targets import group_by_target, row_target, target_fields
+
+DEFAULT_URL = 'http://default.example/form'
+
+
+def test_row_target_falls_back_to_defaults():
+    assert row_target({'name': 'a'}, DEFAULT_URL) == (DEFAULT_URL, None)
+    assert row_target({'url': '', 'template': ''}, DEFAULT_URL) == (DEFAULT_URL, None)
+    assert row_target({'url': 'http://a.example/', 'template': 'bootstrap'}, DEFAULT_URL) == (
+        'http://a.example/', 'bootstrap'
+    )
+
+
+def test_target_fields():
+    assert target_fields(None) is None
+    assert 'submit' in target_fields('bootstrap')
+
+
+def test_rows_are_grouped_in_first_seen_order(make_rows):
+    rows = make_rows(['a', 'b', 'a', '', 'b', 'a'])
+
+    grouped = list(group_by_target(rows, DEFAULT_URL, window=100))
+
+    assert [index for index, _ in grouped] == [0, 2, 5, 1, 4, 3]
+    assert sorted(grouped, key=lambda item: item[0]) == rows
+
+
+def test_template_is_part_of_the_target():
+    rows = [
+        (0, {'url': 'a', 'template': 'bootstrap'}),
+        (1, {'url': 'a'}),
+        (2, {'url': 'a', 'template': 'bootstrap'}),
+    ]
+
+    assert [index for index, _ in group_by_target(rows, DEFAULT_URL, window=100)] == [0, 2, 1]
+
+
+def test_window_bounds_buffering_and_continues_the_last_target(make_rows):
+    rows = make_rows(['a', 'b', 'a', 'b', 'a', 'b'])
+
+    grouped = list(group_by_target(rows, DEFAULT_URL, window=3))
+
+    # Window 1 (a, b, a) ends on b, so window 2 (b, a, b) starts with b
+    assert [index for index, _ in grouped] == [0, 2, 1, 3, 5, 4]
+
+
+def test_window_is_lazy(make_rows):
+    consumed = []
+
+    def rows():
+        for item in make_rows(['a'] * 10):
+            consumed.append(item[0])
+            yield item
+
+    iterator = group_by_target(rows(), DEFAULT_URL, window=4)
+    next(iterator)
+
+    assert consumed == [0, 1, 2, 3]
+
+
+def test_empty_input():
+    assert list(group_by_target([], DEFAULT_URL, window=10)) == []
@@ -3,8 +3,12 @@ Utils package for Form Bot
 Contains utility modules for Excel reading, form handling, and logging
 """
 
+from .async_engine import AsyncFormEngine
 from .excel_reader import ExcelReader
 from .form_handler import FormHandler
+from .http_engine import HttpFormEngine
 from .logger import Logger
+from .row_store import RowStore
+from .worker_pool import WorkerPool
 
-__all__ = ['ExcelReader', 'FormHandler', 'Logger'] 
\ No newline at end of file
+__all__ = ['AsyncFormEngine', 'ExcelReader', 'FormHandler', 'HttpFormEngine', 'Logger', 'RowStore', 'WorkerPool'] 
\ No newline at end of file
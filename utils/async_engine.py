@@ -0,0 +1,190 @@
+"""
+Asyncio submission engine for Form Bot
+Submits form rows over HTTP with many requests in flight from a single thread
+"""
+
+import asyncio
+import time
+from typing import Callable, Dict, Iterable, Optional, Tuple
+from urllib.parse import urlsplit
+import config
+from .http_engine import FormSpec, parse_form
+from .logger import Logger
+from .metrics import get_metrics
+from .rate_limiter import get_rate_limiter
+from .targets import Target, row_target, target_fields
+
+try:
+    import aiohttp
+except ImportError:  # Optional dependency, only needed for --engine async
+    aiohttp = None
+
+
+class AsyncFormEngine:
+    """Submits rows concurrently on an asyncio event loop with pooled connections"""
+
+    def __init__(self, concurrency: int = None, connections_per_host: int = None):
+        """
+        Args:
+            concurrency: Maximum submissions in flight (uses config default if None)
+            connections_per_host: Connection pool limit per host (uses config default if None)
+
+        Raises:
+            ImportError: If aiohttp is not installed
+        """
+        if aiohttp is None:
+            raise ImportError("The async engine requires aiohttp. Install it with: pip install aiohttp")
+
+        self.logger = Logger()
+        self.concurrency = concurrency or config.EXECUTION['concurrency']
+        self.connections_per_host = connections_per_host or config.EXECUTION['connections_per_host']
+        self.form_spec: Optional[FormSpec] = None
+        self._specs: Dict[Target, FormSpec] = {}
+
+        if self.concurrency < 1:
+            raise ValueError("Concurrency must be at least 1")
+
+    def run(self, rows: Iterable[Tuple[int, Dict[str, str]]], form_url: str = None,
+            on_result: Callable[..., None] = None, blocking_rows: bool = False):
+        """
+        Load the form and submit every row, blocking until all are done
+
+        Rows with their own URL or template (see utils.targets) are submitted
+        to that form, loaded the first time one of its rows comes up.
+
+        Args:
+            rows: Iterable of (row index, row data) pairs
+            form_url: Form URL of rows without their own (uses config default if None)
+            on_result: Called as on_result(index, row_data, success, error, status)
+                for every row; an exception raised from it aborts the run
+            blocking_rows: Pull rows on a worker thread, for row sources that may
+                block for a while (e.g. a coordinator asking workers to wait)
+        """
+        asyncio.run(self._run(rows, form_url or config.FORM_URL, on_result, blocking_rows))
+
+    async def _run(self, rows, form_url: str, on_result, blocking_rows: bool = False):
+        """Event loop body: one session, bounded number of in-flight submissions"""
+        connector = aiohttp.TCPConnector(limit=self.concurrency, limit_per_host=self.connections_per_host)
+        timeout = aiohttp.ClientTimeout(total=config.TIMING['page_load_timeout'])
+        headers = {'User-Agent': config.BROWSER_CONFIG['user_agent']}
+
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout, headers=headers) as session:
+            self.form_spec = await self._spec_for(session, form_url)
+
+            semaphore = asyncio.Semaphore(self.concurrency)
+            limiter = get_rate_limiter()
+            metrics = get_metrics()
+            pending = set()
+            errors = []
+
+            async def process(index: int, row_data: Dict[str, str], form_spec: FormSpec, delay: float):
+                try:
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                    metrics.observe('wait', delay)
+                    started = time.perf_counter()
+                    success, error, status = await self._submit(session, row_data, form_spec)
+                    metrics.observe('submit_form', time.perf_counter() - started)
+                    if on_result:
+                        on_result(index, row_data, success, error, status)
+                except Exception as e:
+                    errors.append(e)
+                finally:
+                    semaphore.release()
+
+            self.logger.info(f"Submitting with up to {self.concurrency} requests in flight...")
+            try:
+                async for index, row_data in _iterate(rows, blocking_rows):
+                    await semaphore.acquire()
+                    if errors:
+                        semaphore.release()
+                        break
+
+                    try:
+                        form_spec = await self._spec_for(session, *row_target(row_data, form_url))
+                    except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                        semaphore.release()
+                        self.logger.error(f"Could not load the form of row {index + 1}: {str(e) or type(e).__name__}")
+                        if on_result:
+                            on_result(index, row_data, False, e, None)
+                        continue
+
+                    # Slots are reserved in row order; each task sleeps off its own wait
+                    delay = limiter.reserve(form_spec.action)
+                    task = asyncio.ensure_future(process(index, row_data, form_spec, delay))
+                    pending.add(task)
+                    task.add_done_callback(pending.discard)
+
+                if pending:
+                    await asyncio.gather(*pending)
+            finally:
+                for task in pending:
+                    task.cancel()
+
+            if errors:
+                raise errors[0]
+
+    async def _spec_for(self, session, url: str, template: str = None) -> FormSpec:
+        """Parsed form of a target, fetched on first use"""
+        form_spec = self._specs.get((url, template))
+        if form_spec is not None:
+            return form_spec
+
+        self.logger.info(f"Fetching form page: {url}")
+        async with session.get(url) as response:
+            if response.status >= 400:
+                raise ValueError(f"Form page returned HTTP {response.status}")
+            html = await response.text(errors='replace')
+
+        form_spec = parse_form(html, url, target_fields(template))
+        self.logger.success(
+            f"Parsed form: {form_spec.method} {form_spec.action} "
+            f"({len(form_spec.field_names)} mapped fields)"
+        )
+        self._specs[(url, template)] = form_spec
+        return form_spec
+
+    async def _submit(self, session, row_data: Dict[str, str], form_spec: FormSpec) -> Tuple[bool, Optional[BaseException], Optional[int]]:
+        """Submit a single row; returns (accepted, error, HTTP status)"""
+        payload = form_spec.build_payload(row_data)
+        limiter = get_rate_limiter()
+        started = time.monotonic()
+
+        try:
+            if form_spec.method == 'POST':
+                request = session.post(form_spec.action, data=payload)
+            else:
+                request = session.get(form_spec.action, params=payload)
+
+            async with request as response:
+                await response.read()
+                status = response.status
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self.logger.error(f"HTTP submission to {urlsplit(form_spec.action).netloc} failed: {str(e) or type(e).__name__}")
+            limiter.report(form_spec.action, elapsed=time.monotonic() - started)
+            return False, e, None
+
+        limiter.report(form_spec.action, status, time.monotonic() - started)
+
+        if status >= 400:
+            self.logger.error(f"Form submission answered with HTTP {status}")
+            return False, None, status
+        return True, None, status
+
+
+async def _iterate(rows, blocking: bool):
+    """Iterate rows inside the event loop, or off it when getting a row may block"""
+    if not blocking:
+        for item in rows:
+            yield item
+        return
+
+    loop = asyncio.get_running_loop()
+    iterator = iter(rows)
+    done = object()
+    while True:
+        item = await loop.run_in_executor(None, next, iterator, done)
+        if item is done:
+            return
+        yield item
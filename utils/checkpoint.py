@@ -0,0 +1,110 @@
+"""
+Checkpoint journal for Form Bot
+Records the outcome of every row so interrupted runs can be resumed
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Set
+import config
+from .logger import Logger
+
+
+def hash_file(file_path: str) -> str:
+    """
+    Hash the contents of an input file
+
+    Args:
+        file_path: Path to the file
+
+    Returns:
+        Hex SHA-256 digest of the file contents
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for block in iter(lambda: file.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def row_key(index: int, row_data: Dict[str, str]) -> str:
+    """
+    Stable key of a row: its position among valid rows plus a hash of its values
+
+    Args:
+        index: Row index
+        row_data: Dictionary with form data
+
+    Returns:
+        Key string identifying the row within its input file
+    """
+    content = '\x1f'.join(f"{field}={row_data[field]}" for field in sorted(row_data))
+    return f"{index}:{hashlib.sha1(content.encode('utf-8')).hexdigest()[:16]}"
+
+
+class CheckpointJournal:
+    """Append-only SQLite journal of row outcomes, keyed by input file hash"""
+
+    def __init__(self, file_path: str, journal_path: str = None):
+        """
+        Args:
+            file_path: Input file the job reads (its hash identifies the job)
+            journal_path: SQLite database path (uses config default if None)
+        """
+        self.logger = Logger()
+        self.journal_path = journal_path or config.CHECKPOINT['file']
+        self.job_id = hash_file(file_path)
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(self.journal_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.connection = sqlite3.connect(self.journal_path, check_same_thread=False)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS outcomes ('
+            'job_id TEXT NOT NULL, row_key TEXT NOT NULL, success INTEGER NOT NULL, '
+            'detail TEXT, recorded_at REAL NOT NULL)'
+        )
+        self.connection.execute('CREATE INDEX IF NOT EXISTS outcomes_job_row ON outcomes (job_id, row_key)')
+        self.connection.commit()
+
+    def completed_rows(self) -> Set[str]:
+        """
+        Keys of rows that already succeeded for this input file
+
+        Returns:
+            Set of row keys
+        """
+        with self._lock:
+            cursor = self.connection.execute(
+                'SELECT DISTINCT row_key FROM outcomes WHERE job_id = ? AND success = 1',
+                (self.job_id,)
+            )
+            return {key for (key,) in cursor}
+
+    def record(self, key: str, success: bool, detail: str = None):
+        """
+        Append the outcome of a row
+
+        Args:
+            key: Row key (see row_key)
+            success: Whether the row was submitted successfully
+            detail: Optional free-form detail (e.g. error message)
+        """
+        with self._lock:
+            self.connection.execute(
+                'INSERT INTO outcomes (job_id, row_key, success, detail, recorded_at) VALUES (?, ?, ?, ?, ?)',
+                (self.job_id, key, int(success), detail, time.time())
+            )
+            self.connection.commit()
+
+    def close(self):
+        """Close the journal database"""
+        with self._lock:
+            self.connection.close()
@@ -0,0 +1,699 @@
+"""
+Work-queue coordinator for Form Bot
+Hands out leases on input rows to worker processes over HTTP, reclaims the
+leases of workers that died and collects every row's outcome in SQLite
+"""
+
+import hmac
+import http.server
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import config
+from .logger import Logger
+from .progress import ProgressReporter
+from .retry import RetryQueue
+
+# Row states in the queue
+PENDING, LEASED, DONE, FAILED = 'pending', 'leased', 'done', 'failed'
+
+# Row outcomes a worker can report
+OUTCOMES = ('success', 'failed', 'retry')
+
+# Request header carrying the shared token
+TOKEN_HEADER = 'X-Coordinator-Token'
+
+# Hosts a coordinator may listen on without a token
+LOCAL_HOSTS = ('127.0.0.1', 'localhost', '::1')
+
+
+class LeaseStore:
+    """SQLite-backed row queue with time-limited leases"""
+
+    def __init__(self, path: str = None, lease_seconds: float = None, max_attempts: int = None):
+        """
+        Args:
+            path: SQLite database path (uses config default if None)
+            lease_seconds: Lease lifetime without a renewal (uses config default if None)
+            max_attempts: Attempts per row before it fails for good
+                (uses ERROR_HANDLING['max_retries'] + 1 if None)
+        """
+        self.logger = Logger()
+        self.path = path or config.COORDINATOR['file']
+        self.lease_seconds = lease_seconds or config.COORDINATOR['lease_seconds']
+        self.max_attempts = max_attempts or config.ERROR_HANDLING['max_retries'] + 1
+        self.job_id = None
+        self.has_targets = False
+        self._retry = RetryQueue()
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS rows ('
+            'job_id TEXT NOT NULL, idx INTEGER NOT NULL, target TEXT NOT NULL, data TEXT NOT NULL, '
+            'state TEXT NOT NULL, worker TEXT, lease_expires REAL, available_at REAL NOT NULL, '
+            'attempts INTEGER NOT NULL, detail TEXT, updated_at REAL NOT NULL, '
+            'PRIMARY KEY (job_id, idx))'
+        )
+        self.connection.execute('CREATE INDEX IF NOT EXISTS rows_queue ON rows (job_id, state, target, idx)')
+        self.connection.commit()
+
+    def load(self, job_id: str, rows: Iterable[Tuple[int, Dict[str, str]]], chunk_size: int = 10000) -> int:
+        """
+        Fill the queue with the rows of a job
+
+        A job already in the database is resumed as it is: finished rows stay
+        finished and the rows are not read again.
+
+        Args:
+            job_id: Hash of the input file
+            rows: Iterable of (row index, row data) pairs
+            chunk_size: Rows inserted per transaction
+
+        Returns:
+            Number of rows in the job
+        """
+        self.job_id = job_id
+
+        with self._lock:
+            existing = self.connection.execute('SELECT COUNT(*) FROM rows WHERE job_id = ?', (job_id,)).fetchone()[0]
+            if existing:
+                self.has_targets = self.connection.execute(
+                    "SELECT EXISTS (SELECT 1 FROM rows WHERE job_id = ? AND target != '')", (job_id,)
+                ).fetchone()[0] == 1
+                self.logger.info(f"Resuming coordinated job with {existing} rows")
+                return existing
+
+        count = 0
+        batch = []
+        now = time.time()
+        for index, row_data in rows:
+            target = row_data.get('url') or ''
+            self.has_targets = self.has_targets or bool(target or row_data.get('template'))
+            batch.append((job_id, index, target, json.dumps(row_data, ensure_ascii=False), PENDING, now, now))
+            if len(batch) >= chunk_size:
+                count += self._insert(batch)
+                batch = []
+        if batch:
+            count += self._insert(batch)
+        return count
+
+    def _insert(self, batch: list) -> int:
+        with self._lock:
+            self.connection.executemany(
+                'INSERT INTO rows (job_id, idx, target, data, state, attempts, available_at, updated_at) '
+                'VALUES (?, ?, ?, ?, ?, 0, ?, ?)',
+                batch
+            )
+            self.connection.commit()
+        return len(batch)
+
+    def lease(self, worker: str, count: int) -> Tuple[str, List[Tuple[int, Dict[str, str]]]]:
+        """
+        Lease up to `count` pending rows to a worker
+
+        Rows are handed out grouped by target, so a worker keeps one form
+        loaded for its whole batch.
+
+        Args:
+            worker: Worker id
+            count: Maximum number of rows
+
+        Returns:
+            ('ok', rows), ('wait', []) if every remaining row is leased or
+            waiting for a retry, or ('done', []) once the job is finished
+        """
+        now = time.time()
+        with self._lock:
+            self._reclaim(now)
+            selected = self.connection.execute(
+                'SELECT idx, data FROM rows WHERE job_id = ? AND state = ? AND available_at <= ? '
+                'ORDER BY target, idx LIMIT ?',
+                (self.job_id, PENDING, now, count)
+            ).fetchall()
+
+            if not selected:
+                remaining = self.connection.execute(
+                    'SELECT COUNT(*) FROM rows WHERE job_id = ? AND state IN (?, ?)',
+                    (self.job_id, PENDING, LEASED)
+                ).fetchone()[0]
+                return ('wait' if remaining else 'done'), []
+
+            self.connection.executemany(
+                'UPDATE rows SET state = ?, worker = ?, lease_expires = ?, attempts = attempts + 1, updated_at = ? '
+                'WHERE job_id = ? AND idx = ?',
+                [(LEASED, worker, now + self.lease_seconds, now, self.job_id, index) for index, _ in selected]
+            )
+            self.connection.commit()
+
+        return 'ok', [(index, json.loads(data)) for index, data in selected]
+
+    def complete(self, worker: str, results: List[Tuple[int, str, Optional[str]]]) -> int:
+        """
+        Record row outcomes reported by a worker
+
+        A success is accepted even if the lease was lost meanwhile (the form
+        was submitted anyway). Failures only count while the worker still
+        holds the lease; retries go back to the queue after a backoff until
+        the row runs out of attempts.
+
+        Args:
+            worker: Worker id
+            results: (row index, outcome, detail) triples, outcome in OUTCOMES
+
+        Returns:
+            Number of results applied
+        """
+        now = time.time()
+        applied = 0
+        with self._lock:
+            for index, outcome, detail in results:
+                if outcome == 'success':
+                    cursor = self.connection.execute(
+                        'UPDATE rows SET state = ?, worker = ?, detail = NULL, updated_at = ? '
+                        'WHERE job_id = ? AND idx = ? AND state IN (?, ?)',
+                        (DONE, worker, now, self.job_id, index, PENDING, LEASED)
+                    )
+                elif outcome == 'retry':
+                    row = self.connection.execute(
+                        'SELECT attempts FROM rows WHERE job_id = ? AND idx = ? AND state = ? AND worker = ?',
+                        (self.job_id, index, LEASED, worker)
+                    ).fetchone()
+                    if row is None:
+                        continue
+                    if row[0] >= self.max_attempts:
+                        state, available_at = FAILED, now
+                    else:
+                        state, available_at = PENDING, now + self._retry.backoff(row[0])
+                    cursor = self.connection.execute(
+                        'UPDATE rows SET state = ?, available_at = ?, detail = ?, updated_at = ? '
+                        'WHERE job_id = ? AND idx = ?',
+                        (state, available_at, detail, now, self.job_id, index)
+                    )
+                else:
+                    cursor = self.connection.execute(
+                        'UPDATE rows SET state = ?, detail = ?, updated_at = ? '
+                        'WHERE job_id = ? AND idx = ? AND state = ? AND worker = ?',
+                        (FAILED, detail, now, self.job_id, index, LEASED, worker)
+                    )
+                applied += cursor.rowcount
+            self.connection.commit()
+        return applied
+
+    def renew(self, worker: str, indexes: List[int]) -> int:
+        """
+        Extend the leases a worker still holds on some rows
+
+        Args:
+            worker: Worker id
+            indexes: Row indexes to renew
+
+        Returns:
+            Number of leases renewed (rows whose lease was lost are not)
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self.connection.executemany(
+                'UPDATE rows SET lease_expires = ? WHERE job_id = ? AND idx = ? AND state = ? AND worker = ?',
+                [(now + self.lease_seconds, self.job_id, index, LEASED, worker) for index in indexes]
+            )
+            self.connection.commit()
+            return cursor.rowcount
+
+    def release(self, worker: str) -> int:
+        """Give a leaving worker's unprocessed rows back to the queue"""
+        with self._lock:
+            cursor = self.connection.execute(
+                'UPDATE rows SET state = ?, attempts = attempts - 1, available_at = ?, updated_at = ? '
+                'WHERE job_id = ? AND state = ? AND worker = ?',
+                (PENDING, time.time(), time.time(), self.job_id, LEASED, worker)
+            )
+            self.connection.commit()
+            return cursor.rowcount
+
+    def reclaim(self) -> int:
+        """Return rows whose lease expired to the queue"""
+        with self._lock:
+            return self._reclaim(time.time())
+
+    def _reclaim(self, now: float) -> int:
+        """Reclaim expired leases (caller holds the lock)"""
+        cursor = self.connection.execute(
+            'UPDATE rows SET state = CASE WHEN attempts >= ? THEN ? ELSE ? END, '
+            "detail = CASE WHEN attempts >= ? THEN 'lease expired' ELSE detail END, "
+            'available_at = ?, updated_at = ? '
+            'WHERE job_id = ? AND state = ? AND lease_expires < ?',
+            (self.max_attempts, FAILED, PENDING, self.max_attempts, now, now, self.job_id, LEASED, now)
+        )
+        if cursor.rowcount:
+            self.connection.commit()
+            self.logger.warning(f"Reclaimed {cursor.rowcount} rows from expired leases")
+        return cursor.rowcount
+
+    def counts(self) -> Dict[str, int]:
+        """Number of rows in each state"""
+        counts = {PENDING: 0, LEASED: 0, DONE: 0, FAILED: 0}
+        with self._lock:
+            for state, count in self.connection.execute(
+                'SELECT state, COUNT(*) FROM rows WHERE job_id = ? GROUP BY state', (self.job_id,)
+            ):
+                counts[state] = count
+        return counts
+
+    def worker_counts(self) -> Dict[str, Dict[str, int]]:
+        """Finished rows per worker: {worker: {'done': n, 'failed': n}}"""
+        workers: Dict[str, Dict[str, int]] = {}
+        with self._lock:
+            for worker, state, count in self.connection.execute(
+                'SELECT worker, state, COUNT(*) FROM rows WHERE job_id = ? AND state IN (?, ?) '
+                'AND worker IS NOT NULL GROUP BY worker, state',
+                (self.job_id, DONE, FAILED)
+            ):
+                workers.setdefault(worker, {DONE: 0, FAILED: 0})[state] = count
+        return workers
+
+    def failure_reasons(self, limit: int = 5) -> List[Tuple[str, int]]:
+        """Most common details of failed rows"""
+        with self._lock:
+            return self.connection.execute(
+                'SELECT COALESCE(detail, ?), COUNT(*) AS n FROM rows WHERE job_id = ? AND state = ? '
+                'GROUP BY 1 ORDER BY n DESC LIMIT ?',
+                ('unknown', self.job_id, FAILED, limit)
+            ).fetchall()
+
+    def close(self):
+        """Close the database"""
+        with self._lock:
+            self.connection.close()
+
+
+class CoordinatorRequestHandler(http.server.BaseHTTPRequestHandler):
+    """JSON API of the coordinator"""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    # Set by Coordinator
+    coordinator = None
+
+    def log_message(self, format, *args):
+        self.coordinator.logger.debug("Coordinator: " + format, *args)
+
+    def do_GET(self):
+        if not self._authorized():
+            return
+        if self.path == '/job':
+            return self._send_json(self.coordinator.job_info())
+        if self.path == '/stats':
+            return self._send_json(self.coordinator.stats())
+        self._send_json({'error': 'not found'}, 404)
+
+    def do_POST(self):
+        # Nothing is read from an unauthenticated or oversized request
+        if not self._authorized():
+            return
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+            if length < 0:
+                raise ValueError(length)
+        except ValueError:
+            self.close_connection = True
+            return self._send_json({'error': 'invalid Content-Length'}, 400)
+        if length > config.COORDINATOR['max_request_bytes']:
+            self.close_connection = True
+            return self._send_json({'error': 'request body too large'}, 413)
+        body = self.rfile.read(length)
+
+        try:
+            payload = json.loads(body or b'{}')
+            if not isinstance(payload, dict):
+                raise ValueError('body is not a JSON object')
+            worker = str(payload['worker'])
+            results = _parse_results(payload.get('results'))
+            count = min(max(1, int(payload.get('count') or 1)), config.COORDINATOR['max_lease_rows'])
+            rows = [int(index) for index in payload.get('rows') or []]
+        except (ValueError, KeyError, TypeError) as e:
+            return self._send_json({'error': f'malformed request: {e}'}, 400)
+
+        coordinator = self.coordinator
+        store = coordinator.store
+        coordinator.seen(worker)
+
+        if self.path == '/lease':
+            store.complete(worker, results)
+            status, leased = store.lease(worker, count)
+            return self._send_json({
+                'status': status,
+                'rows': leased,
+                'retry_after': config.COORDINATOR['poll_interval']
+            })
+        if self.path == '/complete':
+            return self._send_json({'applied': store.complete(worker, results)})
+        if self.path == '/renew':
+            store.complete(worker, results)
+            return self._send_json({'renewed': store.renew(worker, rows)})
+        if self.path == '/release':
+            store.complete(worker, results)
+            coordinator.left(worker)
+            return self._send_json({'released': store.release(worker)})
+        self._send_json({'error': 'not found'}, 404)
+
+    def _authorized(self) -> bool:
+        """Check the shared token, answering 401 if it is missing or wrong"""
+        token = self.coordinator.token
+        if not token or hmac.compare_digest(self.headers.get(TOKEN_HEADER, ''), token):
+            return True
+        self.close_connection = True
+        self._send_json({'error': 'missing or invalid token'}, 401)
+        return False
+
+    def _send_json(self, data, status: int = 200):
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def _parse_results(results) -> List[Tuple[int, str, Optional[str]]]:
+    """
+    Validate the result triples of a request body
+
+    Raises:
+        ValueError: If the results are not a list of (index, outcome, detail) triples
+    """
+    if results is None:
+        return []
+    if not isinstance(results, list):
+        raise ValueError('results must be a list')
+
+    parsed = []
+    for result in results:
+        if not isinstance(result, list) or len(result) != 3:
+            raise ValueError(f'invalid result {result!r}: expected [index, outcome, detail]')
+        index, outcome, detail = result
+        if outcome not in OUTCOMES:
+            raise ValueError(f"invalid outcome {outcome!r}: expected one of {', '.join(OUTCOMES)}")
+        parsed.append((int(index), outcome, None if detail is None else str(detail)))
+    return parsed
+
+
+class Coordinator:
+    """HTTP front end of a LeaseStore; runs until every row is finished"""
+
+    def __init__(self, store: LeaseStore, host: str = None, port: int = None, token: str = None):
+        """
+        Args:
+            store: Loaded lease store
+            host: Interface to listen on (uses config default if None)
+            port: Port to listen on (uses config default if None)
+            token: Shared token workers must send (uses config default if None)
+
+        Raises:
+            ValueError: If the host is reachable from other machines and no token is set
+        """
+        self.logger = Logger()
+        self.store = store
+        self.host = host if host is not None else config.COORDINATOR['host']
+        self.port = port if port is not None else config.COORDINATOR['port']
+        self.token = token if token is not None else config.COORDINATOR['token']
+
+        if not self.token and self.host not in LOCAL_HOSTS:
+            raise ValueError(
+                f"Coordinator host {self.host} accepts remote workers: set COORDINATOR_TOKEN "
+                "(COORDINATOR['token']) so only workers with the token can take rows"
+            )
+        self.server = None
+        self.workers: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def seen(self, worker: str):
+        """Note that a worker is alive"""
+        with self._lock:
+            if worker not in self.workers:
+                self.logger.info(f"Worker joined: {worker}")
+            self.workers[worker] = time.time()
+
+    def left(self, worker: str):
+        """Forget a worker that left"""
+        with self._lock:
+            if self.workers.pop(worker, None) is not None:
+                self.logger.info(f"Worker left: {worker}")
+
+    def active_workers(self) -> int:
+        """Workers heard from within a lease lifetime"""
+        cutoff = time.time() - self.store.lease_seconds
+        with self._lock:
+            return sum(1 for last_seen in self.workers.values() if last_seen >= cutoff)
+
+    def job_info(self) -> dict:
+        """What a joining worker needs to know about the job"""
+        counts = self.store.counts()
+        return {
+            'job_id': self.store.job_id,
+            'total_rows': sum(counts.values()),
+            'remaining': counts[PENDING] + counts[LEASED],
+            'has_targets': self.store.has_targets,
+            'batch_size': config.COORDINATOR['batch_size'],
+            'heartbeat_interval': config.COORDINATOR['heartbeat_interval']
+        }
+
+    def stats(self) -> dict:
+        """Row counts per state plus the number of active workers"""
+        return {**self.store.counts(), 'workers': self.active_workers()}
+
+    def start_background(self) -> threading.Thread:
+        """Start serving on a daemon thread and return immediately"""
+        # The timeout keeps a stalled client from holding a handler thread forever
+        handler = type('Handler', (CoordinatorRequestHandler,), {
+            'coordinator': self,
+            'timeout': config.COORDINATOR['request_timeout']
+        })
+        self.server = http.server.ThreadingHTTPServer((self.host, self.port), handler)
+        self.server.daemon_threads = True
+        thread = threading.Thread(target=self.server.serve_forever, name='coordinator', daemon=True)
+        thread.start()
+        return thread
+
+    def serve(self) -> Dict[str, int]:
+        """
+        Serve leases until every row is done or failed
+
+        Expired leases are reclaimed as time passes even when no worker asks
+        for rows. After the last row finishes the server stays up for a few
+        poll intervals so waiting workers learn the job is done.
+
+        Returns:
+            Final row counts per state
+        """
+        self.start_background()
+        self.logger.success(f"Coordinator listening on http://{self.host}:{self.port}")
+
+        # Rows finished before a restart show up as skipped, so the rate only counts this run
+        initial = self.store.counts()
+        stats_lock = threading.Lock()
+        stats = {'total_rows': 0, 'successful': 0, 'failed': 0, 'retried': 0,
+                 'skipped': initial[DONE] + initial[FAILED]}
+        progress = ProgressReporter(stats, stats_lock, description='Coordinating')
+
+        try:
+            while True:
+                self.store.reclaim()
+                counts = self.store.counts()
+                with stats_lock:
+                    stats['total_rows'] = sum(counts.values())
+                    stats['successful'] = counts[DONE] - initial[DONE]
+                    stats['failed'] = counts[FAILED] - initial[FAILED]
+                progress.update()
+
+                if not counts[PENDING] and not counts[LEASED]:
+                    break
+                time.sleep(min(1.0, config.COORDINATOR['poll_interval']))
+
+            progress.finish()
+            time.sleep(config.COORDINATOR['poll_interval'] * 2)
+            return counts
+        finally:
+            self.stop()
+
+    def stop(self):
+        """Stop the HTTP server"""
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+
+class CoordinatorClient:
+    """Worker side of the coordinator: leases rows, reports outcomes, renews leases while rows are processed"""
+
+    def __init__(self, url: str, worker_id: str = None, batch_size: int = None, token: str = None):
+        """
+        Args:
+            url: Coordinator base URL, e.g. http://10.0.0.5:8600
+            worker_id: Unique id of this worker (hostname and PID if None)
+            batch_size: Rows leased at a time (uses the coordinator's default if None)
+            token: Shared token of the coordinator (uses config default if None)
+        """
+        self.logger = Logger()
+        self.url = url.rstrip('/')
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.batch_size = batch_size
+        self.token = token if token is not None else config.COORDINATOR['token']
+        self.heartbeat_interval = config.COORDINATOR['heartbeat_interval']
+        self._results: List[Tuple[int, str, Optional[str]]] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._renewed_at = 0.0
+        self._in_flight = set()
+        self._done = False
+
+    def job(self) -> dict:
+        """Fetch the job description and adopt its batch size and heartbeat interval"""
+        info = self._call('/job')
+        self.batch_size = self.batch_size or info['batch_size']
+        self.heartbeat_interval = info['heartbeat_interval']
+        return info
+
+    def iter_rows(self) -> Iterator[Tuple[int, Dict[str, str]]]:
+        """
+        Yield leased rows until the coordinator reports the job done
+
+        Outcomes reported so far travel with every lease request. While all
+        remaining rows are leased by other workers, this waits and asks again
+        (their leases may expire and come back).
+
+        Leases are renewed from here, as rows are taken for processing, rather
+        than on a timer: every row yielded but not yet reported (e.g. queued
+        for a browser worker, waiting on the rate limiter or in flight in the
+        async engine) and the rest of the batch. A worker that stops taking
+        rows stops renewing, so its rows go back to the queue once the lease
+        expires.
+
+        Yields:
+            (row index, row data) pairs
+        """
+        if self.batch_size is None:
+            self.job()
+
+        while not self._stop.is_set():
+            response = self._call('/lease', {'count': self.batch_size, 'results': self._take_results()})
+            if response['status'] == 'done':
+                self._done = True
+                return
+            if response['status'] == 'wait':
+                self._stop.wait(response['retry_after'])
+                self._renew()
+                continue
+
+            self._renewed_at = time.monotonic()
+            batch = deque(response['rows'])
+            while batch:
+                index, row_data = batch.popleft()
+                with self._lock:
+                    self._in_flight.add(index)
+                self._renew([queued for queued, _ in batch])
+                yield index, row_data
+
+    def report(self, index: int, outcome: str, detail: str = None):
+        """
+        Queue the outcome of a row; it is sent with the next request
+
+        Args:
+            index: Row index
+            outcome: 'success', 'failed' or 'retry'
+            detail: Optional free-form detail (e.g. error message)
+        """
+        with self._lock:
+            self._results.append((index, outcome, detail))
+            self._in_flight.discard(index)
+
+    def close(self):
+        """Send pending outcomes and give unprocessed rows back to the queue"""
+        self._stop.set()
+
+        # A finished job has nothing to release, and its coordinator may already be gone
+        results = self._take_results()
+        if self._done and not results:
+            return
+
+        try:
+            released = self._call('/release', {'results': results})['released']
+            if released:
+                self.logger.info(f"Released {released} unprocessed rows to the coordinator")
+        except OSError as e:
+            self.logger.warning(f"Could not reach the coordinator to release rows: {str(e)}")
+
+    def _take_results(self) -> list:
+        with self._lock:
+            results, self._results = self._results, []
+        return results
+
+    def _renew(self, queued: List[int] = ()):
+        """
+        Renew the leases of the rows taken but not reported yet and of the rows
+        still queued in the batch (and flush outcomes), at most once per
+        heartbeat interval
+
+        Args:
+            queued: Leased row indexes not yielded yet
+        """
+        if time.monotonic() - self._renewed_at < self.heartbeat_interval:
+            return
+        self._renewed_at = time.monotonic()
+        with self._lock:
+            indexes = sorted(self._in_flight.union(queued))
+        if not indexes:
+            return
+        try:
+            self._call('/renew', {'rows': indexes, 'results': self._take_results()})
+        except OSError as e:
+            self.logger.warning(f"Coordinator lease renewal failed: {str(e)}")
+
+    def _call(self, path: str, payload: dict = None) -> dict:
+        """
+        Call the coordinator, retrying connection errors with backoff
+
+        Outcomes in a request that never reached the coordinator are queued
+        again so they are not lost. Requests it rejects are not retried.
+        """
+        data = None
+        if payload is not None:
+            data = json.dumps({**payload, 'worker': self.worker_id}).encode('utf-8')
+
+        headers = {'Content-Type': 'application/json'}
+        if self.token:
+            headers[TOKEN_HEADER] = self.token
+
+        attempts = config.COORDINATOR['request_attempts']
+        for attempt in range(1, attempts + 1):
+            request = urllib.request.Request(f"{self.url}{path}", data=data, headers=headers)
+            try:
+                with urllib.request.urlopen(request, timeout=config.TIMING['page_load_timeout']) as response:
+                    return json.loads(response.read())
+            except urllib.error.HTTPError as e:
+                if e.code >= 500 and attempt < attempts:
+                    time.sleep(min(2 ** attempt, 30))
+                    continue
+                raise OSError(f"Coordinator at {self.url} rejected {path}: HTTP {e.code}") from e
+            except (urllib.error.URLError, OSError) as e:
+                if attempt == attempts:
+                    if payload and payload.get('results'):
+                        with self._lock:
+                            self._results[:0] = payload['results']
+                    raise OSError(f"Coordinator unreachable at {self.url}: {e}") from e
+                time.sleep(min(2 ** attempt, 30))
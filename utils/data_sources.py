@@ -0,0 +1,178 @@
+"""
+Input data sources for Form Bot
+Reads contact rows from Excel, CSV, JSONL and Parquet files in chunks
+"""
+
+import json
+import os
+from abc import ABC, abstractmethod
+from typing import Iterator, List, Optional, Type
+import pandas as pd
+import config
+
+
+class DataSource(ABC):
+    """Base class for a tabular input file read in chunks"""
+
+    # File extensions handled by the source
+    extensions = ()
+
+    def __init__(self, path: str, chunk_size: int = None):
+        """
+        Args:
+            path: Path to the input file
+            chunk_size: Rows per chunk (uses config default if None)
+        """
+        self.path = path
+        self.chunk_size = chunk_size or config.INPUT['chunk_size']
+
+    @abstractmethod
+    def columns(self) -> List[str]:
+        """Column names, read without loading the data"""
+
+    @abstractmethod
+    def iter_chunks(self, columns: List[str] = None) -> Iterator[pd.DataFrame]:
+        """
+        Yield the file as DataFrames of at most chunk_size rows
+
+        Args:
+            columns: Only read these columns when the format allows it
+        """
+
+    def estimate_rows(self) -> Optional[int]:
+        """Number of data rows if it can be known cheaply, None otherwise"""
+        return None
+
+    def read(self, columns: List[str] = None) -> pd.DataFrame:
+        """
+        Read the whole file chunk by chunk into one DataFrame
+
+        Args:
+            columns: Only read these columns when the format allows it
+        """
+        chunks = list(self.iter_chunks(columns))
+        if not chunks:
+            return pd.DataFrame(columns=columns or self.columns())
+        return pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+
+    def _count_lines(self) -> int:
+        """Count newline-terminated lines with large buffered reads"""
+        count = 0
+        with open(self.path, 'rb') as file:
+            for block in iter(lambda: file.read(1024 * 1024), b''):
+                count += block.count(b'\n')
+        return count
+
+
+class ExcelSource(DataSource):
+    """Excel workbooks (read in one piece; use open_stream for lazy .xlsx reading)"""
+
+    extensions = ('.xlsx', '.xlsm', '.xls')
+
+    def columns(self) -> List[str]:
+        return [str(column) for column in pd.read_excel(self.path, nrows=0).columns]
+
+    def iter_chunks(self, columns: List[str] = None) -> Iterator[pd.DataFrame]:
+        yield pd.read_excel(self.path, usecols=columns)
+
+
+class CsvSource(DataSource):
+    """Comma-separated files, memory-mapped and read in chunks"""
+
+    extensions = ('.csv',)
+
+    def columns(self) -> List[str]:
+        return list(pd.read_csv(self.path, nrows=0).columns)
+
+    def iter_chunks(self, columns: List[str] = None) -> Iterator[pd.DataFrame]:
+        # dtype=str keeps values such as phone numbers exactly as written
+        with pd.read_csv(self.path, usecols=columns, dtype=str, chunksize=self.chunk_size,
+                         memory_map=True) as reader:
+            yield from reader
+
+    def estimate_rows(self) -> Optional[int]:
+        return max(self._count_lines() - 1, 0)
+
+
+class JsonlSource(DataSource):
+    """JSON Lines files, one object per line, read in chunks"""
+
+    extensions = ('.jsonl', '.ndjson')
+
+    def columns(self) -> List[str]:
+        """
+        Keys found on any line, in order of first appearance
+
+        Objects may leave out keys (e.g. the optional URL column on rows using
+        the default form), so every line is scanned, not just the first.
+        """
+        keys = {}
+        with open(self.path, encoding='utf-8') as file:
+            for line in file:
+                if line.strip():
+                    keys.update(dict.fromkeys(json.loads(line)))
+        return list(keys)
+
+    def iter_chunks(self, columns: List[str] = None) -> Iterator[pd.DataFrame]:
+        if os.path.getsize(self.path) == 0:
+            return
+
+        with pd.read_json(self.path, lines=True, dtype=False, chunksize=self.chunk_size) as reader:
+            for chunk in reader:
+                if columns:
+                    chunk = chunk.reindex(columns=columns)
+                yield chunk
+
+    def estimate_rows(self) -> Optional[int]:
+        return self._count_lines()
+
+
+class ParquetSource(DataSource):
+    """Parquet files, memory-mapped and read in record batches (requires pyarrow)"""
+
+    extensions = ('.parquet', '.pq')
+
+    def _open(self):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Reading Parquet files requires pyarrow. Install it with: pip install pyarrow")
+        return pq.ParquetFile(self.path, memory_map=True)
+
+    def columns(self) -> List[str]:
+        return list(self._open().schema_arrow.names)
+
+    def iter_chunks(self, columns: List[str] = None) -> Iterator[pd.DataFrame]:
+        for batch in self._open().iter_batches(batch_size=self.chunk_size, columns=columns):
+            yield batch.to_pandas()
+
+    def estimate_rows(self) -> Optional[int]:
+        return self._open().metadata.num_rows
+
+
+# Registered sources, looked up by file extension
+SOURCES: List[Type[DataSource]] = [ExcelSource, CsvSource, JsonlSource, ParquetSource]
+
+
+def get_data_source(path: str, chunk_size: int = None) -> DataSource:
+    """
+    Get the data source for a file based on its extension
+
+    Args:
+        path: Path to the input file
+        chunk_size: Rows per chunk (uses config default if None)
+
+    Returns:
+        DataSource instance for the file
+
+    Raises:
+        ValueError: If the file format is not supported
+    """
+    extension = os.path.splitext(path)[1].lower()
+    for source in SOURCES:
+        if extension in source.extensions:
+            return source(path, chunk_size)
+
+    supported = ', '.join(ext for source in SOURCES for ext in source.extensions)
+    raise ValueError(f"Unsupported input format '{extension}'. Supported: {supported}")
+
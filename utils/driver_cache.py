@@ -0,0 +1,124 @@
+"""
+ChromeDriver cache for Form Bot
+Resolves the ChromeDriver binary once and reuses it across runs
+"""
+
+import json
+import os
+import re
+import subprocess
+import threading
+import time
+from typing import Optional
+from webdriver_manager.chrome import ChromeDriverManager
+import config
+from .logger import Logger
+
+# Browser binaries probed for the installed Chrome version
+BROWSER_BINARIES = (
+    'google-chrome',
+    'google-chrome-stable',
+    'chromium',
+    'chromium-browser',
+    '/Applications/Google Chrome.app/Contents/MacOS/Google Chrome',
+)
+
+VERSION_PATTERN = re.compile(r'(\d+)\.\d+\.\d+')
+
+_lock = threading.Lock()
+
+
+def _read_major_version(binary: str) -> Optional[str]:
+    """Run '<binary> --version' and return the major version, if any"""
+    try:
+        output = subprocess.run(
+            [binary, '--version'], capture_output=True, text=True, timeout=10
+        ).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+    match = VERSION_PATTERN.search(output)
+    return match.group(1) if match else None
+
+
+def detect_browser_version() -> Optional[str]:
+    """
+    Detect the major version of the installed Chrome/Chromium
+
+    Returns:
+        Major version string (e.g. '126'), or None if it can't be determined
+    """
+    for binary in BROWSER_BINARIES:
+        version = _read_major_version(binary)
+        if version:
+            return version
+    return None
+
+
+def _load_cache(cache_file: str) -> dict:
+    """Load the cache file, ignoring a missing or corrupt one"""
+    try:
+        with open(cache_file, encoding='utf-8') as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def _is_valid(entry: dict, browser_version: Optional[str]) -> bool:
+    """Whether a cached driver can be used with the installed browser"""
+    path = entry.get('path')
+    if not path or not os.path.isfile(path) or not os.access(path, os.X_OK):
+        return False
+
+    max_age = config.DRIVER_CACHE['max_age_days'] * 24 * 3600
+    if time.time() - entry.get('resolved_at', 0) > max_age:
+        return False
+
+    # The driver must still match the browser (e.g. after a Chrome update)
+    if browser_version and entry.get('driver_version') != browser_version:
+        return False
+
+    return True
+
+
+def get_driver_path() -> str:
+    """
+    Path of a ChromeDriver matching the installed browser
+
+    The path resolved by webdriver_manager is cached on disk together with
+    the driver's major version, and reused while the file still exists, its
+    version matches the installed browser and the entry is not too old.
+
+    Returns:
+        Path to the ChromeDriver executable
+    """
+    logger = Logger()
+    cache_file = config.DRIVER_CACHE['file']
+
+    # Parallel workers must not install the driver concurrently
+    with _lock:
+        browser_version = detect_browser_version()
+        entry = _load_cache(cache_file)
+
+        if config.DRIVER_CACHE['enabled'] and _is_valid(entry, browser_version):
+            logger.debug("Using cached ChromeDriver: %s", entry['path'])
+            return entry['path']
+
+        logger.info("Resolving ChromeDriver...")
+        path = ChromeDriverManager().install()
+
+        entry = {
+            'path': path,
+            'driver_version': _read_major_version(path),
+            'browser_version': browser_version,
+            'resolved_at': time.time()
+        }
+
+        if config.DRIVER_CACHE['enabled']:
+            directory = os.path.dirname(cache_file)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(cache_file, 'w', encoding='utf-8') as file:
+                json.dump(entry, file, indent=2)
+
+        return path
@@ -1,13 +1,27 @@
 """
 Excel file reader for Form Bot
-Handles reading and validating Excel files with contact data
+Handles reading and validating Excel (and CSV, JSONL, Parquet) files with contact data
 """
 
 import pandas as pd
 import os
-from typing import Dict, List, Optional
+import re
+from typing import Dict, Iterator, List, Optional, Tuple
+from openpyxl import load_workbook
 import config
+import form_templates
+from .data_sources import get_data_source
 from .logger import Logger
+from .row_store import RowStore
+
+# Simple email format check, compiled once
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+# Column holding the rejection reason in ExcelReader.rejected
+REJECTION_COLUMN = 'rejection_reason'
+
+# EXCEL_COLUMNS fields that may be absent from the file (per-row targets)
+OPTIONAL_FIELDS = ('url', 'template')
 
 class ExcelReader:
     """Handles Excel file reading and data validation"""
@@ -15,21 +29,31 @@ class ExcelReader:
     def __init__(self):
         self.logger = Logger()
         self.data = None
-        self.required_columns = list(config.EXCEL_COLUMNS.values())
+        self.rejected = None
+        self.store = None
+        self.required_columns = [
+            column for field, column in config.EXCEL_COLUMNS.items() if field not in OPTIONAL_FIELDS
+        ]
+        self.columns = {}
+        self.shard = None  # utils.sharding.Shard limiting the rows served, if any
+        self._stream = None
     
     def read_file(self, file_path: str = None) -> pd.DataFrame:
         """
         Read Excel file and validate data
         
+        The format is picked from the file extension (see utils.data_sources);
+        only the mapped columns are read, chunk by chunk where possible.
+        
         Args:
-            file_path: Path to Excel file (uses config default if None)
+            file_path: Path to Excel, CSV, JSONL or Parquet file (uses config default if None)
             
         Returns:
             pandas DataFrame with validated data
             
         Raises:
             FileNotFoundError: If Excel file doesn't exist
-            ValueError: If required columns are missing
+            ValueError: If required columns are missing or the format is unsupported
         """
         if file_path is None:
             file_path = config.EXCEL_FILE
@@ -41,12 +65,18 @@ class ExcelReader:
         
         try:
             self.logger.info(f"Reading Excel file: {file_path}")
-            self.data = pd.read_excel(file_path)
+            self.store = None
+            source = get_data_source(file_path)
+            self._check_columns(source.columns())
+            self.data = source.read(list(self.columns.values()))
             self.logger.success(f"Successfully read {len(self.data)} rows from Excel file")
             
             # Validate data
             self._validate_data()
             
+            # Compact copy used by the processing loop
+            self.store = RowStore.from_frame(self.data, self.columns)
+            
             return self.data
             
         except Exception as e:
@@ -59,59 +89,269 @@ class ExcelReader:
             raise ValueError("No data loaded")
         
         # Check required columns
-        missing_columns = []
-        for column in self.required_columns:
-            if column not in self.data.columns:
-                missing_columns.append(column)
-        
-        if missing_columns:
-            self.logger.error(f"Missing required columns: {missing_columns}")
-            raise ValueError(f"Missing required columns: {missing_columns}")
+        self._check_columns(self.data.columns)
         
         # Check for empty data
         if len(self.data) == 0:
             self.logger.warning("Excel file is empty")
             return
         
-        # Validate email format
-        self._validate_emails()
-        
-        # Remove rows with empty required fields
-        self._clean_data()
+        # Trim, check and filter every row in a few column-wide operations
+        reasons = self._build_rejection_reasons()
+        self._apply_rejections(reasons)
         
         self.logger.info(f"Data validation completed. {len(self.data)} valid rows found")
     
-    def _validate_emails(self):
-        """Validate email format"""
+    def _check_columns(self, columns):
+        """
+        Make sure every required column exists and pick the columns to read
+        
+        Sets self.columns to the mapped fields found in the file: all required
+        ones plus any optional per-row target columns.
+        
+        Raises:
+            ValueError: If required columns are missing
+        """
+        missing_columns = [column for column in self.required_columns if column not in columns]
+        
+        if missing_columns:
+            self.logger.error(f"Missing required columns: {missing_columns}")
+            raise ValueError(f"Missing required columns: {missing_columns}")
+        
+        self.columns = {
+            field: column for field, column in config.EXCEL_COLUMNS.items()
+            if field not in OPTIONAL_FIELDS or column in columns
+        }
+    
+    def has_targets(self) -> bool:
+        """Whether rows carry their own form URL or template"""
+        return any(field in self.columns for field in OPTIONAL_FIELDS)
+    
+    def _build_rejection_reasons(self) -> pd.Series:
+        """
+        Compute the rejection reason of every row with vectorized column operations
+        
+        Returns:
+            Series aligned with self.data holding the first reason each row is
+            rejected for ('' for valid rows)
+        """
+        reasons = pd.Series('', index=self.data.index, dtype=object)
+        max_lengths = config.VALIDATION['max_lengths']
+        
+        for field, column in self.columns.items():
+            values = self.data[column]
+            text = values.astype(str)
+            if config.VALIDATION['strip_whitespace']:
+                text = text.str.strip()
+            text = text.where(values.notna())
+            self.data[column] = text
+            
+            if field in OPTIONAL_FIELDS:
+                valid = text.map(self._is_valid_target(field), na_action='ignore').fillna(True).astype(bool)
+                invalid = text.notna() & (text != '') & ~valid
+                reasons = reasons.mask(invalid & (reasons == ''), f'invalid_{field}')
+                continue
+            
+            # Only the first failing check of a row is kept
+            missing = text.isna() | (text == '')
+            reasons = reasons.mask(missing & (reasons == ''), f'missing_{field}')
+            
+            if max_lengths.get(field):
+                too_long = text.str.len() > max_lengths[field]
+                reasons = reasons.mask(too_long & (reasons == ''), f'too_long_{field}')
+        
+        email_column = config.EXCEL_COLUMNS['email']
+        invalid_email = ~self.data[email_column].str.match(EMAIL_PATTERN.pattern).fillna(False).astype(bool)
+        self._report_invalid_emails(invalid_email)
+        
+        if config.VALIDATION['drop_invalid_emails']:
+            reasons = reasons.mask(invalid_email & (reasons == ''), 'invalid_email')
+        
+        return reasons
+    
+    def _report_invalid_emails(self, invalid_email: pd.Series):
+        """Warn about invalid emails (first 5 shown)"""
+        count = int(invalid_email.sum())
+        if not count:
+            return
+        
         email_column = config.EXCEL_COLUMNS['email']
-        invalid_emails = []
+        self.logger.warning(f"Found {count} invalid emails")
+        positions = invalid_email.to_numpy().nonzero()[0][:5]
+        for position in positions:
+            self.logger.warning(f"Row {position + 1}: Invalid email '{self.data[email_column].iloc[position]}'")
+    
+    def _apply_rejections(self, reasons: pd.Series):
+        """Keep valid rows in self.data and rejected ones, with their reason, in self.rejected"""
+        keep = reasons == ''
         
-        for index, email in enumerate(self.data[email_column]):
-            if pd.isna(email) or not self._is_valid_email(str(email)):
-                invalid_emails.append((index + 1, email))
+        self.rejected = self.data[~keep].assign(**{REJECTION_COLUMN: reasons[~keep]})
+        self.data = self.data[keep]
         
-        if invalid_emails:
-            self.logger.warning(f"Found {len(invalid_emails)} invalid emails")
-            for row, email in invalid_emails[:5]:  # Show first 5
-                self.logger.warning(f"Row {row}: Invalid email '{email}'")
+        removed_count = len(self.rejected)
+        if removed_count > 0:
+            counts = self.rejected[REJECTION_COLUMN].value_counts()
+            summary = ', '.join(f"{reason}: {count}" for reason, count in counts.items())
+            self.logger.warning(f"Removed {removed_count} invalid rows ({summary})")
     
     def _is_valid_email(self, email: str) -> bool:
         """Simple email validation"""
-        import re
-        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return re.match(pattern, email) is not None
+        return EMAIL_PATTERN.match(email) is not None
+    
+    def _is_valid_target(self, field: str):
+        """Validation function of an optional target field"""
+        if field == 'url':
+            return lambda value: value.startswith(('http://', 'https://'))
+        return lambda value: value in form_templates.AVAILABLE_TEMPLATES
+    
+    def _row_rejection_reason(self, row_data: Dict[str, str]) -> str:
+        """
+        Rejection reason of a single row, using the same rules as read_file()
+        
+        Args:
+            row_data: Dictionary with field names and values (trimmed in place)
+            
+        Returns:
+            The reason the row is rejected for, or '' if it is valid
+        """
+        max_lengths = config.VALIDATION['max_lengths']
+        
+        for field in self.columns:
+            if config.VALIDATION['strip_whitespace']:
+                row_data[field] = row_data[field].strip()
+            if field in OPTIONAL_FIELDS:
+                if row_data[field] and not self._is_valid_target(field)(row_data[field]):
+                    return f'invalid_{field}'
+                continue
+            if not row_data[field]:
+                return f'missing_{field}'
+            if max_lengths.get(field) and len(row_data[field]) > max_lengths[field]:
+                return f'too_long_{field}'
+        
+        if config.VALIDATION['drop_invalid_emails'] and not self._is_valid_email(row_data['email']):
+            return 'invalid_email'
+        
+        return ''
+    
+    def open_stream(self, file_path: str = None) -> Optional[int]:
+        """
+        Open an input file for streaming without loading it into memory
+        
+        .xlsx files are read row by row with openpyxl in read-only mode; other
+        formats are read chunk by chunk through their data source. Only the
+        header is read here; rows are read and validated lazily by stream_rows().
+        
+        Args:
+            file_path: Path to Excel, CSV, JSONL or Parquet file (uses config default if None)
+            
+        Returns:
+            Estimated number of data rows, or None if it is not cheaply known
+            
+        Raises:
+            FileNotFoundError: If Excel file doesn't exist
+            ValueError: If required columns are missing or the format is unsupported
+        """
+        if file_path is None:
+            file_path = config.EXCEL_FILE
+        
+        if not os.path.exists(file_path):
+            self.logger.error(f"Excel file not found: {file_path}")
+            raise FileNotFoundError(f"Excel file not found: {file_path}")
+        
+        self.logger.info(f"Streaming Excel file: {file_path}")
+        
+        if file_path.lower().endswith(('.xlsx', '.xlsm')):
+            return self._open_workbook_stream(file_path)
+        
+        source = get_data_source(file_path)
+        self._check_columns(source.columns())
+        
+        columns = list(self.columns.values())
+        
+        def rows():
+            for chunk in source.iter_chunks(columns):
+                yield from chunk[columns].itertuples(index=False, name=None)
+        
+        self._stream = (rows(), None)
+        return source.estimate_rows()
+    
+    def _open_workbook_stream(self, file_path: str) -> Optional[int]:
+        """
+        Open an .xlsx workbook in read-only mode for streaming
+        
+        Returns:
+            Number of data rows from the sheet dimensions, or None if the file
+            doesn't record them (common in files written by other tools)
+        """
+        workbook = load_workbook(file_path, read_only=True, data_only=True)
+        sheet = workbook.active
+        sheet_rows = sheet.iter_rows(values_only=True)
+        
+        header = [str(value).strip() if value is not None else '' for value in next(sheet_rows, ())]
+        try:
+            self._check_columns(header)
+        except ValueError:
+            workbook.close()
+            raise
+        
+        positions = [header.index(column) for column in self.columns.values()]
+        
+        def rows():
+            for values in sheet_rows:
+                yield tuple(values[position] if position < len(values) else None for position in positions)
+        
+        self._stream = (rows(), workbook.close)
+        if sheet.max_row is None:
+            return None
+        return max(sheet.max_row - 1, 0)
     
-    def _clean_data(self):
-        """Remove rows with empty required fields"""
-        initial_count = len(self.data)
+    def stream_rows(self) -> Iterator[Tuple[int, Dict[str, str]]]:
+        """
+        Yield validated rows from the file opened with open_stream()
+        
+        Rows are trimmed and checked with the same rules as read_file();
+        rejected rows, and rows of other shards, are skipped.
+        
+        Yields:
+            (row index, row data) pairs, indexed over valid rows
+        """
+        if self._stream is None:
+            raise ValueError("No stream opened")
         
-        # Remove rows where any required column is empty
-        for column in self.required_columns:
-            self.data = self.data.dropna(subset=[column])
+        rows, close = self._stream
+        self._stream = None
+        fields = list(self.columns)
+        index = 0
+        removed_count = 0
+        invalid_emails = 0
         
-        removed_count = initial_count - len(self.data)
+        try:
+            for line, values in enumerate(rows, start=2):
+                row_data = {}
+                for field, value in zip(fields, values):
+                    row_data[field] = str(value) if value is not None and not pd.isna(value) else ""
+                
+                if row_data['email'] and not self._is_valid_email(row_data['email'].strip()):
+                    invalid_emails += 1
+                    if invalid_emails <= 5:  # Show first 5
+                        self.logger.warning(f"Row {line}: Invalid email '{row_data['email']}'")
+                
+                if self._row_rejection_reason(row_data):
+                    removed_count += 1
+                    continue
+                
+                if self.shard is None or self.shard.owns(row_data):
+                    yield index, row_data
+                index += 1
+        finally:
+            if close:
+                close()
+        
+        if invalid_emails:
+            self.logger.warning(f"Found {invalid_emails} invalid emails")
         if removed_count > 0:
-            self.logger.warning(f"Removed {removed_count} rows with empty required fields")
+            self.logger.warning(f"Removed {removed_count} invalid rows")
+        self.logger.info(f"Streaming completed. {index} valid rows found")
     
     def get_data_for_row(self, index: int) -> Dict[str, str]:
         """
@@ -123,23 +363,46 @@ class ExcelReader:
         Returns:
             Dictionary with field names and values
         """
-        if self.data is None:
+        if self.store is None:
             raise ValueError("No data loaded")
         
-        if index >= len(self.data):
+        if index >= len(self.store):
             raise IndexError(f"Row index {index} out of range")
         
-        row_data = {}
-        for field, column in config.EXCEL_COLUMNS.items():
-            value = self.data.iloc[index][column]
-            row_data[field] = str(value) if pd.notna(value) else ""
+        return self.store.get(index)
+    
+    def iter_rows(self, start: int = 0) -> Iterator[Tuple[int, Dict[str, str]]]:
+        """
+        Iterate loaded rows sequentially
         
-        return row_data
+        Args:
+            start: Index of the first row to yield
+            
+        Yields:
+            (row index, row data) pairs
+        """
+        if self.store is None:
+            raise ValueError("No data loaded")
+        
+        rows = self.store.iter_rows(start)
+        if self.shard is None:
+            return rows
+        # Indexes stay those of the whole file, so row keys match across shards
+        return ((index, row_data) for index, row_data in rows if self.shard.owns(row_data))
     
     def get_total_rows(self) -> int:
-        """Get total number of rows"""
+        """Get total number of rows (of the shard, if one is set)"""
+        if self.store is not None:
+            if self.shard is not None:
+                return sum(1 for _ in self.iter_rows())
+            return len(self.store)
         return len(self.data) if self.data is not None else 0
     
+    def release_data(self):
+        """Drop the DataFrame once rows are only needed from the compact store"""
+        self.data = None
+        self.rejected = None
+    
     def display_sample(self, rows: int = 5):
         """Display sample data for verification"""
         if self.data is None:
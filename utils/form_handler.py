@@ -10,11 +10,91 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
-from webdriver_manager.chrome import ChromeDriverManager
-from typing import Dict, Optional
+from selenium.common.exceptions import (
+    TimeoutException, NoSuchElementException, StaleElementReferenceException, WebDriverException
+)
+from selenium.webdriver.remote.webelement import WebElement
+from typing import Dict, List, Optional, Tuple
 import config
+from .driver_cache import get_driver_path
+from .locators import compile_locator, script_locator
 from .logger import Logger
+from .rate_limiter import get_rate_limiter
+from .submission import SubmissionWatcher
+
+# Resets the form in place; returns false when any configured field is gone
+RESET_FORM_SCRIPT = """
+var locators = arguments[0];
+var elements = [];
+for (var i = 0; i < locators.length; i++) {
+    var locator = locators[i];
+    var element = locator[0] === 'css' ? document.querySelector(locator[1]) :
+        document.evaluate(locator[1], document, null,
+            XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    if (!element) {
+        return false;
+    }
+    elements.push(element);
+}
+var form = null;
+for (var j = 0; j < elements.length && !form; j++) {
+    form = elements[j].form || null;
+}
+if (form) {
+    form.reset();
+} else {
+    elements.forEach(function (element) {
+        if (element.type === 'checkbox' || element.type === 'radio') {
+            element.checked = false;
+        } else if ('value' in element && element.tagName !== 'BUTTON') {
+            element.value = '';
+        }
+    });
+}
+return true;
+"""
+
+# Sets every planned field (steps are [field, locator] pairs), fires input/change events and ticks consent.
+# Returns an object mapping each field name (and 'consent') to a success flag.
+FILL_FORM_SCRIPT = """
+var steps = arguments[0], values = arguments[1], consentLocator = arguments[2];
+function find(locator) {
+    if (locator[0] === 'css') {
+        return document.querySelector(locator[1]);
+    }
+    return document.evaluate(locator[1], document, null,
+        XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+}
+var results = {};
+steps.forEach(function (step) {
+    var field = step[0], element = find(step[1]);
+    if (!element || element.disabled || element.readOnly) {
+        results[field] = false;
+        return;
+    }
+    // Use the native setter so frameworks tracking the value notice the change
+    var descriptor = Object.getOwnPropertyDescriptor(Object.getPrototypeOf(element), 'value');
+    if (descriptor && descriptor.set) {
+        descriptor.set.call(element, values[field]);
+    } else {
+        element.value = values[field];
+    }
+    element.dispatchEvent(new Event('input', {bubbles: true}));
+    element.dispatchEvent(new Event('change', {bubbles: true}));
+    results[field] = element.value === values[field];
+});
+if (consentLocator) {
+    var box = find(consentLocator);
+    if (box && !box.checked) {
+        box.click();
+    }
+    results.consent = !!(box && box.checked);
+}
+return results;
+"""
+
+# Text fields filled from row data, in fill order
+FILL_FIELDS = ('name', 'email', 'subject', 'message')
 
 class FormHandler:
     """Handles web form interaction and submission"""
@@ -23,6 +103,31 @@ class FormHandler:
         self.logger = Logger()
         self.driver = None
         self.wait = None
+        self.submission_watcher = None
+        self.current_url = None
+        self.last_error = None
+        self.last_status = None
+        self._fill_plan = None
+        self._elements: Dict[str, WebElement] = {}
+        self._form_fields = None
+    
+    @property
+    def form_fields(self) -> Dict[str, str]:
+        """Field XPaths of the current target (config.FORM_FIELDS unless overridden)"""
+        return self._form_fields if self._form_fields is not None else config.FORM_FIELDS
+    
+    def set_form_fields(self, form_fields: Optional[Dict[str, str]]):
+        """
+        Switch the field XPaths used for the next rows
+        
+        Args:
+            form_fields: Field XPaths (None to go back to config.FORM_FIELDS)
+        """
+        if form_fields == self._form_fields:
+            return
+        self._form_fields = form_fields
+        self._fill_plan = None
+        self._elements.clear()
     
     def setup_driver(self):
         """Setup Chrome WebDriver with configuration"""
@@ -40,16 +145,27 @@ class FormHandler:
             chrome_options.add_argument(f'--window-size={config.BROWSER_CONFIG["window_size"][0]},{config.BROWSER_CONFIG["window_size"][1]}')
             chrome_options.add_argument(f'--user-agent={config.BROWSER_CONFIG["user_agent"]}')
             
-            # Setup service with automatic ChromeDriver management
-            service = Service(ChromeDriverManager().install())
+            if config.BROWSER_CONFIG['lean']:
+                self._apply_lean_options(chrome_options)
+            
+            # The network detector reads CDP events from the performance log
+            if 'network' in config.SUBMISSION['detectors']:
+                chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+            
+            # Setup service with the cached (or freshly resolved) ChromeDriver
+            service = Service(get_driver_path())
             
             # Create driver
             self.driver = webdriver.Chrome(service=service, options=chrome_options)
             self.driver.implicitly_wait(config.TIMING['implicit_wait'])
             self.driver.set_page_load_timeout(config.TIMING['page_load_timeout'])
             
+            if config.BROWSER_CONFIG['lean']:
+                self._block_urls()
+            
             # Setup explicit wait
             self.wait = WebDriverWait(self.driver, config.TIMING['element_wait_timeout'])
+            self.submission_watcher = SubmissionWatcher(self.driver)
             
             self.logger.success("Chrome WebDriver setup completed")
             
@@ -69,10 +185,13 @@ class FormHandler:
         
         try:
             self.logger.info(f"Navigating to form: {url}")
+            self.current_url = None
+            self._elements.clear()
             self.driver.get(url)
             
             # Wait for page to load
             self.wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+            self.current_url = url
             self.logger.success("Successfully navigated to form page")
             
         except TimeoutException:
@@ -82,10 +201,79 @@ class FormHandler:
             self.logger.error(f"Error navigating to form: {str(e)}")
             raise
     
+    def _apply_lean_options(self, chrome_options: Options):
+        """Configure a lightweight profile that skips resources forms don't need"""
+        # Return from get() once the DOM is ready instead of after every subresource
+        chrome_options.page_load_strategy = 'eager'
+        
+        chrome_options.add_argument('--blink-settings=imagesEnabled=false')
+        chrome_options.add_experimental_option('prefs', {
+            'profile.managed_default_content_settings.images': 2,
+            'profile.default_content_setting_values.notifications': 2
+        })
+        
+        for argument in ('--disable-extensions', '--disable-background-networking', '--disable-sync',
+                         '--disable-default-apps', '--no-first-run', '--mute-audio'):
+            chrome_options.add_argument(argument)
+    
+    def _block_urls(self):
+        """Block the configured URL patterns through CDP network interception"""
+        patterns = list(config.BROWSER_CONFIG['blocked_url_patterns'])
+        if config.BROWSER_CONFIG['block_stylesheets']:
+            patterns.append('*.css')
+        if not patterns:
+            return
+        
+        try:
+            self.driver.execute_cdp_cmd('Network.enable', {})
+            self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+            self.logger.debug("Blocking %d URL patterns", len(patterns))
+        except WebDriverException as e:
+            self.logger.warning(f"Could not block URLs through CDP: {str(e)}")
+    
+    def prepare_form(self, url: str = None):
+        """
+        Get an empty form ready for the next row
+        
+        With page reuse enabled, the already loaded form is reset in place and
+        a full navigation only happens when the page no longer has the form.
+        
+        Args:
+            url: Form URL (uses config default if None)
+        """
+        if url is None:
+            url = config.FORM_URL
+        
+        if config.EXECUTION['reuse_page'] and self.current_url == url and self.reset_form():
+            self.logger.debug("Reusing loaded form page")
+            return
+        
+        self.navigate_to_form(url)
+    
+    def reset_form(self) -> bool:
+        """
+        Reset the loaded form without navigating
+        
+        Returns:
+            True if the form was reset, False if the page no longer contains it
+        """
+        if not self.driver:
+            return False
+        
+        try:
+            locators = [script_locator(xpath) for xpath in self.form_fields.values()]
+            return bool(self.driver.execute_script(RESET_FORM_SCRIPT, locators))
+        except WebDriverException as e:
+            self.logger.debug("Could not reset form in place: %s", e)
+            return False
+    
     def fill_form(self, data: Dict[str, str]) -> bool:
         """
         Fill form with provided data
         
+        Fields are set in a single script call when batch filling is enabled;
+        any field the script could not fill falls back to the per-field path.
+        
         Args:
             data: Dictionary with field names and values
             
@@ -95,44 +283,109 @@ class FormHandler:
         try:
             self.logger.info(f"Filling form for: {data.get('name', 'Unknown')}")
             
-            # Fill name field
-            if 'name' in data and data['name']:
-                self._fill_field('name', data['name'])
-            
-            # Fill email field
-            if 'email' in data and data['email']:
-                self._fill_field('email', data['email'])
-            
-            # Fill subject field
-            if 'subject' in data and data['subject']:
-                self._fill_field('subject', data['subject'])
+            values = {field: data[field] for field in FILL_FIELDS if data.get(field)}
             
-            # Fill message field
-            if 'message' in data and data['message']:
-                self._fill_field('message', data['message'])
+            if config.EXECUTION['batch_fill']:
+                pending = self._fill_form_batch(values)
+            else:
+                pending = list(values) + ['consent']
             
-            # Check consent checkbox
-            self._check_consent()
+            for field in pending:
+                if field == 'consent':
+                    self._check_consent()
+                else:
+                    self._fill_field(field, values[field])
             
             self.logger.success("Form filled successfully")
             return True
             
         except Exception as e:
             self.logger.error(f"Error filling form: {str(e)}")
+            self.last_error = e
             return False
     
+    def _get_fill_plan(self) -> Tuple[list, Optional[List[str]]]:
+        """Build (once) the list of [field, locator] steps and the consent locator"""
+        if self._fill_plan is None:
+            form_fields = self.form_fields
+            steps = [
+                [field, script_locator(form_fields[field])]
+                for field in FILL_FIELDS if form_fields.get(field)
+            ]
+            consent = form_fields.get('consent')
+            self._fill_plan = (steps, script_locator(consent) if consent else None)
+        return self._fill_plan
+    
+    def _fill_form_batch(self, values: Dict[str, str]) -> List[str]:
+        """
+        Fill all fields and tick consent in one execute_script round trip
+        
+        Args:
+            values: Field names mapped to the values to enter
+            
+        Returns:
+            Names of fields (and 'consent') that still need the per-field path
+        """
+        steps, consent_locator = self._get_fill_plan()
+        steps = [step for step in steps if step[0] in values]
+        unplanned = [field for field in values if field not in dict(steps)]
+        
+        try:
+            results = self.driver.execute_script(FILL_FORM_SCRIPT, steps, values, consent_locator) or {}
+        except WebDriverException as e:
+            self.logger.debug("Batch fill failed, filling field by field: %s", e)
+            return list(values) + ['consent']
+        
+        pending = unplanned + [field for field, ok in results.items() if not ok]
+        if consent_locator is None:
+            pending.append('consent')  # Let _check_consent report the missing config
+        
+        self.logger.debug("Batch filled %d fields", sum(1 for ok in results.values() if ok))
+        return pending
+    
+    def _find_element(self, field_name: str) -> WebElement:
+        """
+        Locate a configured element, reusing the handle while the page is unchanged
+        
+        Args:
+            field_name: Key of the element in form_fields
+            
+        Returns:
+            The clickable element
+        """
+        element = self._elements.get(field_name)
+        if element is None:
+            locator = compile_locator(self.form_fields[field_name])
+            element = self.wait.until(EC.element_to_be_clickable(locator))
+            self._elements[field_name] = element
+        return element
+    
+    def _with_element(self, field_name: str, action):
+        """
+        Run action(element) on a configured element
+        
+        A cached handle that went stale (the page re-rendered the form) is
+        dropped and the element located again once.
+        """
+        try:
+            return action(self._find_element(field_name))
+        except StaleElementReferenceException:
+            self._elements.pop(field_name, None)
+            return action(self._find_element(field_name))
+    
     def _fill_field(self, field_name: str, value: str):
         """Fill a specific form field"""
         try:
-            xpath = config.FORM_FIELDS.get(field_name)
-            if not xpath:
+            if not self.form_fields.get(field_name):
                 self.logger.warning(f"No XPath configured for field: {field_name}")
                 return
             
-            element = self.wait.until(EC.element_to_be_clickable((By.XPATH, xpath)))
-            element.clear()
-            element.send_keys(value)
-            self.logger.debug(f"Filled {field_name} field")
+            def fill(element: WebElement):
+                element.clear()
+                element.send_keys(value)
+            
+            self._with_element(field_name, fill)
+            self.logger.debug("Filled %s field", field_name)
             
         except TimeoutException:
             self.logger.error(f"Timeout waiting for {field_name} field")
@@ -144,14 +397,17 @@ class FormHandler:
     def _check_consent(self):
         """Check the consent checkbox"""
         try:
-            xpath = config.FORM_FIELDS.get('consent')
-            if not xpath:
+            if not self.form_fields.get('consent'):
                 self.logger.warning("No consent checkbox configured")
                 return
             
-            element = self.wait.until(EC.element_to_be_clickable((By.XPATH, xpath)))
-            if not element.is_selected():
+            def check(element: WebElement) -> bool:
+                if element.is_selected():
+                    return False
                 self.driver.execute_script("arguments[0].click();", element)
+                return True
+            
+            if self._with_element('consent', check):
                 self.logger.debug("Consent checkbox checked")
             
         except TimeoutException:
@@ -171,38 +427,70 @@ class FormHandler:
         try:
             self.logger.info("Submitting form...")
             
-            xpath = config.FORM_FIELDS.get('submit')
-            if not xpath:
+            if not self.form_fields.get('submit'):
                 self.logger.error("No submit button configured")
                 return False
             
-            submit_button = self.wait.until(EC.element_to_be_clickable((By.XPATH, xpath)))
-            self.driver.execute_script("arguments[0].click();", submit_button)
+            def click(submit_button: WebElement):
+                self.submission_watcher.arm(submit_button)
+                self.driver.execute_script("arguments[0].click();", submit_button)
+            
+            url = self.current_url or config.FORM_URL
+            started = time.monotonic()
+            self._with_element('submit', click)
             
-            # Wait a moment for submission
-            time.sleep(2)
+            # Wait until the submission is confirmed (bounded by the timeout)
+            detector = self.submission_watcher.wait()
+            self.last_status = self.submission_watcher.last_status
+            get_rate_limiter().report(url, self.last_status, time.monotonic() - started)
+            if detector is None:
+                self.logger.error("Form submission was not confirmed")
+                self.last_error = TimeoutException("Form submission was not confirmed")
+                return False
             
-            self.logger.success("Form submitted successfully")
+            self.logger.success(f"Form submitted successfully (confirmed by {detector})")
             return True
             
-        except TimeoutException:
+        except TimeoutException as e:
             self.logger.error("Timeout waiting for submit button")
+            self.last_error = e
             return False
         except Exception as e:
             self.logger.error(f"Error submitting form: {str(e)}")
+            self.last_error = e
             return False
     
-    def wait_between_submissions(self):
-        """Wait between form submissions"""
-        delay = config.TIMING['delay_between_submissions']
-        self.logger.debug(f"Waiting {delay} seconds before next submission...")
-        time.sleep(delay)
+    def wait_between_submissions(self, url: str = None):
+        """
+        Wait until the rate limiter allows the next submission
+        
+        Only the part of the pacing budget not already spent on the previous
+        row is slept (see utils.rate_limiter).
+        
+        Args:
+            url: Form URL (uses the loaded page or config default if None)
+        """
+        get_rate_limiter().acquire(url or self.current_url or config.FORM_URL)
+    
+    def clear_last_failure(self):
+        """Forget the error and HTTP status recorded for the previous row"""
+        self.last_error = None
+        self.last_status = None
+    
+    def restart_driver(self):
+        """Replace a crashed browser with a fresh one"""
+        self.logger.warning("Restarting Chrome WebDriver...")
+        self.close_driver()
+        self.driver = None
+        self._elements.clear()
+        self.setup_driver()
     
     def close_driver(self):
         """Close the WebDriver"""
         if self.driver:
             try:
                 self.driver.quit()
+                self.current_url = None
                 self.logger.info("WebDriver closed")
             except Exception as e:
                 self.logger.warning(f"Error closing WebDriver: {str(e)}")
@@ -0,0 +1,372 @@
+"""
+HTTP submission engine for Form Bot
+Submits static HTML forms directly over HTTP, without launching a browser
+"""
+
+import http.client
+import re
+import threading
+import time
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlencode, urljoin, urlsplit
+import config
+from .logger import Logger
+from .rate_limiter import get_rate_limiter
+from .targets import Target, target_fields
+
+# Text fields filled from row data
+FILL_FIELDS = ('name', 'email', 'subject', 'message')
+
+# Matches simple selectors such as //input[@name="email"] or //*[@id="name"]
+SIMPLE_XPATH = re.compile(r'^//(?P<tag>[\w*-]+)\[@(?P<attr>[\w-]+)\s*=\s*["\'](?P<value>[^"\']*)["\']\]$')
+
+# Input types that are never submitted as form data
+IGNORED_INPUT_TYPES = ('submit', 'button', 'reset', 'image', 'file')
+
+# Methods that are safe to resend after the connection dropped mid-response
+IDEMPOTENT_METHODS = ('GET', 'HEAD')
+
+
+class FormParser(HTMLParser):
+    """Collects forms and their fields from an HTML page"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.forms: List[dict] = []
+        self._current_form: Optional[dict] = None
+        self._textarea: Optional[dict] = None
+        self._select: Optional[dict] = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = {key: (value if value is not None else '') for key, value in attrs}
+
+        if tag == 'form':
+            self._current_form = {'attrs': attrs, 'fields': []}
+            self.forms.append(self._current_form)
+            return
+
+        if self._current_form is None or tag not in ('input', 'textarea', 'select', 'option', 'button'):
+            return
+
+        if tag == 'option':
+            if self._select is not None and (self._select['value'] is None or 'selected' in attrs):
+                self._select['value'] = attrs.get('value', '')
+            return
+
+        field = {'tag': tag, 'attrs': attrs, 'value': attrs.get('value')}
+        self._current_form['fields'].append(field)
+
+        if tag == 'textarea':
+            field['value'] = ''
+            self._textarea = field
+        elif tag == 'select':
+            self._select = field
+
+    def handle_endtag(self, tag):
+        if tag == 'form':
+            self._current_form = None
+        elif tag == 'textarea':
+            self._textarea = None
+        elif tag == 'select':
+            self._select = None
+
+    def handle_data(self, data):
+        if self._textarea is not None:
+            self._textarea['value'] += data
+
+
+class FormSpec:
+    """Everything needed to submit a parsed form over HTTP"""
+
+    def __init__(self, action: str, method: str, defaults: List[Tuple[str, str]],
+                 field_names: Dict[str, str], consent: Optional[Tuple[str, str]]):
+        self.action = action
+        self.method = method
+        self.defaults = defaults
+        self.field_names = field_names
+        self.consent = consent
+
+    def build_payload(self, row_data: Dict[str, str]) -> List[Tuple[str, str]]:
+        """
+        Build the submitted key/value pairs for a row
+
+        Args:
+            row_data: Dictionary with form data
+
+        Returns:
+            List of (name, value) pairs in form order
+        """
+        overrides = {}
+        for field, name in self.field_names.items():
+            if row_data.get(field):
+                overrides[name] = row_data[field]
+        if self.consent:
+            overrides[self.consent[0]] = self.consent[1]
+
+        payload = []
+        for name, value in self.defaults:
+            payload.append((name, overrides.pop(name, value)))
+        payload.extend(overrides.items())
+        return payload
+
+
+def _match_selector(xpath: str, fields: List[dict]) -> Optional[dict]:
+    """Find the field a simple template XPath points to"""
+    match = SIMPLE_XPATH.match(xpath or '')
+    if not match:
+        return None
+
+    tag, attr, value = match.group('tag'), match.group('attr'), match.group('value')
+    for field in fields:
+        if tag != '*' and field['tag'] != tag:
+            continue
+        if field['attrs'].get(attr) == value:
+            return field
+    return None
+
+
+def parse_form(html: str, page_url: str, form_fields: Dict[str, str] = None) -> FormSpec:
+    """
+    Parse the form matching the configured field selectors
+
+    Args:
+        html: Page HTML
+        page_url: URL the page was fetched from (base for the form action)
+        form_fields: Field XPaths (uses config.FORM_FIELDS if None)
+
+    Returns:
+        FormSpec for the best matching form
+
+    Raises:
+        ValueError: If no form on the page matches the selectors
+    """
+    if form_fields is None:
+        form_fields = config.FORM_FIELDS
+
+    parser = FormParser()
+    parser.feed(html)
+
+    best_form, best_matches = None, {}
+    for form in parser.forms:
+        matches = {}
+        for field in FILL_FIELDS + ('consent',):
+            element = _match_selector(form_fields.get(field), form['fields'])
+            if element is not None and element['attrs'].get('name'):
+                matches[field] = element
+        if len(matches) > len(best_matches):
+            best_form, best_matches = form, matches
+
+    if best_form is None:
+        raise ValueError("No form on the page matches the configured field selectors")
+
+    defaults = []
+    for field in best_form['fields']:
+        attrs = field['attrs']
+        name = attrs.get('name')
+        if not name or field['tag'] == 'button' or 'disabled' in attrs:
+            continue
+
+        input_type = attrs.get('type', 'text').lower()
+        if input_type in IGNORED_INPUT_TYPES:
+            continue
+        if input_type in ('checkbox', 'radio') and 'checked' not in attrs:
+            continue
+        if input_type in ('checkbox', 'radio') and field['value'] is None:
+            field['value'] = 'on'
+
+        defaults.append((name, field['value'] or ''))
+
+    consent = None
+    if 'consent' in best_matches:
+        element = best_matches.pop('consent')
+        consent = (element['attrs']['name'], element['value'] or 'on')
+
+    form_attrs = best_form['attrs']
+    action = urljoin(page_url, form_attrs.get('action') or page_url)
+    method = (form_attrs.get('method') or 'get').upper()
+    field_names = {field: element['attrs']['name'] for field, element in best_matches.items()}
+
+    return FormSpec(action, method, defaults, field_names, consent)
+
+
+class HttpFormEngine:
+    """Submits form rows as direct HTTP requests over keep-alive connections"""
+
+    def __init__(self):
+        self.logger = Logger()
+        self.form_spec: Optional[FormSpec] = None
+        self._specs: Dict[Target, FormSpec] = {}
+        self.cookies: Dict[str, str] = {}
+        self.last_status: Optional[int] = None
+        self.last_error: Optional[BaseException] = None
+        self._local = threading.local()
+        self._connections: List[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+
+    def load_form(self, url: str = None) -> FormSpec:
+        """
+        Fetch and parse the form page once
+
+        Args:
+            url: Form URL (uses config default if None)
+
+        Returns:
+            Parsed FormSpec
+        """
+        if url is None:
+            url = config.FORM_URL
+
+        self.form_spec = self.spec_for(url)
+        return self.form_spec
+
+    def spec_for(self, url: str, template: str = None) -> FormSpec:
+        """
+        Parsed form of a target, fetched on first use
+
+        Args:
+            url: Form URL
+            template: Template name from form_templates (uses config.FORM_FIELDS if None)
+
+        Returns:
+            Parsed FormSpec
+        """
+        form_spec = self._specs.get((url, template))
+        if form_spec is not None:
+            return form_spec
+
+        self.logger.info(f"Fetching form page: {url}")
+        status, body = self._request('GET', url)
+        if status >= 400:
+            raise ValueError(f"Form page returned HTTP {status}")
+
+        form_spec = parse_form(body.decode('utf-8', errors='replace'), url, target_fields(template))
+        self.logger.success(
+            f"Parsed form: {form_spec.method} {form_spec.action} "
+            f"({len(form_spec.field_names)} mapped fields)"
+        )
+        self._specs[(url, template)] = form_spec
+        return form_spec
+
+    def submit(self, row_data: Dict[str, str], form_spec: FormSpec = None) -> bool:
+        """
+        Submit a single row
+
+        Args:
+            row_data: Dictionary with form data
+            form_spec: Form to submit (uses the form from load_form() if None)
+
+        Returns:
+            True if the server accepted the submission, False otherwise
+        """
+        if form_spec is None:
+            form_spec = self.form_spec
+        if form_spec is None:
+            raise ValueError("No form loaded")
+
+        payload = urlencode(form_spec.build_payload(row_data))
+        self.last_status = None
+        self.last_error = None
+        started = time.monotonic()
+        try:
+            if form_spec.method == 'POST':
+                status, _ = self._request(
+                    'POST', form_spec.action, payload.encode('utf-8'),
+                    {'Content-Type': 'application/x-www-form-urlencoded'}
+                )
+            else:
+                separator = '&' if urlsplit(form_spec.action).query else '?'
+                status, _ = self._request('GET', f"{form_spec.action}{separator}{payload}")
+        except (OSError, http.client.HTTPException) as e:
+            self.logger.error(f"HTTP submission failed: {str(e)}")
+            self.last_error = e
+            get_rate_limiter().report(form_spec.action, elapsed=time.monotonic() - started)
+            return False
+
+        self.last_status = status
+        get_rate_limiter().report(form_spec.action, status, time.monotonic() - started)
+        if status >= 400:
+            self.logger.error(f"Form submission answered with HTTP {status}")
+            return False
+        return True
+
+    def close(self):
+        """Close every pooled connection"""
+        with self._lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+    def _request(self, method: str, url: str, body: bytes = None,
+                 headers: Dict[str, str] = None) -> Tuple[int, bytes]:
+        """Send a request over the calling thread's keep-alive connection"""
+        parts = urlsplit(url)
+        path = parts.path or '/'
+        if parts.query:
+            path = f"{path}?{parts.query}"
+
+        request_headers = {'User-Agent': config.BROWSER_CONFIG['user_agent'], 'Connection': 'keep-alive'}
+        if self.cookies:
+            request_headers['Cookie'] = '; '.join(f"{key}={value}" for key, value in self.cookies.items())
+        request_headers.update(headers or {})
+
+        # A kept-alive connection may have been closed by the server; retry once on a
+        # fresh one. A POST is only resent here if it failed while being sent. Once
+        # it is out the server may have processed it, and the row fails; if the
+        # RetryQueue retries it, the form may be submitted twice (delivery is
+        # at-least-once)
+        for attempt in range(2):
+            connection = self._get_connection(parts.scheme, parts.netloc)
+            sent = False
+            try:
+                connection.request(method, path, body=body, headers=request_headers)
+                sent = True
+                response = connection.getresponse()
+                data = response.read()
+                break
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                self._drop_connection(parts.scheme, parts.netloc, connection)
+                if attempt or (sent and method not in IDEMPOTENT_METHODS):
+                    raise
+            except BaseException:
+                # e.g. a timeout: the connection is left mid-request and can't be reused
+                self._drop_connection(parts.scheme, parts.netloc, connection)
+                raise
+
+        for header in response.headers.get_all('Set-Cookie') or []:
+            cookie = header.split(';', 1)[0]
+            if '=' in cookie:
+                key, value = cookie.split('=', 1)
+                self.cookies[key.strip()] = value.strip()
+
+        return response.status, data
+
+    def _get_connection(self, scheme: str, netloc: str) -> http.client.HTTPConnection:
+        """Get (or open) this thread's connection to a host"""
+        connections = getattr(self._local, 'connections', None)
+        if connections is None:
+            connections = self._local.connections = {}
+
+        key = (scheme, netloc)
+        if key not in connections:
+            timeout = config.TIMING['page_load_timeout']
+            if scheme == 'https':
+                connection = http.client.HTTPSConnection(netloc, timeout=timeout)
+            else:
+                connection = http.client.HTTPConnection(netloc, timeout=timeout)
+            connections[key] = connection
+            with self._lock:
+                self._connections.append(connection)
+
+        return connections[key]
+
+    def _drop_connection(self, scheme: str, netloc: str, connection: http.client.HTTPConnection):
+        """Close a broken connection and forget it, so the next request opens a new one"""
+        connection.close()
+        connections = getattr(self._local, 'connections', {})
+        if connections.get((scheme, netloc)) is connection:
+            del connections[(scheme, netloc)]
+        with self._lock:
+            if connection in self._connections:
+                self._connections.remove(connection)
@@ -0,0 +1,94 @@
+"""
+Locator compilation for Form Bot
+Translates simple template XPaths into faster ID/CSS lookups
+"""
+
+import functools
+import re
+from typing import List, Tuple
+from selenium.webdriver.common.by import By
+
+# One location step: '/' or '//', a tag (or '*'), and an optional [@attr="value"] predicate
+XPATH_STEP = re.compile(
+    r'(?P<axis>//?)(?P<tag>[A-Za-z][\w-]*|\*)'
+    r'(?:\[@(?P<attr>[A-Za-z_][\w-]*)\s*=\s*(?:"(?P<double>[^"]*)"|\'(?P<single>[^\']*)\')\])?'
+)
+
+# Identifiers that can be used as-is in CSS
+CSS_IDENTIFIER = re.compile(r'^-?[A-Za-z_][\w-]*$')
+
+
+def _css_string(value: str) -> str:
+    """Quote a value for a CSS attribute selector"""
+    return '"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+@functools.lru_cache(maxsize=256)
+def xpath_to_css(xpath: str):
+    """
+    Translate an XPath made of simple steps into an equivalent CSS selector
+
+    Supported steps are '//tag', '/tag' and either of them with a single
+    [@attr="value"] predicate, e.g. //*[@id="form"]/div//button[@type="submit"].
+    Positions, functions and other axes are not translated.
+
+    Args:
+        xpath: XPath expression
+
+    Returns:
+        CSS selector, or None if the XPath can't be translated exactly
+    """
+    if not xpath or not xpath.startswith('//'):
+        return None
+
+    parts = []
+    position = 0
+    while position < len(xpath):
+        match = XPATH_STEP.match(xpath, position)
+        if not match:
+            return None
+        position = match.end()
+
+        tag, attr = match.group('tag'), match.group('attr')
+        value = match.group('double') if match.group('double') is not None else match.group('single')
+        step = '' if tag == '*' and attr else tag
+        if attr == 'id' and CSS_IDENTIFIER.match(value):
+            step += f'#{value}'
+        elif attr:
+            step += f'[{attr}={_css_string(value)}]'
+
+        if parts:
+            parts.append('>' if match.group('axis') == '/' else '')
+        parts.append(step)
+
+    return ' '.join(part for part in parts if part) if parts else None
+
+
+@functools.lru_cache(maxsize=256)
+def compile_locator(xpath: str) -> Tuple[str, str]:
+    """
+    Fastest equivalent Selenium locator for an XPath
+
+    Args:
+        xpath: XPath expression
+
+    Returns:
+        (By strategy, selector) tuple; By.XPATH if the XPath isn't simple
+    """
+    css = xpath_to_css(xpath)
+    if css is None:
+        return By.XPATH, xpath
+    if css.startswith('#') and CSS_IDENTIFIER.match(css[1:]):
+        return By.ID, css[1:]
+    return By.CSS_SELECTOR, css
+
+
+def script_locator(xpath: str) -> List[str]:
+    """
+    Locator for the page scripts: ['css', selector] or ['xpath', expression]
+
+    Args:
+        xpath: XPath expression
+    """
+    css = xpath_to_css(xpath)
+    return ['css', css] if css is not None else ['xpath', xpath]
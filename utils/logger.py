@@ -3,78 +3,177 @@ Logging utilities for Form Bot
 Provides comprehensive logging functionality with file and console output
 """
 
+import atexit
+import json
 import logging
 import os
+import queue
+import threading
 from datetime import datetime
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from colorama import Fore, Style, init
 import config
 
 # Initialize colorama for colored console output
 init(autoreset=True)
 
+# Console colors of each message tag
+TAG_COLORS = {
+    'INFO': Fore.GREEN,
+    'WARNING': Fore.YELLOW,
+    'ERROR': Fore.RED,
+    'SUCCESS': Fore.LIGHTGREEN_EX,
+    'PROGRESS': Fore.CYAN,
+    'DEBUG': Fore.BLUE
+}
+
+class ConsoleFormatter(logging.Formatter):
+    """Formats records as '[TAG] message' with a colored tag"""
+    
+    def format(self, record):
+        tag = getattr(record, 'tag', record.levelname)
+        return f"{TAG_COLORS.get(tag, '')}[{tag}]{Style.RESET_ALL} {record.getMessage()}"
+
+class JsonLinesFormatter(logging.Formatter):
+    """Formats records as one JSON object per line, without color codes"""
+    
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': getattr(record, 'tag', record.levelname),
+            'logger': record.name,
+            'thread': record.threadName,
+            'message': record.getMessage()
+        }
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+class ConsoleHandler(logging.StreamHandler):
+    """Console handler that can keep a progress line updating in place on a TTY"""
+    
+    def __init__(self, stream=None):
+        super().__init__(stream)
+        self._line_open = False
+    
+    def emit(self, record):
+        try:
+            message = self.format(record)
+            # Overwrite the open progress line, if any
+            prefix = '\r\033[K' if self._line_open else ''
+            self._line_open = getattr(record, 'in_place', False) and self.stream.isatty()
+            self.stream.write(prefix + message + ('' if self._line_open else self.terminator))
+            self.flush()
+        except Exception:
+            self.handleError(record)
+    
+    def close(self):
+        if self._line_open:
+            self.stream.write(self.terminator)
+            self._line_open = False
+        super().close()
+
+class _RecordQueueHandler(QueueHandler):
+    """Queue handler that leaves formatting to the listener thread"""
+    
+    def prepare(self, record):
+        # Merge the arguments now (they may change later) but don't format the line
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+_listener = None
+_pipeline_lock = threading.Lock()
+
+def _setup_pipeline(logger: logging.Logger):
+    """Attach the process-wide queue handler to a logger, starting the listener once"""
+    global _listener
+    with _pipeline_lock:
+        if _listener is None:
+            # Create logs directory if it doesn't exist
+            directory = os.path.dirname(config.LOGGING['file'])
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            
+            # File handler with rotation
+            file_handler = RotatingFileHandler(
+                config.LOGGING['file'],
+                maxBytes=config.LOGGING['max_file_size'],
+                backupCount=config.LOGGING['backup_count'],
+                encoding='utf-8'
+            )
+            file_handler.setFormatter(JsonLinesFormatter())
+            
+            # Console handler with colors
+            console_handler = ConsoleHandler()
+            console_handler.setFormatter(ConsoleFormatter())
+            
+            # Handlers run on the listener thread, off the submission hot path
+            _listener = QueueListener(queue.SimpleQueue(), file_handler, console_handler)
+            _listener.start()
+            atexit.register(shutdown_logging)
+        
+        if not any(isinstance(handler, _RecordQueueHandler) for handler in logger.handlers):
+            logger.addHandler(_RecordQueueHandler(_listener.queue))
+            logger.propagate = False
+
+def shutdown_logging():
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    with _pipeline_lock:
+        if _listener is not None:
+            _listener.stop()
+            for handler in _listener.handlers:
+                handler.close()
+            _listener = None
+
 class Logger:
-    """Enhanced logger with colored console output and file logging"""
+    """Enhanced logger with colored console output and file logging
+    
+    Messages accept printf-style arguments (logger.debug("Row %s", index)),
+    which are only formatted if the level is enabled.
+    """
     
     def __init__(self, name='FormBot'):
         self.logger = logging.getLogger(name)
         self.logger.setLevel(getattr(logging, config.LOGGING['level']))
         
-        # Create logs directory if it doesn't exist
-        os.makedirs('logs', exist_ok=True)
-        
-        self._setup_handlers()
+        _setup_pipeline(self.logger)
     
-    def _setup_handlers(self):
-        """Setup file and console handlers"""
-        # Clear existing handlers
-        self.logger.handlers.clear()
-        
-        # File handler with rotation
-        file_handler = RotatingFileHandler(
-            config.LOGGING['file'],
-            maxBytes=config.LOGGING['max_file_size'],
-            backupCount=config.LOGGING['backup_count']
-        )
-        file_formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        file_handler.setFormatter(file_formatter)
-        self.logger.addHandler(file_handler)
-        
-        # Console handler with colors
-        console_handler = logging.StreamHandler()
-        console_formatter = logging.Formatter('%(message)s')
-        console_handler.setFormatter(console_formatter)
-        self.logger.addHandler(console_handler)
+    def _log(self, level, tag, message, args, in_place=False):
+        if self.logger.isEnabledFor(level):
+            self.logger.log(level, message, *args, extra={'tag': tag, 'in_place': in_place})
     
-    def info(self, message):
+    def info(self, message, *args):
         """Log info message with green color"""
-        colored_message = f"{Fore.GREEN}[INFO]{Style.RESET_ALL} {message}"
-        self.logger.info(colored_message)
+        self._log(logging.INFO, 'INFO', message, args)
     
-    def warning(self, message):
+    def warning(self, message, *args):
         """Log warning message with yellow color"""
-        colored_message = f"{Fore.YELLOW}[WARNING]{Style.RESET_ALL} {message}"
-        self.logger.warning(colored_message)
+        self._log(logging.WARNING, 'WARNING', message, args)
     
-    def error(self, message):
+    def error(self, message, *args):
         """Log error message with red color"""
-        colored_message = f"{Fore.RED}[ERROR]{Style.RESET_ALL} {message}"
-        self.logger.error(colored_message)
+        self._log(logging.ERROR, 'ERROR', message, args)
     
-    def success(self, message):
+    def success(self, message, *args):
         """Log success message with bright green color"""
-        colored_message = f"{Fore.LIGHTGREEN_EX}[SUCCESS]{Style.RESET_ALL} {message}"
-        self.logger.info(colored_message)
+        self._log(logging.INFO, 'SUCCESS', message, args)
     
-    def progress(self, current, total, description="Processing"):
-        """Log progress with percentage"""
-        percentage = (current / total) * 100
-        colored_message = f"{Fore.CYAN}[PROGRESS]{Style.RESET_ALL} {description}: {current}/{total} ({percentage:.1f}%)"
-        self.logger.info(colored_message)
+    def progress(self, current, total, description="Processing", detail=None, in_place=False):
+        """Log progress with percentage
+        
+        Args:
+            detail: Extra text appended after the percentage
+            in_place: Overwrite the previous progress line when the console is a TTY
+        """
+        if self.logger.isEnabledFor(logging.INFO):
+            percentage = (current / total) * 100 if total else 0.0
+            message = f"{description}: {current}/{total} ({percentage:.1f}%)"
+            if detail:
+                message = f"{message} - {detail}"
+            self._log(logging.INFO, 'PROGRESS', message, (), in_place)
     
-    def debug(self, message):
+    def debug(self, message, *args):
         """Log debug message with blue color"""
-        colored_message = f"{Fore.BLUE}[DEBUG]{Style.RESET_ALL} {message}"
-        self.logger.debug(colored_message) 
\ No newline at end of file
+        self._log(logging.DEBUG, 'DEBUG', message, args)
@@ -0,0 +1,254 @@
+"""
+Latency metrics for Form Bot
+Per-phase histograms with percentiles and Prometheus/JSON export
+"""
+
+import bisect
+import contextlib
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+import config
+from .logger import Logger
+
+# Histogram bucket upper bounds in seconds (1-1.5-2-3-5-7.5 steps from 1ms to 1000s)
+BUCKETS = tuple(
+    round(step * 10 ** exponent, 6)
+    for exponent in range(-3, 3)
+    for step in (1, 1.5, 2, 3, 5, 7.5)
+) + (1000.0,)
+
+# Phases of a row, in display order
+PHASES = ('wait', 'navigate_to_form', 'fill_form', 'submit_form', 'row')
+
+
+class LatencyHistogram:
+    """Thread-safe fixed-bucket latency histogram"""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last slot counts values above the last bound
+        self.count = 0
+        self.sum = 0.0
+        self.min = float('inf')
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        """Record one duration"""
+        slot = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            self.counts[slot] += 1
+            self.count += 1
+            self.sum += seconds
+            self.min = min(self.min, seconds)
+            self.max = max(self.max, seconds)
+
+    def percentile(self, fraction: float) -> float:
+        """
+        Estimate a percentile by interpolating inside its bucket
+
+        Args:
+            fraction: Percentile as a fraction (0.95 for p95)
+
+        Returns:
+            Estimated duration in seconds (0 if nothing was observed)
+        """
+        with self._lock:
+            counts, count, minimum, maximum = list(self.counts), self.count, self.min, self.max
+        if not count:
+            return 0.0
+
+        rank = fraction * count
+        seen = 0
+        for slot, bucket_count in enumerate(counts):
+            if bucket_count and seen + bucket_count >= rank:
+                # Observed extremes narrow the first and last buckets
+                lower = max(self.buckets[slot - 1] if slot else 0.0, minimum)
+                upper = min(self.buckets[slot] if slot < len(self.buckets) else maximum, maximum)
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return maximum
+
+    def state(self) -> dict:
+        """Raw bucket counts, enough to rebuild or merge the histogram"""
+        with self._lock:
+            return {
+                'counts': list(self.counts),
+                'count': self.count,
+                'sum': self.sum,
+                'min': self.min if self.count else None,
+                'max': self.max
+            }
+
+    def merge(self, state: dict):
+        """Add the observations of another histogram's state()"""
+        if not state.get('count'):
+            return
+        if len(state['counts']) != len(self.counts):
+            raise ValueError("Histogram states use different buckets")
+        with self._lock:
+            self.counts = [own + other for own, other in zip(self.counts, state['counts'])]
+            self.count += state['count']
+            self.sum += state['sum']
+            self.min = min(self.min, state['min'])
+            self.max = max(self.max, state['max'])
+
+    def snapshot(self) -> dict:
+        """Summary of the histogram as a plain dictionary"""
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 6),
+            'max': round(self.max, 6),
+            'p50': round(self.percentile(0.50), 6),
+            'p95': round(self.percentile(0.95), 6),
+            'p99': round(self.percentile(0.99), 6)
+        }
+
+
+class Metrics:
+    """Latency histograms keyed by row phase"""
+
+    def __init__(self):
+        self.logger = Logger()
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+        self._exporter: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def histogram(self, phase: str) -> LatencyHistogram:
+        """Get (or create) the histogram of a phase"""
+        with self._lock:
+            histogram = self.histograms.get(phase)
+            if histogram is None:
+                histogram = self.histograms[phase] = LatencyHistogram()
+            return histogram
+
+    def observe(self, phase: str, seconds: float):
+        """Record the duration of a phase"""
+        if config.METRICS['enabled']:
+            self.histogram(phase).observe(seconds)
+
+    @contextlib.contextmanager
+    def time(self, phase: str):
+        """Context manager recording how long its body takes as a phase"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(phase, time.perf_counter() - started)
+
+    def snapshot(self) -> Dict[str, dict]:
+        """Summary of every phase, in display order"""
+        with self._lock:
+            phases = sorted(self.histograms, key=lambda name: (PHASES + (name,)).index(name))
+        return {phase: self.histograms[phase].snapshot() for phase in phases}
+
+    def state(self) -> Dict[str, dict]:
+        """Raw state of every phase (see LatencyHistogram.state)"""
+        with self._lock:
+            histograms = list(self.histograms.items())
+        return {phase: histogram.state() for phase, histogram in histograms}
+
+    def merge_state(self, state: Dict[str, dict]):
+        """Add the observations of another Metrics' state(), e.g. from another shard"""
+        for phase, histogram_state in state.items():
+            self.histogram(phase).merge(histogram_state)
+
+    def summary_lines(self) -> List[str]:
+        """Human readable per-phase percentiles"""
+        lines = []
+        for phase, summary in self.snapshot().items():
+            lines.append(
+                f"{phase}: p50 {summary['p50'] * 1000:.0f}ms, p95 {summary['p95'] * 1000:.0f}ms, "
+                f"p99 {summary['p99'] * 1000:.0f}ms, max {summary['max'] * 1000:.0f}ms (n={summary['count']})"
+            )
+        return lines
+
+    def to_prometheus(self) -> str:
+        """Render the histograms in the Prometheus text exposition format"""
+        name = 'formbot_phase_duration_seconds'
+        lines = [
+            f"# HELP {name} Time spent in each phase of a form submission",
+            f"# TYPE {name} histogram"
+        ]
+        with self._lock:
+            histograms = list(self.histograms.items())
+
+        for phase, histogram in histograms:
+            with histogram._lock:
+                counts, count, total = list(histogram.counts), histogram.count, histogram.sum
+            cumulative = 0
+            for bound, bucket_count in zip(histogram.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f'{name}_bucket{{phase="{phase}",le="{bound:g}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{phase="{phase}",le="+Inf"}} {count}')
+            lines.append(f'{name}_sum{{phase="{phase}"}} {total:.6f}')
+            lines.append(f'{name}_count{{phase="{phase}"}} {count}')
+        return '\n'.join(lines) + '\n'
+
+    def export(self):
+        """Write the configured Prometheus textfile and/or JSON snapshot"""
+        if config.METRICS['prometheus_file']:
+            _write_atomic(config.METRICS['prometheus_file'], self.to_prometheus())
+        if config.METRICS['json_file']:
+            _write_atomic(config.METRICS['json_file'], json.dumps(self.snapshot(), indent=2))
+
+    def start_export(self, interval: float = None):
+        """
+        Export the metrics periodically from a background thread
+
+        Does nothing if neither export file is configured.
+
+        Args:
+            interval: Seconds between exports (uses config default if None)
+        """
+        if not (config.METRICS['prometheus_file'] or config.METRICS['json_file']) or self._exporter:
+            return
+
+        interval = interval if interval is not None else config.METRICS['export_interval']
+        self._stop.clear()
+
+        def export_loop():
+            while not self._stop.wait(interval):
+                try:
+                    self.export()
+                except OSError as e:
+                    self.logger.warning(f"Could not export metrics: {str(e)}")
+
+        self._exporter = threading.Thread(target=export_loop, name='metrics-export', daemon=True)
+        self._exporter.start()
+
+    def stop_export(self):
+        """Stop the periodic export and write a final snapshot"""
+        if self._exporter:
+            self._stop.set()
+            self._exporter.join()
+            self._exporter = None
+            self.export()
+
+
+def _write_atomic(path: str, content: str):
+    """Write a file through a temporary file so readers never see it half written"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as file:
+        file.write(content)
+    os.replace(temp_path, path)
+
+
+_metrics: Optional[Metrics] = None
+_metrics_lock = threading.Lock()
+
+
+def get_metrics() -> Metrics:
+    """Get the process-wide metrics shared by all workers"""
+    global _metrics
+    with _metrics_lock:
+        if _metrics is None:
+            _metrics = Metrics()
+        return _metrics
@@ -0,0 +1,111 @@
+"""
+Progress reporting for Form Bot
+Throttled progress lines with throughput and ETA, safe to update from any worker
+"""
+
+import collections
+import sys
+import threading
+import time
+from typing import Dict, Optional
+import config
+from .logger import Logger
+
+
+def format_duration(seconds: float) -> str:
+    """Format seconds as H:MM:SS"""
+    seconds = int(seconds)
+    return f"{seconds // 3600}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+class ProgressReporter:
+    """Reports progress from FormBot.stats at a fixed interval"""
+    
+    def __init__(self, stats: Dict[str, int], stats_lock: threading.Lock,
+                 interval: float = None, window: float = None, description: str = "Processing forms"):
+        """
+        Args:
+            stats: FormBot stats dictionary (read only)
+            stats_lock: Lock guarding the stats dictionary
+            interval: Minimum seconds between progress lines (uses config default if None)
+            window: Seconds of history used for the rows/sec rate (uses config default if None)
+            description: Label shown in front of the counts
+        """
+        self.logger = Logger()
+        self.stats = stats
+        self.stats_lock = stats_lock
+        self.interval = interval if interval is not None else config.LOGGING['progress_interval']
+        self.window = window if window is not None else config.LOGGING['progress_window']
+        self.description = description
+        self.in_place = sys.stderr.isatty()
+        self.samples = collections.deque([(time.monotonic(), 0)])
+        self.last_report = 0.0
+        self._lock = threading.Lock()
+    
+    def update(self, force: bool = False):
+        """
+        Report progress if the interval has elapsed since the last report
+        
+        Cheap enough to call after every row; concurrent callers that lose
+        the race simply skip reporting.
+        
+        Args:
+            force: Report even if the interval hasn't elapsed
+        """
+        now = time.monotonic()
+        if not force and now - self.last_report < self.interval:
+            return
+        if not self._lock.acquire(blocking=force):
+            return
+        
+        try:
+            if not force and now - self.last_report < self.interval:
+                return
+            self.last_report = now
+            self._report(now)
+        finally:
+            self._lock.release()
+    
+    def finish(self):
+        """Report the final state"""
+        self.update(force=True)
+    
+    def _report(self, now: float):
+        """Build and log one progress line"""
+        with self.stats_lock:
+            total = self.stats['total_rows']
+            successful = self.stats['successful']
+            failed = self.stats['failed']
+            skipped = self.stats['skipped']
+            retrying = self.stats['retried']
+        
+        completed = successful + failed
+        rate = self._rate(now, completed)
+        
+        parts = [f"{successful} ok", f"{failed} failed"]
+        if skipped:
+            parts.append(f"{skipped} skipped")
+        if retrying:
+            parts.append(f"{retrying} retries")
+        if rate is not None:
+            parts.append(f"{rate:.1f} rows/s")
+            
+            remaining = total - completed - skipped
+            if rate > 0 and remaining > 0:
+                parts.append(f"ETA {format_duration(remaining / rate)}")
+        
+        self.logger.progress(
+            completed + skipped, total, self.description,
+            detail=', '.join(parts), in_place=self.in_place
+        )
+    
+    def _rate(self, now: float, completed: int) -> Optional[float]:
+        """Rows per second over the sliding window"""
+        self.samples.append((now, completed))
+        while len(self.samples) > 2 and now - self.samples[0][0] > self.window:
+            self.samples.popleft()
+        
+        first_time, first_completed = self.samples[0]
+        if now - first_time <= 0:
+            return None
+        return (completed - first_completed) / (now - first_time)
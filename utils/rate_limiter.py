@@ -0,0 +1,164 @@
+"""
+Rate limiting for Form Bot
+Token buckets keyed by target host, shared by every worker in the process
+"""
+
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+import config
+from .logger import Logger
+
+
+class TokenBucket:
+    """Thread-safe token bucket that adapts its rate to server feedback"""
+
+    def __init__(self, rate: float, burst: int = 1, min_rate: float = None):
+        """
+        Args:
+            rate: Target submissions per second
+            burst: Submissions allowed back to back before pacing kicks in
+            min_rate: Lowest rate the bucket may adapt down to
+        """
+        self.target_rate = rate
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.min_rate = min(min_rate or rate, rate)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Take a token, going into debt if none is available
+
+        Returns:
+            Seconds the caller must wait before submitting (0 if a token was free)
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def slow_down(self, factor: float):
+        """Multiply the rate by factor (< 1), never below min_rate"""
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate * factor)
+
+    def recover(self, factor: float):
+        """Multiply the rate by factor (> 1), never above the target rate"""
+        with self._lock:
+            self.rate = min(self.target_rate, self.rate * factor)
+
+
+class RateLimiter:
+    """Per-host token buckets enforcing a target submissions-per-second"""
+
+    def __init__(self, rate: float = None):
+        """
+        Args:
+            rate: Submissions per second per host (uses config default if None;
+                0 disables limiting)
+        """
+        self.logger = Logger()
+        self.rate = rate if rate is not None else configured_rate()
+        self.buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, url: str) -> float:
+        """
+        Reserve a submission slot for a URL's host without sleeping
+
+        Args:
+            url: Target URL
+
+        Returns:
+            Seconds to wait before submitting
+        """
+        bucket = self._bucket(url)
+        return bucket.reserve() if bucket else 0.0
+
+    def acquire(self, url: str):
+        """
+        Block until a submission to the URL's host is allowed
+
+        Args:
+            url: Target URL
+        """
+        delay = self.reserve(url)
+        if delay > 0:
+            self.logger.debug("Rate limit: waiting %.2f seconds before next submission...", delay)
+            time.sleep(delay)
+
+    def report(self, url: str, status: Optional[int] = None, elapsed: Optional[float] = None):
+        """
+        Feed the outcome of a submission back into the host's bucket
+
+        HTTP 429/5xx answers and slow responses lower the rate; other
+        answers let it recover gradually towards the target.
+
+        Args:
+            url: Target URL
+            status: HTTP status of the submission, if known
+            elapsed: Seconds the submission took, if known
+        """
+        bucket = self._bucket(url)
+        if not bucket or not config.RATE_LIMIT['adaptive']:
+            return
+
+        overloaded = status is not None and (status == 429 or status >= 500)
+        slow = elapsed is not None and elapsed > config.RATE_LIMIT['slow_response_seconds']
+
+        if overloaded or slow:
+            bucket.slow_down(config.RATE_LIMIT['backoff_factor'])
+            reason = f"HTTP {status}" if overloaded else f"slow response ({elapsed:.1f}s)"
+            self.logger.warning(f"Rate limit for {urlsplit(url).netloc} lowered to {bucket.rate:.2f}/s after {reason}")
+        else:
+            bucket.recover(config.RATE_LIMIT['recovery_factor'])
+
+    def _bucket(self, url: str) -> Optional[TokenBucket]:
+        """Get (or create) the bucket of a URL's host"""
+        if not self.rate:
+            return None
+
+        host = urlsplit(url).netloc or url
+        with self._lock:
+            bucket = self.buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.rate, config.RATE_LIMIT['burst'], config.RATE_LIMIT['min_rate'])
+                self.buckets[host] = bucket
+            return bucket
+
+
+def configured_rate() -> float:
+    """
+    Submissions per second from config
+
+    If unset, the browser engine keeps its pacing of one submission per
+    TIMING['delay_between_submissions']; the http and async engines are not
+    limited.
+    """
+    rate = config.RATE_LIMIT['submissions_per_second']
+    if rate is not None:
+        return rate
+    if config.EXECUTION['engine'] != 'selenium':
+        return 0.0
+
+    delay = config.TIMING['delay_between_submissions']
+    return 1.0 / delay if delay > 0 else 0.0
+
+
+_limiter: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Get the process-wide rate limiter shared by all workers"""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = RateLimiter()
+        return _limiter
@@ -0,0 +1,151 @@
+"""
+Retry handling for Form Bot
+Classifies row failures and schedules transient ones for a deferred retry
+"""
+
+import heapq
+import itertools
+import random
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+from selenium.common.exceptions import (
+    ElementNotInteractableException,
+    InvalidSessionIdException,
+    NoSuchElementException,
+    NoSuchWindowException,
+    StaleElementReferenceException,
+    TimeoutException,
+    WebDriverException,
+)
+import config
+from .logger import Logger
+
+try:
+    import aiohttp
+except ImportError:  # Optional dependency of the async engine
+    aiohttp = None
+
+# Failure kinds returned by classify_failure
+FAILURE_KINDS = ('timeout', 'stale_element', 'driver_crash', 'connection', 'server_busy', 'validation', 'unknown')
+
+# Fragments of WebDriver error messages that mean the browser is gone
+DRIVER_CRASH_MESSAGES = ('disconnected', 'crashed', 'chrome not reachable', 'session deleted', 'no such session')
+
+
+def classify_failure(error: Optional[BaseException] = None, status: Optional[int] = None) -> str:
+    """
+    Classify why a row failed
+
+    Args:
+        error: Exception raised while processing the row, if any
+        status: HTTP status answered to the submission, if known
+
+    Returns:
+        One of FAILURE_KINDS
+    """
+    if status is not None and status >= 400:
+        return 'server_busy' if status == 429 or status >= 500 else 'validation'
+
+    if error is None:
+        return 'unknown'
+
+    if isinstance(error, StaleElementReferenceException):
+        return 'stale_element'
+    if isinstance(error, (InvalidSessionIdException, NoSuchWindowException)):
+        return 'driver_crash'
+    if isinstance(error, TimeoutException) or isinstance(error, TimeoutError):
+        return 'timeout'
+    if isinstance(error, (NoSuchElementException, ElementNotInteractableException, ValueError)):
+        return 'validation'
+    if isinstance(error, WebDriverException):
+        message = (error.msg or '').lower()
+        return 'driver_crash' if any(text in message for text in DRIVER_CRASH_MESSAGES) else 'unknown'
+    if isinstance(error, OSError) or (aiohttp is not None and isinstance(error, aiohttp.ClientError)):
+        return 'connection'
+
+    return 'unknown'
+
+
+class RetryQueue:
+    """Deferred retries with exponential backoff and jitter"""
+
+    def __init__(self, max_retries: int = None, retry_delay: float = None, max_delay: float = None):
+        """
+        Args:
+            max_retries: Retries allowed per row (uses config default if None)
+            retry_delay: Base backoff in seconds (uses config default if None)
+            max_delay: Backoff cap in seconds (uses config default if None)
+        """
+        self.logger = Logger()
+        self.max_retries = max_retries if max_retries is not None else config.ERROR_HANDLING['max_retries']
+        self.retry_delay = retry_delay if retry_delay is not None else config.ERROR_HANDLING['retry_delay']
+        self.max_delay = max_delay if max_delay is not None else config.ERROR_HANDLING['max_retry_delay']
+        self.attempts: Dict[int, int] = {}
+        self._heap: List[Tuple[float, int, int, Dict[str, str]]] = []
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Delay before a retry: exponential in the attempt number, with jitter
+
+        Args:
+            attempt: Retry number (1 for the first retry)
+
+        Returns:
+            Seconds to wait
+        """
+        delay = min(self.max_delay, self.retry_delay * (2 ** (attempt - 1)))
+        return delay * random.uniform(0.5, 1.0)
+
+    def is_retry(self, index: int) -> bool:
+        """Whether the row has already been attempted and is being retried"""
+        return index in self.attempts
+
+    def defer(self, index: int, row_data: Dict[str, str], kind: str) -> bool:
+        """
+        Schedule a failed row for a later retry if its failure is transient
+
+        Args:
+            index: Row index
+            row_data: Dictionary with form data
+            kind: Failure kind from classify_failure
+
+        Returns:
+            True if the row was deferred, False if it has failed for good
+        """
+        with self._lock:
+            attempt = self.attempts.get(index, 0) + 1
+            if kind not in config.ERROR_HANDLING['retry_on'] or attempt > self.max_retries:
+                return False
+
+            self.attempts[index] = attempt
+            delay = self.backoff(attempt)
+            heapq.heappush(self._heap, (time.monotonic() + delay, next(self._counter), index, row_data))
+
+        self.logger.warning(
+            f"Row {index + 1} failed ({kind}); retry {attempt}/{self.max_retries} deferred by {delay:.1f}s"
+        )
+        return True
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def drain(self) -> Iterator[Tuple[int, Dict[str, str]]]:
+        """
+        Yield the rows deferred so far, each once its backoff has elapsed
+
+        Rows deferred again while draining wait for the next drain.
+
+        Yields:
+            (row index, row data) pairs in due order
+        """
+        with self._lock:
+            batch, self._heap = self._heap, []
+        while batch:
+            due, _, index, row_data = heapq.heappop(batch)
+            wait = due - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            yield index, row_data
@@ -0,0 +1,79 @@
+"""
+Compact row storage for Form Bot
+Keeps validated rows as plain tuples so the hot loop never touches pandas
+"""
+
+import sys
+from typing import Dict, Iterator, List, Tuple
+import pandas as pd
+
+
+class RowStore:
+    """Index-addressable store of validated rows, one tuple per row"""
+
+    __slots__ = ('fields', 'rows')
+
+    def __init__(self, fields: Tuple[str, ...], rows: List[Tuple[str, ...]]):
+        """
+        Args:
+            fields: Field names, in the order values appear in each row tuple
+            rows: Row tuples
+        """
+        self.fields = fields
+        self.rows = rows
+
+    @classmethod
+    def from_frame(cls, data: pd.DataFrame, columns: Dict[str, str]) -> 'RowStore':
+        """
+        Convert a validated DataFrame into a row store
+
+        Columns with many repeated values (subjects, fixed messages...) are
+        interned so every row shares one string object per distinct value.
+
+        Args:
+            data: Validated DataFrame
+            columns: Field names mapped to DataFrame column names
+
+        Returns:
+            RowStore with one tuple per DataFrame row
+        """
+        fields = tuple(columns)
+        values_by_field = []
+
+        for column in columns.values():
+            series = data[column]
+            values = series.astype(str).where(series.notna(), '').tolist()
+            if len(set(values)) <= len(values) // 2:
+                values = [sys.intern(value) for value in values]
+            values_by_field.append(values)
+
+        return cls(fields, list(zip(*values_by_field)))
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def get(self, index: int) -> Dict[str, str]:
+        """
+        Get a row as a dictionary
+
+        Args:
+            index: Row index
+
+        Returns:
+            Dictionary with field names and values
+        """
+        return dict(zip(self.fields, self.rows[index]))
+
+    def iter_rows(self, start: int = 0) -> Iterator[Tuple[int, Dict[str, str]]]:
+        """
+        Iterate rows sequentially
+
+        Args:
+            start: Index of the first row to yield
+
+        Yields:
+            (row index, row data) pairs
+        """
+        fields = self.fields
+        for index in range(start, len(self.rows)):
+            yield index, dict(zip(fields, self.rows[index]))
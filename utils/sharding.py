@@ -0,0 +1,177 @@
+"""
+Deterministic sharding for Form Bot
+Splits one input file into disjoint slices for several machines and merges
+their per-shard results into one report
+"""
+
+import hashlib
+import json
+import os
+import re
+import time
+from typing import Dict, List
+import config
+from .metrics import Metrics, _write_atomic
+
+# '--shard' format: shard number (1-based) and shard count, e.g. 2/4
+SHARD_SPEC = re.compile(r'^\s*(\d+)\s*/\s*(\d+)\s*$')
+
+# Stats counters summed across shards
+COUNTERS = ('total_rows', 'processed', 'successful', 'failed', 'skipped', 'retried')
+
+
+class Shard:
+    """One of `count` disjoint slices of the input rows, chosen by a stable hash"""
+
+    def __init__(self, number: int, count: int, key_field: str = None):
+        """
+        Args:
+            number: Shard number, from 1 to count
+            count: Total number of shards
+            key_field: EXCEL_COLUMNS field whose value is hashed (uses config default if None)
+
+        Raises:
+            ValueError: If the numbers or the key field are invalid
+        """
+        if count < 1 or not 1 <= number <= count:
+            raise ValueError(f"Invalid shard {number}/{count}: expected 1 <= i <= N")
+
+        self.number = number
+        self.count = count
+        self.key_field = key_field or config.SHARDING['key_field']
+
+        if self.key_field not in config.EXCEL_COLUMNS:
+            raise ValueError(f"Unknown shard key field '{self.key_field}'. Available: {', '.join(config.EXCEL_COLUMNS)}")
+
+    @classmethod
+    def parse(cls, spec: str, key_field: str = None) -> 'Shard':
+        """
+        Parse an 'i/N' shard specification
+
+        Args:
+            spec: Shard number and count, e.g. '2/4'
+            key_field: EXCEL_COLUMNS field whose value is hashed (uses config default if None)
+        """
+        match = SHARD_SPEC.match(spec or '')
+        if not match:
+            raise ValueError(f"Invalid shard '{spec}': expected i/N, e.g. 1/4")
+        return cls(int(match.group(1)), int(match.group(2)), key_field)
+
+    def __str__(self) -> str:
+        return f"{self.number}/{self.count}"
+
+    def owns(self, row_data: Dict[str, str]) -> bool:
+        """Whether a row belongs to this shard"""
+        return shard_of(row_data.get(self.key_field, ''), self.count) == self.number - 1
+
+
+def shard_of(value: str, count: int) -> int:
+    """
+    Stable 0-based shard of a key value
+
+    The value is trimmed and lowercased first, so duplicates that only differ
+    in case (e.g. emails) always land on the same shard. Unlike hash(), the
+    result is the same on every machine and Python version.
+
+    Args:
+        value: Key column value
+        count: Number of shards
+    """
+    digest = hashlib.sha1(value.strip().lower().encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big') % count
+
+
+def result_path(shard: Shard) -> str:
+    """Default results file of a shard"""
+    return os.path.join(config.SHARDING['results_dir'], f"shard-{shard.number}-of-{shard.count}.json")
+
+
+def write_shard_result(shard: Shard, job_id: str, stats: dict, metrics: Metrics, path: str = None) -> str:
+    """
+    Write the results file of a finished shard
+
+    Args:
+        shard: Shard this machine processed
+        job_id: Hash of the input file (all shards of a job share it)
+        stats: FormBot statistics
+        metrics: Latency metrics of the run
+        path: Output file (uses result_path() if None)
+
+    Returns:
+        Path of the written file
+    """
+    path = path or result_path(shard)
+    result = {
+        'job_id': job_id,
+        'shard': shard.number,
+        'shard_count': shard.count,
+        'key_field': shard.key_field,
+        'host': os.uname().nodename if hasattr(os, 'uname') else os.environ.get('COMPUTERNAME', ''),
+        'written_at': time.time(),
+        'stats': stats,
+        'latency': metrics.state()
+    }
+    _write_atomic(path, json.dumps(result, indent=2))
+    return path
+
+
+def merge_results(paths: List[str]) -> dict:
+    """
+    Combine per-shard results files into one report
+
+    Args:
+        paths: Results files written by write_shard_result()
+
+    Returns:
+        Merged report: summed stats, per-target counts, merged latency
+        histograms, and the shards that are missing or duplicated
+
+    Raises:
+        ValueError: If the files belong to different jobs or shard counts
+    """
+    results = []
+    for path in paths:
+        with open(path, encoding='utf-8') as file:
+            results.append(json.load(file))
+    if not results:
+        raise ValueError("No shard results to merge")
+
+    job_ids = {result['job_id'] for result in results}
+    shard_counts = {result['shard_count'] for result in results}
+    if len(job_ids) > 1:
+        raise ValueError("Shard results come from different input files")
+    if len(shard_counts) > 1:
+        raise ValueError(f"Shard results use different shard counts: {sorted(shard_counts)}")
+
+    shard_count = shard_counts.pop()
+    numbers = [result['shard'] for result in results]
+    stats = {counter: 0 for counter in COUNTERS}
+    targets: Dict[str, Dict[str, int]] = {}
+    metrics = Metrics()
+
+    for result in results:
+        for counter in COUNTERS:
+            stats[counter] += result['stats'].get(counter, 0)
+        for url, counts in result['stats'].get('targets', {}).items():
+            merged = targets.setdefault(url, {'successful': 0, 'failed': 0})
+            merged['successful'] += counts['successful']
+            merged['failed'] += counts['failed']
+        metrics.merge_state(result.get('latency', {}))
+
+    starts = [result['stats']['start_time'] for result in results if result['stats'].get('start_time')]
+    ends = [result['stats']['end_time'] for result in results if result['stats'].get('end_time')]
+    stats['start_time'] = min(starts) if starts else None
+    stats['end_time'] = max(ends) if ends else None
+    stats['targets'] = targets
+
+    return {
+        'job_id': job_ids.pop(),
+        'shard_count': shard_count,
+        'shards': sorted(set(numbers)),
+        'missing_shards': [number for number in range(1, shard_count + 1) if number not in numbers],
+        'duplicate_shards': sorted({number for number in numbers if numbers.count(number) > 1}),
+        'hosts': {result['shard']: result.get('host', '') for result in results},
+        'stats': stats,
+        'latency': metrics.snapshot(),
+        'latency_lines': metrics.summary_lines()
+    }
@@ -0,0 +1,255 @@
+"""
+Submission confirmation for Form Bot
+Detects when a clicked form submission has actually completed
+"""
+
+import json
+import time
+from typing import List, Optional
+from selenium.common.exceptions import WebDriverException
+import config
+from .logger import Logger
+
+# Detectors that can confirm a submission
+DETECTORS = ('url_change', 'success_selector', 'submit_event', 'network')
+
+# Installs a submit listener on the form owning the submit button and records
+# the status of fetch/XHR responses that complete after the form was submitted,
+# counting the requests still pending
+ARM_SCRIPT = """
+var button = arguments[0];
+var state = {submitted: false, status: null, pending: 0};
+window.__formBotSubmission = state;
+var form = button.form || button.closest('form') || document.querySelector('form');
+if (form) {
+    form.addEventListener('submit', function () { state.submitted = true; }, true);
+}
+if (!window.__formBotHooked) {
+    window.__formBotHooked = true;
+    var start = function () {
+        var current = window.__formBotSubmission;
+        if (!current || !current.submitted) { return null; }
+        current.pending += 1;
+        return function (status) {
+            current.pending -= 1;
+            if (status) { current.status = status; }
+        };
+    };
+    if (window.fetch) {
+        var fetch = window.fetch;
+        window.fetch = function () {
+            var done = start();
+            var request = fetch.apply(this, arguments);
+            if (!done) { return request; }
+            return request.then(function (response) {
+                done(response.status);
+                return response;
+            }, function (error) {
+                done(null);
+                throw error;
+            });
+        };
+    }
+    var send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        var done = start();
+        if (done) {
+            this.addEventListener('loadend', function () { done(this.status); });
+        }
+        return send.apply(this, arguments);
+    };
+}
+"""
+
+# Reports the page-side detectors in one round trip. After a navigation the
+# armed state is gone and the status comes from the new document's timing entry
+# (unknown when the browser doesn't expose it)
+CHECK_SCRIPT = """
+var successXpath = arguments[0], errorXpath = arguments[1];
+var visible = function (xpath) {
+    var element = document.evaluate(xpath, document, null,
+        XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    return !!(element && element.offsetParent !== null);
+};
+var state = window.__formBotSubmission;
+var status = state ? state.status : null;
+if (!state && window.performance && performance.getEntriesByType) {
+    var navigation = performance.getEntriesByType('navigation')[0];
+    status = navigation && navigation.responseStatus ? navigation.responseStatus : null;
+}
+return {
+    navigated: !state,
+    submitted: !!(state && state.submitted),
+    pending: state ? state.pending : 0,
+    status: status,
+    success: !!successXpath && visible(successXpath),
+    error: !!errorXpath && visible(errorXpath)
+};
+"""
+
+# Resource types whose responses count as the submission's answer
+NETWORK_RESOURCE_TYPES = ('Document', 'XHR', 'Fetch')
+
+
+class SubmissionWatcher:
+    """Waits for the first configured detector to confirm a submission"""
+
+    def __init__(self, driver, detectors: List[str] = None, success_selector: str = None,
+                 timeout: float = None, poll_interval: float = 0.1, error_selector: str = None,
+                 settle_seconds: float = None):
+        """
+        Args:
+            driver: Selenium WebDriver the form lives in
+            detectors: Detector names (uses config default if None)
+            success_selector: XPath of an element shown on success (uses config default if None)
+            timeout: Upper bound in seconds to wait for confirmation (uses config default if None)
+            poll_interval: Seconds between detector checks
+            error_selector: XPath of an element shown when the form rejects the
+                submission (uses config default if None)
+            settle_seconds: Quiet time after the submit event, with no request
+                pending, that confirms a form handled in JS (uses config default if None)
+        """
+        self.logger = Logger()
+        self.driver = driver
+        self.detectors = list(config.SUBMISSION['detectors'] if detectors is None else detectors)
+        self.success_selector = success_selector if success_selector is not None else config.SUBMISSION['success_selector']
+        self.error_selector = error_selector if error_selector is not None else config.SUBMISSION['error_selector']
+        self.timeout = timeout if timeout is not None else config.SUBMISSION['timeout']
+        self.settle_seconds = settle_seconds if settle_seconds is not None else config.SUBMISSION['settle_seconds']
+        self.poll_interval = poll_interval
+        self.url_before = None
+        self.last_status = None
+        self.rejected = False
+        self.submitted_at = None
+
+        unknown = [name for name in self.detectors if name not in DETECTORS]
+        if unknown:
+            raise ValueError(f"Unknown submission detectors: {unknown}. Available: {', '.join(DETECTORS)}")
+
+    def arm(self, submit_button):
+        """
+        Prepare the detectors; call right before clicking submit
+
+        Args:
+            submit_button: The submit button WebElement
+        """
+        self.url_before = self.driver.current_url
+        self.last_status = None
+        self.rejected = False
+        self.submitted_at = None
+
+        if 'submit_event' in self.detectors:
+            self.driver.execute_script(ARM_SCRIPT, submit_button)
+
+        if 'network' in self.detectors:
+            self._drain_network_log()
+
+    def wait(self) -> Optional[str]:
+        """
+        Block until a detector confirms the submission or the timeout expires
+
+        Returns:
+            Name of the detector that confirmed the submission, None on timeout,
+            when a detector saw an error response or when the error selector showed
+        """
+        if not self.detectors:
+            return 'none'
+
+        deadline = time.monotonic() + self.timeout
+        while True:
+            confirmed = self._check()
+            if confirmed is not None:
+                return confirmed
+            if self.rejected:
+                self.logger.warning("Form showed its error element after submission")
+                return None
+            if self.last_status is not None and self.last_status >= 400:
+                self.logger.warning(f"Form submission answered with HTTP {self.last_status}")
+                return None
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(self.poll_interval)
+
+    def _check(self) -> Optional[str]:
+        """Run every enabled detector once"""
+        if 'network' in self.detectors and self._check_network():
+            return 'network'
+
+        try:
+            # Page-side detectors run first so an error status seen by the armed
+            # submit check isn't masked by the URL changing to the error page
+            if 'submit_event' in self.detectors or 'success_selector' in self.detectors or self.error_selector:
+                selector = self.success_selector if 'success_selector' in self.detectors else None
+                state = self.driver.execute_script(CHECK_SCRIPT, selector, self.error_selector or None) or {}
+
+                if state.get('error'):
+                    self.rejected = True
+                    return None
+                if selector and state.get('success'):
+                    return 'success_selector'
+                if 'submit_event' in self.detectors:
+                    confirmed = self._check_submit_event(state)
+                    if confirmed or self.last_status is not None:
+                        return confirmed
+
+            if 'url_change' in self.detectors and self.driver.current_url != self.url_before:
+                return 'url_change'
+
+        except WebDriverException as e:
+            # The page is usually mid-navigation; try again on the next poll
+            self.logger.debug("Submission check failed: %s", e)
+
+        return None
+
+    def _check_submit_event(self, state: dict) -> Optional[str]:
+        """
+        Confirm a submission from the armed submit listener
+
+        The submit event itself only arms the check. The submission is confirmed
+        by the response it got, by the page navigating away, or, for forms
+        handled in JS without either, by settle_seconds passing after the event
+        with no request pending.
+        """
+        status = state.get('status')
+        if status:
+            self.last_status = int(status)
+            return 'submit_event' if self.last_status < 400 else None
+        if state.get('navigated'):
+            return 'submit_event'
+
+        if state.get('submitted'):
+            now = time.monotonic()
+            if self.submitted_at is None:
+                self.submitted_at = now
+            elif not state.get('pending') and now - self.submitted_at >= self.settle_seconds:
+                return 'submit_event'
+        return None
+
+    def _drain_network_log(self):
+        """Discard performance log entries recorded before the click"""
+        try:
+            self.driver.get_log('performance')
+        except WebDriverException as e:
+            self.logger.debug("Performance log unavailable: %s", e)
+
+    def _check_network(self) -> bool:
+        """Look for a document/XHR/fetch response recorded through CDP"""
+        try:
+            entries = self.driver.get_log('performance')
+        except WebDriverException:
+            return False
+
+        for entry in entries:
+            message = json.loads(entry['message'])['message']
+            if message.get('method') != 'Network.responseReceived':
+                continue
+
+            params = message.get('params', {})
+            if params.get('type') not in NETWORK_RESOURCE_TYPES:
+                continue
+
+            self.last_status = int(params['response']['status'])
+            if self.last_status < 400:
+                return True
+
+        return False
@@ -0,0 +1,67 @@
+"""
+Per-row targets for Form Bot
+Resolves the form URL and template of each row and groups rows by target
+"""
+
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import form_templates
+
+# (form URL, template name or None)
+Target = Tuple[str, Optional[str]]
+
+
+def row_target(row_data: Dict[str, str], default_url: str) -> Target:
+    """
+    Target a row is submitted to
+
+    Args:
+        row_data: Row data, optionally with 'url' and 'template' fields
+        default_url: URL of rows without their own
+
+    Returns:
+        (form URL, template name or None) tuple
+    """
+    return row_data.get('url') or default_url, row_data.get('template') or None
+
+
+def target_fields(template: Optional[str]) -> Optional[Dict[str, str]]:
+    """Field XPaths of a template name (None keeps config.FORM_FIELDS)"""
+    return form_templates.get_template(template) if template else None
+
+
+def group_by_target(rows: Iterable[Tuple[int, Dict[str, str]]], default_url: str,
+                    window: int) -> Iterator[Tuple[int, Dict[str, str]]]:
+    """
+    Reorder rows so rows of the same target are contiguous
+
+    Rows are buffered up to `window` at a time, so memory stays bounded with
+    streamed input. Within a window, targets keep their first-seen order,
+    except that the target the previous window ended with goes first.
+
+    Args:
+        rows: Iterable of (row index, row data) pairs
+        default_url: URL of rows without their own
+        window: Maximum number of buffered rows
+
+    Yields:
+        The same (row index, row data) pairs, grouped by target
+    """
+    groups: Dict[Target, List[Tuple[int, Dict[str, str]]]] = {}
+    buffered = 0
+    last_target = None
+
+    def flush():
+        ordered = sorted(groups, key=lambda target: target != last_target)
+        for target in ordered:
+            yield from groups[target]
+        groups.clear()
+        return ordered[-1] if ordered else last_target
+
+    for item in rows:
+        groups.setdefault(row_target(item[1], default_url), []).append(item)
+        buffered += 1
+        if buffered >= window:
+            last_target = yield from flush()
+            buffered = 0
+
+    yield from flush()
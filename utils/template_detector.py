@@ -0,0 +1,263 @@
+"""
+Template detection for Form Bot
+Picks the form template matching a page and caches the choice per URL
+"""
+
+import hashlib
+import json
+import os
+import time
+import urllib.request
+from typing import Dict, List, Optional
+import config
+import form_templates
+from .http_engine import SIMPLE_XPATH, FormParser
+from .locators import script_locator
+from .logger import Logger
+
+# Fields a template must match to be chosen, by detection mode
+REQUIRED_FIELDS = {
+    'browser': ('name', 'email', 'message', 'submit'),
+    # Direct HTTP submission never clicks the button
+    'html': ('name', 'email', 'message')
+}
+
+# Fingerprints remembered per URL (e.g. browser and HTML views of the same page)
+MAX_FINGERPRINTS_PER_URL = 5
+
+# Describes the page's forms: method plus tag/name/type/id of every field
+FINGERPRINT_FUNCTION = """
+function fingerprint() {
+    return Array.prototype.map.call(document.forms, function (form) {
+        var fields = form.querySelectorAll('input, textarea, select, button');
+        return (form.getAttribute('method') || 'get').toLowerCase() + '|' +
+            Array.prototype.map.call(fields, function (field) {
+                return [field.tagName.toLowerCase(), field.getAttribute('name') || '',
+                    (field.getAttribute('type') || '').toLowerCase(), field.getAttribute('id') || ''].join(':');
+            }).join(',');
+    }).join('\\n');
+}
+"""
+
+FINGERPRINT_SCRIPT = FINGERPRINT_FUNCTION + "return fingerprint();"
+
+# Counts the elements each template selector matches, in a single DOM pass
+DETECT_SCRIPT = """
+var templates = arguments[0], matches = {};
+Object.keys(templates).forEach(function (name) {
+    matches[name] = {};
+    Object.keys(templates[name]).forEach(function (field) {
+        var locator = templates[name][field], count = 0;
+        try {
+            if (locator[0] === 'css') {
+                count = document.querySelectorAll(locator[1]).length;
+            } else {
+                count = document.evaluate(locator[1], document, null,
+                    XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null).snapshotLength;
+            }
+        } catch (e) {
+            count = 0;
+        }
+        matches[name][field] = count;
+    });
+});
+return matches;
+"""
+
+
+def hash_fingerprint(description: str) -> str:
+    """Short stable hash of a page description"""
+    return hashlib.sha1(description.encode('utf-8')).hexdigest()[:16]
+
+
+def html_fingerprint(parser: FormParser) -> str:
+    """Same description as FINGERPRINT_FUNCTION, built from parsed HTML"""
+    forms = []
+    for form in parser.forms:
+        fields = [
+            ':'.join((field['tag'], field['attrs'].get('name', ''),
+                      field['attrs'].get('type', '').lower(), field['attrs'].get('id', '')))
+            for field in form['fields']
+        ]
+        forms.append((form['attrs'].get('method') or 'get').lower() + '|' + ','.join(fields))
+    return '\n'.join(forms)
+
+
+def score_template(fields: Dict[str, str], matches: Dict[str, int], required: tuple) -> Optional[int]:
+    """
+    Score how well a template fits a page
+
+    Selectors matching exactly one element count double.
+
+    Args:
+        fields: Template field XPaths
+        matches: Number of elements each field's selector matched
+        required: Fields the template must match
+
+    Returns:
+        Score, or None if a required field is missing
+    """
+    score = 0
+    for field in fields:
+        count = matches.get(field, 0)
+        if not count:
+            if field in required:
+                return None
+            continue
+        score += 2 if count == 1 else 1
+    return score
+
+
+class TemplateCache:
+    """On-disk template choices keyed by URL and page fingerprint"""
+
+    def __init__(self, cache_file: str = None):
+        self.cache_file = cache_file or config.TEMPLATES['cache_file']
+        self.entries = self._load()
+
+    def _load(self) -> dict:
+        try:
+            with open(self.cache_file, encoding='utf-8') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def get(self, url: str, fingerprint: str) -> Optional[dict]:
+        """Cached choice for a URL whose page still has the same fingerprint"""
+        return self.entries.get(url, {}).get(fingerprint)
+
+    def put(self, url: str, fingerprint: str, entry: dict):
+        """Store a choice, keeping only the most recent fingerprints per URL"""
+        fingerprints = self.entries.setdefault(url, {})
+        fingerprints[fingerprint] = entry
+        while len(fingerprints) > MAX_FINGERPRINTS_PER_URL:
+            oldest = min(fingerprints, key=lambda key: fingerprints[key].get('detected_at', 0))
+            del fingerprints[oldest]
+
+        directory = os.path.dirname(self.cache_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_file = f"{self.cache_file}.tmp"
+        with open(temp_file, 'w', encoding='utf-8') as file:
+            json.dump(self.entries, file, indent=2)
+        os.replace(temp_file, self.cache_file)
+
+
+class TemplateDetector:
+    """Chooses the best matching template for a form page"""
+
+    def __init__(self, cache_file: str = None, templates: Dict[str, Dict[str, str]] = None):
+        """
+        Args:
+            cache_file: Template cache file (uses config default if None)
+            templates: Candidate templates (current config.FORM_FIELDS plus
+                form_templates.AVAILABLE_TEMPLATES if None)
+        """
+        self.logger = Logger()
+        self.cache = TemplateCache(cache_file)
+        if templates is None:
+            templates = {'config': config.FORM_FIELDS, **form_templates.AVAILABLE_TEMPLATES}
+        self.templates = templates
+
+    def detect_in_browser(self, driver, url: str) -> Optional[Dict[str, str]]:
+        """
+        Detect the template of the page loaded in a browser
+
+        Args:
+            driver: WebDriver with the form page loaded
+            url: Form URL (cache key)
+
+        Returns:
+            Field XPaths of the chosen template, or None if none matches
+        """
+        fingerprint = hash_fingerprint(driver.execute_script(FINGERPRINT_SCRIPT) or '')
+        cached = self._cached(url, fingerprint)
+        if cached is not None:
+            return cached
+
+        locators = {
+            name: {field: script_locator(xpath) for field, xpath in fields.items() if xpath}
+            for name, fields in self.templates.items()
+        }
+        matches = driver.execute_script(DETECT_SCRIPT, locators) or {}
+        return self._choose(url, fingerprint, matches, REQUIRED_FIELDS['browser'])
+
+    def detect_in_html(self, html: str, url: str) -> Optional[Dict[str, str]]:
+        """
+        Detect the template from the page HTML, without a browser
+
+        Only simple selectors (//tag[@attr="value"]) can be evaluated this way;
+        forms rendered by JavaScript need browser detection.
+
+        Args:
+            html: Page HTML
+            url: Form URL (cache key)
+
+        Returns:
+            Field XPaths of the chosen template, or None if none matches
+        """
+        parser = FormParser()
+        parser.feed(html)
+
+        fingerprint = hash_fingerprint(html_fingerprint(parser))
+        cached = self._cached(url, fingerprint)
+        if cached is not None:
+            return cached
+
+        elements = [field for form in parser.forms for field in form['fields']]
+        matches = {
+            name: {field: _count_matches(xpath, elements) for field, xpath in fields.items()}
+            for name, fields in self.templates.items()
+        }
+        return self._choose(url, fingerprint, matches, REQUIRED_FIELDS['html'])
+
+    def detect_url(self, url: str) -> Optional[Dict[str, str]]:
+        """Fetch a page over HTTP and detect its template from the HTML"""
+        request = urllib.request.Request(url, headers={'User-Agent': config.BROWSER_CONFIG['user_agent']})
+        with urllib.request.urlopen(request, timeout=config.TIMING['page_load_timeout']) as response:
+            html = response.read().decode('utf-8', errors='replace')
+        return self.detect_in_html(html, url)
+
+    def _cached(self, url: str, fingerprint: str) -> Optional[Dict[str, str]]:
+        """Fields of a cached choice for this page, if any"""
+        entry = self.cache.get(url, fingerprint)
+        if entry is None:
+            return None
+        self.logger.info(f"Using cached template '{entry['template']}' for {url}")
+        return entry['fields']
+
+    def _choose(self, url: str, fingerprint: str, matches: Dict[str, Dict[str, int]],
+                required: tuple) -> Optional[Dict[str, str]]:
+        """Pick the best scoring template and cache the choice"""
+        best_name, best_score = None, None
+        for name, fields in self.templates.items():
+            score = score_template(fields, matches.get(name, {}), required)
+            if score is not None and (best_score is None or score > best_score):
+                best_name, best_score = name, score
+
+        if best_name is None:
+            self.logger.warning(f"No form template matches {url}")
+            return None
+
+        fields = dict(self.templates[best_name])
+        self.cache.put(url, fingerprint, {
+            'template': best_name,
+            'fields': fields,
+            'score': best_score,
+            'detected_at': time.time()
+        })
+        self.logger.success(f"Detected template '{best_name}' for {url} (score {best_score})")
+        return fields
+
+
+def _count_matches(xpath: str, elements: List[dict]) -> int:
+    """Count parsed form elements a simple template XPath points to"""
+    match = SIMPLE_XPATH.match(xpath or '')
+    if not match:
+        return 0
+
+    tag, attr, value = match.group('tag'), match.group('attr'), match.group('value')
+    return sum(
+        1 for element in elements
+        if (tag == '*' or element['tag'] == tag) and element['attrs'].get(attr) == value
+    )
@@ -0,0 +1,141 @@
+"""
+Worker pool for Form Bot
+Runs several FormHandler instances in parallel, fed from a shared work queue
+"""
+
+import queue
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from .form_handler import FormHandler
+from .logger import Logger
+
+# Marker telling a worker thread that no more rows will arrive
+_STOP = object()
+
+
+class WorkerPool:
+    """Pool of browser workers consuming rows from a shared queue"""
+
+    def __init__(self, size: int, handler_factory: Callable[[], FormHandler] = FormHandler):
+        """
+        Args:
+            size: Number of parallel workers (one browser each)
+            handler_factory: Callable creating a new FormHandler for a worker
+        """
+        if size < 1:
+            raise ValueError("Worker pool size must be at least 1")
+
+        self.logger = Logger()
+        self.size = size
+        self.handler_factory = handler_factory
+        self.queue = queue.Queue(maxsize=size * 2)
+        self.threads: List[threading.Thread] = []
+        self.error: Optional[BaseException] = None
+        self.started = 0
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+
+    def run(self, rows: Iterable[Tuple[int, Dict[str, str]]],
+            process_row: Callable[[FormHandler, int, Dict[str, str]], None]):
+        """
+        Process rows in parallel and block until every row is handled
+
+        Args:
+            rows: Iterable of (row index, row data) pairs
+            process_row: Callable invoked as process_row(handler, index, row_data)
+
+        Raises:
+            RuntimeError: If no worker could be started
+            Exception: The first error raised by process_row in a worker
+        """
+        self.logger.info(f"Starting {self.size} parallel workers...")
+
+        for worker_id in range(self.size):
+            thread = threading.Thread(
+                target=self._worker,
+                args=(worker_id + 1, process_row),
+                name=f"FormBotWorker-{worker_id + 1}",
+                daemon=True
+            )
+            thread.start()
+            self.threads.append(thread)
+
+        try:
+            for item in rows:
+                if not self._put(item):
+                    break
+        finally:
+            # One stop marker per worker so every thread exits its loop
+            for _ in self.threads:
+                self._put(_STOP)
+            for thread in self.threads:
+                thread.join()
+
+        if self.error is not None:
+            raise self.error
+        # Rows fit in the queue without blocking, so dead workers aren't noticed while feeding
+        if not self.started:
+            raise RuntimeError("No worker could start its browser")
+        undelivered = self._undelivered_rows()
+        if undelivered:
+            raise RuntimeError(f"{undelivered} rows were left unprocessed: workers stopped early")
+
+    def _undelivered_rows(self) -> int:
+        """Drain the queue after the workers exited and count rows nobody took"""
+        count = 0
+        while True:
+            try:
+                item = self.queue.get_nowait()
+            except queue.Empty:
+                return count
+            if item is not _STOP:
+                count += 1
+
+    def _put(self, item) -> bool:
+        """Put an item on the queue without blocking forever on dead workers"""
+        while not self._stop_event.is_set():
+            try:
+                self.queue.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                if not any(thread.is_alive() for thread in self.threads):
+                    if self.error is None:
+                        self.error = RuntimeError("All workers stopped before the queue was drained")
+                    self._stop_event.set()
+        return False
+
+    def _worker(self, worker_id: int, process_row: Callable[[FormHandler, int, Dict[str, str]], None]):
+        """Worker loop: own a browser and process rows until told to stop"""
+        handler = self.handler_factory()
+
+        try:
+            handler.setup_driver()
+        except Exception as e:
+            self.logger.error(f"Worker {worker_id} failed to start browser: {str(e)}")
+            return
+
+        with self._lock:
+            self.started += 1
+
+        try:
+            while not self._stop_event.is_set():
+                try:
+                    item = self.queue.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+
+                if item is _STOP:
+                    break
+
+                index, row_data = item
+                try:
+                    process_row(handler, index, row_data)
+                except Exception as e:
+                    # process_row only raises when the run must be aborted
+                    if self.error is None:
+                        self.error = e
+                    self._stop_event.set()
+                    break
+        finally:
+            handler.close_driver()
+            self.logger.debug("Worker %s finished", worker_id)